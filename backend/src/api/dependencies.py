@@ -3,8 +3,11 @@ FastAPI dependencies for dependency injection.
 """
 from pathlib import Path
 from functools import lru_cache
+from typing import Iterator
+from fastapi import Depends
 from backend.src.storage.interfaces import IDatabase, IFileStorage
 from backend.src.storage.storage_service import StorageService
+from backend.src.storage.sqlite_db import SQLiteDatabase
 from backend.src.services.test_run_service import TestRunService
 
 
@@ -25,22 +28,30 @@ def get_storage_service() -> StorageService:
     )
 
 
-def get_database() -> IDatabase:
-    """Dependency to get database instance."""
-    return get_storage_service().create_database()
+def get_database() -> Iterator[IDatabase]:
+    """
+    Dependency to get database instance (session is closed after the request).
+    
+    Sync so FastAPI runs it in the threadpool: closing the session returns its
+    SQLite connection, which must not block the event loop.
+    """
+    with get_storage_service().session_scope() as session:
+        yield SQLiteDatabase(session)
 
 
-def get_file_storage() -> IFileStorage:
-    """Dependency to get file storage instance."""
+# These two are async so FastAPI calls them on the event loop instead of
+# dispatching each one to the threadpool; neither of them blocks.
+
+async def get_file_storage() -> IFileStorage:
+    """Dependency to get file storage instance (shared, not rebuilt per request)."""
     return get_storage_service().create_file_storage()
 
 
-def get_test_run_service() -> TestRunService:
+async def get_test_run_service(
+    database: IDatabase = Depends(get_database),
+    file_storage: IFileStorage = Depends(get_file_storage),
+) -> TestRunService:
     """Dependency to get test run service."""
-    storage = get_storage_service()
-    return TestRunService(
-        database=storage.create_database(),
-        file_storage=storage.create_file_storage(),
-    )
+    return TestRunService(database=database, file_storage=file_storage)
 
 
@@ -2,19 +2,100 @@
 FastAPI application setup.
 """
 import os
+from functools import cache
 from pathlib import Path
-from fastapi import FastAPI
+from typing import Optional
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from backend.src.api.routes import devices, test_stages, requirement_sets, test_runs
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
+from backend.src.api.response_cache import ResponseCacheMiddleware
 
 
-def create_app(dev_mode: bool = True) -> FastAPI:
+# Seconds to cache GET-by-id responses (0, the default, disables the cache).
+# Only HTTP writes invalidate it, so enable it only when nothing else (CLI,
+# other processes) writes to the same database.
+RESPONSE_CACHE_TTL = float(os.getenv("RF_TOOL_RESPONSE_CACHE_TTL", "0"))
+
+# /health body is constant, so encode it once at import
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "version": "1.0.0"})
+
+# Frontend build location (prod mode), resolved once at import
+_FRONTEND_DIR = Path("frontend/dist")
+_FRONTEND_DIR_EXISTS = _FRONTEND_DIR.is_dir()
+
+
+def _frontend_not_built_body(frontend_dir: Path) -> bytes:
+    """Encode the response returned when the frontend build is missing."""
+    return orjson.dumps({
+        "error": "Frontend not built",
+        "message": "Frontend build not found. To build the frontend, run: cd frontend && npm install && npm run build",
+        "path": str(frontend_dir.absolute()),
+    })
+
+
+_FRONTEND_NOT_BUILT_BODY = _frontend_not_built_body(_FRONTEND_DIR)
+
+# Vite emits content-hashed bundles under assets/, so they can be cached forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class _SendfileResponse(FileResponse):
+    """
+    FileResponse that hands the file path to the server when it supports the
+    ASGI pathsend extension (the server can then use sendfile), and otherwise
+    streams in larger chunks than Starlette's 64 KiB default.
+    """
+    
+    chunk_size = 1024 * 1024
+    
+    async def __call__(self, scope, receive, send):
+        self._pathsend = "http.response.pathsend" in scope.get("extensions", {})
+        await super().__call__(scope, receive, send)
+    
+    async def _handle_simple(self, send, send_header_only):
+        if not self._pathsend or send_header_only:
+            await super()._handle_simple(send, send_header_only)
+            return
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await send({"type": "http.response.pathsend", "path": str(self.path)})
+
+
+class FrontendStaticFiles(StaticFiles):
+    """StaticFiles using sendfile-capable responses and immutable caching for hashed assets."""
+    
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = _SendfileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            response = NotModifiedResponse(response.headers)
+        # index.html is not hashed and must be revalidated so new builds are picked up
+        if scope["path"].startswith("/assets/"):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+@cache
+def _routers() -> tuple:
+    """Import the API routers once and return them in registration order."""
+    from backend.src.api.routes import devices, test_stages, requirement_sets, test_runs
+    return (devices.router, test_stages.router, requirement_sets.router, test_runs.router)
+
+
+def create_app(
+    dev_mode: bool = True,
+    response_cache_ttl: float = RESPONSE_CACHE_TTL,
+    frontend_dir: Optional[Path] = None,
+) -> FastAPI:
     """
     Create and configure FastAPI application.
     
     Args:
         dev_mode: If True, enable CORS and dev features. If False, serve static files.
+        response_cache_ttl: TTL in seconds for cached GET-by-id responses (0 disables)
+        frontend_dir: Frontend build directory for prod mode (default: frontend/dist)
     
     Returns:
         Configured FastAPI application
@@ -23,8 +104,16 @@ def create_app(dev_mode: bool = True) -> FastAPI:
         title="RF Performance Tool API",
         description="Local-only RF test analysis application",
         version="1.0.0",
+        # Encode JSON responses with orjson instead of stdlib json
+        default_response_class=ORJSONResponse,
     )
     
+    # Cache GET-by-id responses; writes to the same resource invalidate them.
+    # Added before CORS so CORS wraps it and sets its headers on cached hits too
+    # (cached responses are stored without any per-origin headers)
+    if response_cache_ttl > 0:
+        app.add_middleware(ResponseCacheMiddleware, ttl_seconds=response_cache_ttl)
+    
     # CORS configuration
     if dev_mode:
         # Dev mode: Allow frontend dev server (127.0.0.1 only, not localhost or 0.0.0.0)
@@ -34,38 +123,38 @@ def create_app(dev_mode: bool = True) -> FastAPI:
                 "http://127.0.0.1:5173",
             ],
             allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
+            allow_methods=["GET", "POST", "PUT", "DELETE"],
+            allow_headers=["content-type", "authorization"],
         )
     # Prod mode: No CORS needed (same origin)
     
     # Register routes
-    app.include_router(devices.router)
-    app.include_router(test_stages.router)
-    app.include_router(requirement_sets.router)
-    app.include_router(test_runs.router)
+    for router in _routers():
+        app.include_router(router)
     
     # Health check endpoint
     @app.get("/health")
-    def health_check():
+    async def health_check():
         """Health check endpoint."""
-        return {"status": "healthy", "version": "1.0.0"}
+        return Response(content=_HEALTH_BODY, media_type="application/json")
     
     # Static file serving (prod mode only)
     if not dev_mode:
-        frontend_build = Path("frontend/dist")
-        if frontend_build.exists() and frontend_build.is_dir():
+        if frontend_dir is None:
+            frontend_build, frontend_exists = _FRONTEND_DIR, _FRONTEND_DIR_EXISTS
+            not_built_body = _FRONTEND_NOT_BUILT_BODY
+        else:
+            frontend_build, frontend_exists = frontend_dir, frontend_dir.is_dir()
+            not_built_body = _frontend_not_built_body(frontend_dir)
+        
+        if frontend_exists:
             # Serve static files from frontend/dist
-            app.mount("/", StaticFiles(directory=str(frontend_build), html=True), name="static")
+            app.mount("/", FrontendStaticFiles(directory=str(frontend_build), html=True), name="static")
         else:
             # Frontend not built - provide helpful message
             @app.get("/")
-            def frontend_not_built():
-                return {
-                    "error": "Frontend not built",
-                    "message": "Frontend build not found. To build the frontend, run: cd frontend && npm install && npm run build",
-                    "path": str(frontend_build.absolute())
-                }
+            async def frontend_not_built():
+                return Response(content=not_built_body, media_type="application/json")
     
     return app
 
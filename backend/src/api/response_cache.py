@@ -0,0 +1,139 @@
+"""
+In-process response cache for idempotent GET-by-id endpoints.
+
+Pure ASGI middleware: successful GET responses for single resources
+(e.g. /api/devices/1) are kept for a short TTL, and any write
+(POST/PUT/PATCH/DELETE) under the same resource prefix drops the cached
+entries for that prefix.
+"""
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+# Resource prefixes whose GET-by-id responses may be cached. Test runs are
+# left out: their status is updated by processing outside any HTTP write.
+CACHED_PREFIXES = (
+    "/api/devices",
+    "/api/test-stages",
+    "/api/requirement-sets",
+)
+
+_ITEM_PATH_RE = re.compile(
+    r"^(?P<prefix>" + "|".join(re.escape(p) for p in CACHED_PREFIXES) + r")/\d+$"
+)
+_WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class _CacheEntry:
+    """Cached response (status, headers, body) with expiry time."""
+
+    __slots__ = ("status", "headers", "body", "expires_at")
+
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes, expires_at: float):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.expires_at = expires_at
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware caching GET-by-id responses with write invalidation."""
+
+    def __init__(self, app, ttl_seconds: float = 60.0, max_entries: int = 1024):
+        """
+        Initialize response cache middleware.
+
+        Args:
+            app: Downstream ASGI application
+            ttl_seconds: How long a cached response stays valid
+            max_entries: Maximum number of cached responses (oldest evicted first)
+        """
+        self.app = app
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, _CacheEntry] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+
+        if method in _WRITE_METHODS:
+            prefix = _resource_prefix(path)
+            if prefix is not None:
+                # Invalidate before and after so a GET racing the write cannot keep stale data
+                self.invalidate(prefix)
+                try:
+                    await self.app(scope, receive, send)
+                finally:
+                    self.invalidate(prefix)
+                return
+
+        if method != "GET" or _ITEM_PATH_RE.match(path) is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = path if not scope.get("query_string") else f"{path}?{scope['query_string'].decode('latin-1')}"
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                await send({"type": "http.response.start", "status": entry.status, "headers": entry.headers})
+                await send({"type": "http.response.body", "body": entry.body})
+                return
+            self._entries.pop(key, None)
+
+        await self._call_and_store(key, scope, receive, send)
+
+    async def _call_and_store(self, key: str, scope, receive, send) -> None:
+        """Forward the request and cache the response if it is a complete 200."""
+        start_message: Optional[dict] = None
+        body_parts: List[bytes] = []
+        cacheable = True
+
+        async def capture_send(message):
+            nonlocal start_message, cacheable
+            if message["type"] == "http.response.start":
+                start_message = message
+                cacheable = message["status"] == 200
+            elif message["type"] == "http.response.body" and cacheable:
+                body_parts.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    # Streaming responses are not cached
+                    cacheable = False
+            await send(message)
+
+        await self.app(scope, receive, capture_send)
+
+        if cacheable and start_message is not None:
+            self._store(key, _CacheEntry(
+                status=start_message["status"],
+                headers=list(start_message.get("headers", [])),
+                body=b"".join(body_parts),
+                expires_at=time.monotonic() + self.ttl_seconds,
+            ))
+
+    def _store(self, key: str, entry: _CacheEntry) -> None:
+        """Store an entry, evicting the oldest one when full."""
+        if len(self._entries) >= self.max_entries and key not in self._entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = entry
+
+    def invalidate(self, prefix: Optional[str] = None) -> None:
+        """Drop cached entries under a resource prefix (or all entries)."""
+        if prefix is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k.startswith(prefix + "/")]:
+            del self._entries[key]
+
+
+def _resource_prefix(path: str) -> Optional[str]:
+    """Return the cached resource prefix a path belongs to, if any."""
+    for prefix in CACHED_PREFIXES:
+        if path == prefix or path.startswith(prefix + "/"):
+            return prefix
+    return None
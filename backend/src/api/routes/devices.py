@@ -27,7 +27,7 @@ def create_device(device: DeviceConfig, db: IDatabase = Depends(get_database)):
 
 
 @router.get("", response_model=List[dict])
-def list_devices(db: IDatabase = Depends(get_database)):
+async def list_devices(db: IDatabase = Depends(get_database)):
     """List all devices."""
     # Note: This requires adding a list method to IDatabase interface
     # For now, return empty list
@@ -3,7 +3,7 @@ Requirement set management routes.
 """
 from typing import List
 from fastapi import APIRouter, HTTPException, Depends
-from backend.src.core.schemas.requirement_set import RequirementSet
+from backend.src.core.schemas.requirement_set import RequirementSet, compute_requirement_hash
 from backend.src.storage.interfaces import IDatabase
 from backend.src.api.dependencies import get_database
 
@@ -15,12 +15,17 @@ router = APIRouter(prefix="/api/requirement-sets", tags=["requirement-sets"])
 def create_requirement_set(req_set: RequirementSet, db: IDatabase = Depends(get_database)):
     """Create a new requirement set."""
     try:
+        # Dump once and hash from the dumped dicts rather than walking the model twice
+        metric_limits = [limit.model_dump() for limit in req_set.metric_limits]
+        pass_policy = req_set.pass_policy.model_dump() if req_set.pass_policy else None
         req_set_id = db.create_requirement_set({
             "name": req_set.name,
             "test_type": req_set.test_type,
-            "metric_limits": [limit.model_dump() for limit in req_set.metric_limits],
-            "pass_policy": req_set.pass_policy.model_dump() if req_set.pass_policy else None,
-            "requirement_hash": req_set.compute_hash(),
+            "metric_limits": metric_limits,
+            "pass_policy": pass_policy,
+            "requirement_hash": compute_requirement_hash(
+                req_set.name, req_set.test_type, metric_limits, pass_policy
+            ),
         })
         return {"id": req_set_id, "message": "Requirement set created successfully"}
     except Exception as e:
@@ -28,7 +33,7 @@ def create_requirement_set(req_set: RequirementSet, db: IDatabase = Depends(get_
 
 
 @router.get("", response_model=List[dict])
-def list_requirement_sets(db: IDatabase = Depends(get_database)):
+async def list_requirement_sets(db: IDatabase = Depends(get_database)):
     """List all requirement sets."""
     # Note: This requires adding a list method to IDatabase interface
     return []
@@ -3,6 +3,8 @@ Test run management routes.
 """
 from typing import List
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from pathlib import Path
 from backend.src.core.schemas.test_run import TestRun, TestRunStatus
 from backend.src.storage.interfaces import IDatabase, IFileStorage
@@ -10,10 +12,15 @@ from backend.src.api.dependencies import get_database, get_file_storage, get_tes
 from backend.src.services.test_run_service import TestRunService
 from backend.src.core.schemas.device import DeviceConfig
 from backend.src.core.schemas.requirement_set import RequirementSet
+from backend.src.core.schemas.metadata import EffectiveMetadata
+from backend.src.plugins.s_parameter.parser import parse_filename_metadata
 
 
 router = APIRouter(prefix="/api/test-runs", tags=["test-runs"])
 
+# Uploads are streamed to storage in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
 
 @router.post("", response_model=dict, status_code=201)
 def create_test_run(
@@ -34,7 +41,7 @@ def create_test_run(
 
 
 @router.get("", response_model=List[dict])
-def list_test_runs(db: IDatabase = Depends(get_database)):
+async def list_test_runs(db: IDatabase = Depends(get_database)):
     """List all test runs."""
     # Note: This requires adding a list method to IDatabase interface
     return []
@@ -46,7 +53,9 @@ def get_test_run(test_run_id: int, db: IDatabase = Depends(get_database)):
     test_run = db.get_test_run(test_run_id)
     if test_run is None:
         raise HTTPException(status_code=404, detail="Test run not found")
-    return test_run
+    # The row dict is already JSON-shaped; orjson encodes its datetimes
+    # natively, skipping response_model validation and jsonable encoding
+    return ORJSONResponse(test_run)
 
 
 @router.post("/{test_run_id}/upload", response_model=dict, status_code=200)
@@ -62,16 +71,25 @@ async def upload_files(
     Note: This endpoint only stores files. Processing requires device_config and requirement_set.
     """
     
-    # Verify test run exists
-    test_run = db.get_test_run(test_run_id)
+    # Verify test run exists (SQLite calls run in the threadpool, off the event loop)
+    test_run = await run_in_threadpool(db.get_test_run, test_run_id)
     if test_run is None:
         raise HTTPException(status_code=404, detail="Test run not found")
     
     uploaded_files = []
     for file in files:
-        content = await file.read()
-        stored_path = file_storage.store_uploaded_file(test_run_id, file.filename, content)
-        uploaded_files.append({"filename": file.filename, "stored_path": str(stored_path)})
+        # Stream to disk in fixed-size chunks instead of buffering the whole file
+        size = 0
+        async with file_storage.open_upload_stream(test_run_id, file.filename, size_hint=file.size) as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await out.write(chunk)
+                size += len(chunk)
+        stored_path = file_storage.get_file_path(test_run_id, file.filename)
+        uploaded_files.append({"filename": file.filename, "stored_path": str(stored_path), "size": size})
+    
+    file_ids = await run_in_threadpool(_register_uploaded_files, db, test_run_id, uploaded_files)
+    for uploaded, file_id in zip(uploaded_files, file_ids):
+        uploaded["id"] = file_id
     
     return {
         "test_run_id": test_run_id,
@@ -80,6 +98,21 @@ async def upload_files(
     }
 
 
+def _register_uploaded_files(db: IDatabase, test_run_id: int, uploaded_files: List[dict]) -> List[int]:
+    """Parse each upload's filename metadata and register all files in a single transaction."""
+    file_rows = [
+        {
+            "original_filename": uploaded["filename"],
+            "stored_path": uploaded["stored_path"],
+            "effective_metadata": EffectiveMetadata.from_parsed_and_overrides(
+                parse_filename_metadata(uploaded["filename"])
+            ).model_dump(mode='json'),
+        }
+        for uploaded in uploaded_files
+    ]
+    return db.add_test_run_files_bulk(test_run_id, file_rows)
+
+
 @router.post("/{test_run_id}/process", response_model=dict, status_code=200)
 async def process_test_run(
     test_run_id: int,
@@ -102,7 +135,7 @@ async def process_test_run(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{test_run_id}/compliance", response_model=dict)
+@router.get("/{test_run_id}/compliance", response_model=dict, response_class=ORJSONResponse)
 def get_compliance(test_run_id: int, db: IDatabase = Depends(get_database)):
     """Get compliance results for a test run."""
     test_run = db.get_test_run(test_run_id)
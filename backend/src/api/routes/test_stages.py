@@ -27,7 +27,7 @@ def create_test_stage(stage: TestStage, db: IDatabase = Depends(get_database)):
 
 
 @router.get("", response_model=List[dict])
-def list_test_stages(db: IDatabase = Depends(get_database)):
+async def list_test_stages(db: IDatabase = Depends(get_database)):
     """List all test stages."""
     # Note: This requires adding a list method to IDatabase interface
     return []
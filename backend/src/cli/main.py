@@ -4,28 +4,73 @@ CLI tool for RF Performance Tool.
 Provides command-line interface for testing all functionality without UI.
 """
 import argparse
-import json
 import sys
+from functools import cache
 from pathlib import Path
 from typing import List
 
+import orjson
+
 from backend.src.plugins.s_parameter.parser import parse_filename_metadata
-from backend.src.plugins.s_parameter.loader import load_s_parameter_file
-from backend.src.plugins.s_parameter.metrics import (
-    compute_gain_db,
-    compute_vswr,
-    compute_return_loss_db,
-    compute_gain_flatness,
-)
-from backend.src.plugins.s_parameter.compliance import evaluate_compliance
-from backend.src.plugins.s_parameter.plotting import render_plot
 from backend.src.core.schemas.device import DeviceConfig, SParameterConfig, FrequencyBand
 from backend.src.core.schemas.requirement_set import RequirementSet, MetricLimit, PassPolicy
 from backend.src.core.schemas.plotting import PlotSpec, PlotConfig, PlotSeries
-from backend.src.storage.storage_service import StorageService
-from backend.src.storage.database import create_database_engine, init_database
-from backend.src.storage.sqlite_db import SQLiteDatabase
-from sqlalchemy.orm import sessionmaker
+
+# NumPy/scikit-rf, matplotlib and SQLAlchemy are imported inside the commands
+# that need them so short commands like `parse` start quickly.
+
+
+def _construct_band(data: dict) -> FrequencyBand:
+    """Build a FrequencyBand from trusted data without validation."""
+    return FrequencyBand.model_construct(**data)
+
+
+def _load_device_config(path: Path, trusted: bool = False) -> DeviceConfig:
+    """
+    Load a device config JSON file.
+    
+    With trusted=True, validation is skipped (model_construct) - only use this
+    for configs written by this tool.
+    """
+    raw = path.read_bytes()
+    if not trusted:
+        # Parse and validate in one pass inside pydantic-core
+        return DeviceConfig.model_validate_json(raw)
+    
+    data = orjson.loads(raw)
+    s_param = data.get("s_parameter_config")
+    if s_param is not None:
+        s_param = dict(s_param)
+        s_param["operational_band_hz"] = _construct_band(s_param["operational_band_hz"])
+        s_param["wideband_band_hz"] = _construct_band(s_param["wideband_band_hz"])
+        s_param["additional_traces"] = tuple(s_param.get("additional_traces", ()))
+        if s_param.get("port_labels"):
+            # JSON object keys are strings; port numbers are ints
+            s_param["port_labels"] = {int(k): v for k, v in s_param["port_labels"].items()}
+        data["s_parameter_config"] = SParameterConfig.model_construct(**s_param)
+    return DeviceConfig.model_construct(**data)
+
+
+def _load_requirement_set(path: Path, trusted: bool = False) -> RequirementSet:
+    """
+    Load a requirement set JSON file.
+    
+    With trusted=True, validation is skipped (model_construct) - only use this
+    for requirement sets written by this tool.
+    """
+    raw = path.read_bytes()
+    if not trusted:
+        # Parse and validate in one pass inside pydantic-core
+        return RequirementSet.model_validate_json(raw)
+    
+    data = orjson.loads(raw)
+    data["metric_limits"] = [
+        MetricLimit.model_construct(**{**limit, "frequency_band": _construct_band(limit["frequency_band"])})
+        for limit in data.get("metric_limits", [])
+    ]
+    if data.get("pass_policy") is not None:
+        data["pass_policy"] = PassPolicy.model_construct(**data["pass_policy"])
+    return RequirementSet.model_construct(**data)
 
 
 def cmd_parse(args):
@@ -49,6 +94,8 @@ def cmd_parse(args):
 
 def cmd_load(args):
     """Load S-parameter file."""
+    from backend.src.plugins.s_parameter.loader import load_s_parameter_file
+    
     file_path = Path(args.file_path)
     
     try:
@@ -65,13 +112,14 @@ def cmd_load(args):
 
 def cmd_compute(args):
     """Compute metrics from S-parameter file."""
+    from backend.src.plugins.s_parameter.loader import load_s_parameter_file
+    from backend.src.plugins.s_parameter.metrics import compute_all_metrics
+    
     file_path = Path(args.file_path)
     config_path = Path(args.device_config)
     
     # Load device config
-    with open(config_path) as f:
-        config_data = json.load(f)
-    device_config = DeviceConfig(**config_data)
+    device_config = _load_device_config(config_path, trusted=getattr(args, "trust_config", False))
     
     if not device_config.s_parameter_config:
         print("Error: Device config must include s_parameter_config", file=sys.stderr)
@@ -86,11 +134,12 @@ def cmd_compute(args):
     
     s_config = device_config.s_parameter_config
     
-    # Compute metrics
-    gain = compute_gain_db(network, s_config.gain_parameter)
-    vswr = compute_vswr(network, s_config.input_return_parameter)
-    return_loss = compute_return_loss_db(network, s_config.input_return_parameter)
-    flatness = compute_gain_flatness(gain, network.f, s_config.operational_band_hz)
+    # Compute metrics (single fused pass over the S-parameter data)
+    metrics = compute_all_metrics(network, s_config)
+    gain = metrics["gain"]
+    vswr = metrics["vswr"]
+    return_loss = metrics["return_loss"]
+    flatness = metrics["gain_flatness"]
     
     print(f"Computed metrics for {file_path.name}:")
     print(f"  Gain ({s_config.gain_parameter}): min={gain.min():.2f} dB, max={gain.max():.2f} dB")
@@ -98,17 +147,18 @@ def cmd_compute(args):
     print(f"  Return Loss ({s_config.input_return_parameter}): min={return_loss.min():.2f} dB, max={return_loss.max():.2f} dB")
     print(f"  Gain Flatness (operational band): {flatness:.2f} dB")
     
-    # Optionally save to JSON
+    # Optionally save to JSON (orjson serializes the NumPy arrays directly)
     if args.output:
         output_data = {
-            "gain": gain.tolist(),
-            "vswr": vswr.tolist(),
-            "return_loss": return_loss.tolist(),
+            "gain": gain,
+            "vswr": vswr,
+            "return_loss": return_loss,
             "gain_flatness": flatness,
-            "frequencies": network.f.tolist(),
+            "frequencies": network.f,
         }
-        with open(args.output, 'w') as f:
-            json.dump(output_data, f, indent=2)
+        Path(args.output).write_bytes(
+            orjson.dumps(output_data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2)
+        )
         print(f"\nMetrics saved to {args.output}")
     
     return 0
@@ -116,26 +166,25 @@ def cmd_compute(args):
 
 def cmd_evaluate(args):
     """Evaluate compliance."""
+    import numpy as np
+    from backend.src.plugins.s_parameter.compliance import evaluate_compliance
+    
     metrics_path = Path(args.metrics_json)
     requirements_path = Path(args.requirements_json)
     
     # Load metrics
-    with open(metrics_path) as f:
-        metrics_data = json.load(f)
+    metrics_data = orjson.loads(metrics_path.read_bytes())
     
     # Load requirements
-    with open(requirements_path) as f:
-        req_data = json.load(f)
-    requirement_set = RequirementSet(**req_data)
+    requirement_set = _load_requirement_set(requirements_path, trusted=getattr(args, "trust_config", False))
     
     # Convert metrics to numpy arrays
-    import numpy as np
     metrics = {
-        k: np.array(v) if isinstance(v, list) else v
+        k: np.asarray(v) if isinstance(v, list) else v
         for k, v in metrics_data.items()
         if k != "frequencies"
     }
-    frequencies = np.array(metrics_data["frequencies"])
+    frequencies = np.asarray(metrics_data["frequencies"])
     
     # Evaluate
     result = evaluate_compliance(metrics, frequencies, requirement_set)
@@ -154,18 +203,15 @@ def cmd_evaluate(args):
 
 def cmd_plot(args):
     """Generate plot."""
+    from backend.src.plugins.s_parameter.plotting import render_plot
+    
     spec_path = Path(args.spec_json)
     config_path = Path(args.config_json)
     output_path = Path(args.output)
     
-    # Load plot spec and config
-    with open(spec_path) as f:
-        spec_data = json.load(f)
-    with open(config_path) as f:
-        config_data = json.load(f)
-    
-    plot_spec = PlotSpec(**spec_data)
-    plot_config = PlotConfig(**config_data)
+    # Load plot spec and config (JSON parsed and validated by pydantic-core)
+    plot_spec = PlotSpec.model_validate_json(spec_path.read_bytes())
+    plot_config = PlotConfig.model_validate_json(config_path.read_bytes())
     
     # Render plot
     render_plot(plot_spec, plot_config, output_path)
@@ -175,16 +221,17 @@ def cmd_plot(args):
 
 def cmd_run(args):
     """Run full pipeline."""
+    from backend.src.storage.storage_service import StorageService
+    
     test_run_id = args.test_run_id
     file_paths = [Path(p) for p in args.file_paths]
     device_config_path = Path(args.device_config)
     requirement_set_path = Path(args.requirement_set)
     
     # Load configs
-    with open(device_config_path) as f:
-        device_config = DeviceConfig(**json.load(f))
-    with open(requirement_set_path) as f:
-        requirement_set = RequirementSet(**json.load(f))
+    trusted = getattr(args, "trust_config", False)
+    device_config = _load_device_config(device_config_path, trusted=trusted)
+    requirement_set = _load_requirement_set(requirement_set_path, trusted=trusted)
     
     # Initialize storage
     storage = StorageService(
@@ -221,6 +268,10 @@ def cmd_run(args):
 
 def cmd_test_db(args):
     """Test database operations."""
+    from sqlalchemy.orm import sessionmaker
+    from backend.src.storage.database import create_database_engine, init_database
+    from backend.src.storage.sqlite_db import SQLiteDatabase
+    
     database_url = args.database_url or "sqlite:///:memory:"
     
     engine = create_database_engine(database_url)
@@ -276,8 +327,24 @@ def cmd_test_storage(args):
     return 0
 
 
-def main():
-    """Main CLI entry point."""
+TRUST_CONFIG_HELP = "Skip validation of config JSON (only for files written by this tool)"
+
+# Command name -> handler
+_COMMANDS = {
+    "parse": cmd_parse,
+    "load": cmd_load,
+    "compute": cmd_compute,
+    "evaluate": cmd_evaluate,
+    "plot": cmd_plot,
+    "run": cmd_run,
+    "test-db": cmd_test_db,
+    "test-storage": cmd_test_storage,
+}
+
+
+@cache
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser (once per process)."""
     parser = argparse.ArgumentParser(
         description="RF Performance Tool CLI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -298,11 +365,13 @@ def main():
     compute_parser.add_argument("file_path", help="Path to S-parameter file")
     compute_parser.add_argument("device_config", help="Path to device config JSON")
     compute_parser.add_argument("--output", help="Output JSON file for metrics")
+    compute_parser.add_argument("--trust-config", action="store_true", help=TRUST_CONFIG_HELP)
     
     # Evaluate command
     eval_parser = subparsers.add_parser("evaluate", help="Evaluate compliance")
     eval_parser.add_argument("metrics_json", help="Path to metrics JSON file")
     eval_parser.add_argument("requirements_json", help="Path to requirements JSON file")
+    eval_parser.add_argument("--trust-config", action="store_true", help=TRUST_CONFIG_HELP)
     
     # Plot command
     plot_parser = subparsers.add_parser("plot", help="Generate plot")
@@ -318,6 +387,7 @@ def main():
     run_parser.add_argument("requirement_set", help="Path to requirement set JSON")
     run_parser.add_argument("--database-url", help="Database URL (default: sqlite:///rf_tool.db)")
     run_parser.add_argument("--storage-path", help="Storage path (default: results)")
+    run_parser.add_argument("--trust-config", action="store_true", help=TRUST_CONFIG_HELP)
     
     # Test DB command
     test_db_parser = subparsers.add_parser("test-db", help="Test database operations")
@@ -327,6 +397,12 @@ def main():
     test_storage_parser = subparsers.add_parser("test-storage", help="Test file storage operations")
     test_storage_parser.add_argument("--storage-path", help="Storage path (default: results)")
     
+    return parser
+
+
+def main():
+    """Main CLI entry point."""
+    parser = _build_parser()
     args = parser.parse_args()
     
     if not args.command:
@@ -334,18 +410,7 @@ def main():
         return 1
     
     # Route to command handler
-    commands = {
-        "parse": cmd_parse,
-        "load": cmd_load,
-        "compute": cmd_compute,
-        "evaluate": cmd_evaluate,
-        "plot": cmd_plot,
-        "run": cmd_run,
-        "test-db": cmd_test_db,
-        "test-storage": cmd_test_storage,
-    }
-    
-    handler = commands.get(args.command)
+    handler = _COMMANDS.get(args.command)
     if handler:
         return handler(args)
     else:
@@ -355,4 +420,3 @@ def main():
 
 if __name__ == "__main__":
     sys.exit(main())
-
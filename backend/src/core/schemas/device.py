@@ -1,22 +1,35 @@
 """
 Device and device configuration models.
 """
-from pydantic import BaseModel, Field, field_validator
+import re
+from functools import lru_cache
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional, Literal
 
 
+# S-parameter name: "S" followed by two single-digit port numbers (1-9)
+_SIJ_RE = re.compile(r"^S[1-9][1-9]$")
+
+
+@lru_cache(maxsize=256)
+def _port_numbers(s_param: str) -> Optional[tuple[int, int]]:
+    """Parse "Sij" into (i, j), or None if it is not a valid S-parameter name."""
+    if not _SIJ_RE.match(s_param):
+        return None
+    return int(s_param[1]), int(s_param[2])
+
+
 class FrequencyBand(BaseModel):
     """Frequency band definition."""
     start_hz: float = Field(..., gt=0, description="Start frequency in Hz")
     stop_hz: float = Field(..., gt=0, description="Stop frequency in Hz")
 
-    @field_validator("stop_hz")
-    @classmethod
-    def validate_stop_greater_than_start(cls, v, info):
+    @model_validator(mode="after")
+    def validate_stop_greater_than_start(self):
         """Validate that stop frequency is greater than start frequency."""
-        if "start_hz" in info.data and v <= info.data["start_hz"]:
+        if self.stop_hz <= self.start_hz:
             raise ValueError("stop_hz must be greater than start_hz")
-        return v
+        return self
 
 
 class SParameterConfig(BaseModel):
@@ -26,7 +39,7 @@ class SParameterConfig(BaseModel):
     gain_parameter: str = Field(default="S21", description="S-parameter for gain (e.g., S21, S31)")
     input_return_parameter: str = Field(default="S11", description="S-parameter for input return loss")
     output_return_parameter: Optional[str] = Field(default="S22", description="S-parameter for output return loss")
-    additional_traces: list[str] = Field(default_factory=list, description="Additional Sij traces to plot")
+    additional_traces: tuple[str, ...] = Field(default_factory=tuple, description="Additional Sij traces to plot")
     port_labels: Optional[dict[int, str]] = Field(None, description="Port labels (e.g., {1: 'RF IN', 2: 'RF OUT'})")
 
     @field_validator("gain_parameter", "input_return_parameter", "output_return_parameter")
@@ -37,56 +50,45 @@ class SParameterConfig(BaseModel):
             return v
         if not isinstance(v, str):
             raise ValueError("S-parameter must be a string")
+        if _port_numbers(v) is not None:
+            return v
         if not v.startswith("S"):
             raise ValueError("S-parameter must start with 'S'")
-        # Extract port numbers (e.g., "S21" -> i=2, j=1)
-        try:
-            port_str = v[1:]
-            if len(port_str) != 2:
-                raise ValueError("S-parameter must have format Sij where i and j are single digits")
-            i, j = int(port_str[0]), int(port_str[1])
-            if i < 1 or j < 1 or i > 9 or j > 9:
-                raise ValueError("Port numbers must be between 1 and 9")
-        except (ValueError, IndexError) as e:
-            raise ValueError(f"Invalid S-parameter format: {v}") from e
-        return v
+        raise ValueError(f"Invalid S-parameter format: {v}")
+
+    @field_validator("additional_traces", mode="before")
+    @classmethod
+    def validate_additional_traces(cls, v):
+        """Check every trace is an Sij name in one pass (empty input short-circuits)."""
+        if not v:
+            return ()
+        if isinstance(v, str):
+            raise ValueError("additional_traces must be a list of S-parameters")
+        invalid = [t for t in v if not (isinstance(t, str) and _SIJ_RE.match(t))]
+        if invalid:
+            raise ValueError(f"Invalid S-parameter format: {invalid[0]}")
+        return tuple(v)
 
     def validate_against_port_count(self, port_count: int) -> None:
         """Validate that S-parameters are valid for the given port count."""
-        def get_port_numbers(s_param: str) -> tuple[int, int]:
-            port_str = s_param[1:]
-            return int(port_str[0]), int(port_str[1])
-
-        def check_port_valid(port: int) -> None:
-            if port < 1 or port > port_count:
-                raise ValueError(f"Port {port} is invalid for {port_count}-port device")
-
-        if self.gain_parameter:
-            i, j = get_port_numbers(self.gain_parameter)
-            check_port_valid(i)
-            check_port_valid(j)
-
-        if self.input_return_parameter:
-            i, j = get_port_numbers(self.input_return_parameter)
-            check_port_valid(i)
-            check_port_valid(j)
-
-        if self.output_return_parameter:
-            i, j = get_port_numbers(self.output_return_parameter)
-            check_port_valid(i)
-            check_port_valid(j)
-
-        for trace in self.additional_traces:
-            i, j = get_port_numbers(trace)
-            check_port_valid(i)
-            check_port_valid(j)
+        params = [self.gain_parameter, self.input_return_parameter, self.output_return_parameter]
+        params.extend(self.additional_traces)
+        for s_param in params:
+            if not s_param:
+                continue
+            ports = _port_numbers(s_param)
+            if ports is None:
+                raise ValueError(f"Invalid S-parameter format: {s_param}")
+            for port in ports:
+                if port < 1 or port > port_count:
+                    raise ValueError(f"Port {port} is invalid for {port_count}-port device")
 
 
 class DeviceConfig(BaseModel):
     """Device configuration."""
-    name: str = Field(..., min_length=1, description="Device name")
+    name: str = Field(..., min_length=1, max_length=200, description="Device name")
     description: Optional[str] = Field(None, description="Device description")
-    part_number: Optional[str] = Field(None, description="Part number")
+    part_number: Optional[str] = Field(None, max_length=100, description="Part number")
     revision: Optional[str] = Field(None, description="Revision")
     supported_test_types: list[str] = Field(default_factory=list, description="Supported test types")
     s_parameter_config: Optional[SParameterConfig] = Field(None, description="S-parameter configuration")
@@ -48,7 +48,8 @@ class EffectiveMetadata(BaseModel):
     ) -> "EffectiveMetadata":
         """Create effective metadata from parsed and optional overrides."""
         overrides = overrides or UserOverrides()
-        return cls(
+        # Both inputs were validated by their own models; skip re-validation
+        return cls.model_construct(
             serial_number=overrides.serial_number or parsed.serial_number,
             path=overrides.path or parsed.path,
             part_number=overrides.part_number or parsed.part_number,
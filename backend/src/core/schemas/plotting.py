@@ -1,15 +1,37 @@
 """
 Plotting models (PlotSpec and PlotConfig).
 """
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, BeforeValidator, Field, PlainSerializer, WithJsonSchema
+from typing import Annotated, Optional
 import numpy as np
 
 
+def _to_float_array(v) -> np.ndarray:
+    """Convert the whole sequence to a float64 array in one call (1-D only)."""
+    try:
+        array = np.asarray(v, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("must be a sequence of numbers")
+    # Checked before ascontiguousarray, which would promote a scalar to 1-D
+    if array.ndim != 1:
+        raise ValueError("must be a one-dimensional sequence of numbers")
+    return np.ascontiguousarray(array)
+
+
+# 1-D float64 array; plain lists only at the JSON boundary, and a JSON schema
+# of a number array so models using it still work as API/OpenAPI models
+FloatArray = Annotated[
+    np.ndarray,
+    BeforeValidator(_to_float_array),
+    PlainSerializer(lambda v: v.tolist(), return_type=list[float], when_used="json"),
+    WithJsonSchema({"type": "array", "items": {"type": "number"}}),
+]
+
+
 class PlotSeries(BaseModel):
     """Data series for plotting."""
-    frequency_hz: list[float] = Field(..., description="Frequency array in Hz")
-    values: list[float] = Field(..., description="Y-axis values")
+    frequency_hz: FloatArray = Field(..., description="Frequency array in Hz")
+    values: FloatArray = Field(..., description="Y-axis values")
     label: str = Field(..., description="Series label")
     trace_identity: Optional[str] = Field(None, description="Trace identity (e.g., PRI, RED)")
     parameter_identity: Optional[str] = Field(None, description="Parameter identity (e.g., Gain S21)")
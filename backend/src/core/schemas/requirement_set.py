@@ -1,11 +1,19 @@
 """
 Requirement set and metric limit models.
 """
+import hashlib
+import json
+import sys
 from typing import Optional, Literal
 from pydantic import BaseModel, Field, field_validator
 from .device import FrequencyBand
 
 
+# Allowed values, built once instead of on every validator call
+_VALID_METRICS = frozenset({"gain", "vswr", "return_loss", "gain_flatness"})
+_VALID_PATHS = frozenset({"PRI", "RED"})
+
+
 class MetricLimit(BaseModel):
     """Metric limit definition."""
     metric_name: str = Field(..., description="Metric name (e.g., 'gain', 'vswr', 'return_loss')")
@@ -19,10 +27,10 @@ class MetricLimit(BaseModel):
     @classmethod
     def validate_metric_name(cls, v):
         """Validate metric name."""
-        valid_metrics = {"gain", "vswr", "return_loss", "gain_flatness"}
-        if v not in valid_metrics:
-            raise ValueError(f"Metric name must be one of: {valid_metrics}")
-        return v
+        if v not in _VALID_METRICS:
+            raise ValueError(f"Metric name must be one of: {sorted(_VALID_METRICS)}")
+        # Interned: the same few names repeat across every limit
+        return sys.intern(v)
 
 
 class PassPolicy(BaseModel):
@@ -34,17 +42,17 @@ class PassPolicy(BaseModel):
     @classmethod
     def validate_paths(cls, v):
         """Validate path identifiers."""
-        valid_paths = {"PRI", "RED"}
-        for path in v:
-            if path.upper() not in valid_paths:
-                raise ValueError(f"Path must be one of: {valid_paths}")
-        return [p.upper() for p in v]
+        paths = [sys.intern(p.upper()) for p in v]
+        for path in paths:
+            if path not in _VALID_PATHS:
+                raise ValueError(f"Path must be one of: {sorted(_VALID_PATHS)}")
+        return paths
 
 
 class RequirementSet(BaseModel):
     """Requirement set model."""
     id: Optional[int] = Field(None, description="Requirement set ID")
-    name: str = Field(..., min_length=1, description="Requirement set name")
+    name: str = Field(..., min_length=1, max_length=200, description="Requirement set name")
     test_type: str = Field(..., description="Test type (e.g., 's_parameter')")
     test_stage_id: Optional[int] = Field(None, description="Associated test stage ID")
     metric_limits: list[MetricLimit] = Field(default_factory=list, description="Metric limits")
@@ -52,30 +60,60 @@ class RequirementSet(BaseModel):
 
     def compute_hash(self) -> str:
         """Compute hash of requirement set for traceability."""
-        import hashlib
-        import json
-        # Create a deterministic JSON representation
-        data = {
-            "name": self.name,
-            "test_type": self.test_type,
-            "metric_limits": [
-                {
-                    "metric_name": m.metric_name,
-                    "aggregation": m.aggregation,
-                    "operator": m.operator,
-                    "limit_value": m.limit_value,
-                    "frequency_band": {
-                        "start_hz": m.frequency_band.start_hz,
-                        "stop_hz": m.frequency_band.stop_hz,
-                    },
-                }
-                for m in self.metric_limits
-            ],
-            "pass_policy": {
-                "all_files_must_pass": self.pass_policy.all_files_must_pass,
-                "required_paths": self.pass_policy.required_paths,
-            },
-        }
-        json_str = json.dumps(data, sort_keys=True)
-        return hashlib.sha256(json_str.encode()).hexdigest()[:16]
+        # pydantic-core builds exactly the hashed fields; no Python-level dict walk
+        data = self.model_dump(include=_HASH_INCLUDE)
+        return hashlib.sha256(_HASH_ENCODER.encode(data).encode()).hexdigest()[:16]
+
+
+# Fields that identify a requirement set (descriptions and IDs are excluded)
+_HASH_INCLUDE = {
+    "name": True,
+    "test_type": True,
+    "metric_limits": {
+        "__all__": {"metric_name", "aggregation", "operator", "limit_value", "frequency_band"},
+    },
+    "pass_policy": {"all_files_must_pass", "required_paths"},
+}
+
+# Same output as json.dumps(data, sort_keys=True), without building an encoder per call
+_HASH_ENCODER = json.JSONEncoder(sort_keys=True)
+
 
+def compute_requirement_hash(
+    name: str,
+    test_type: str,
+    metric_limits: list[dict],
+    pass_policy: Optional[dict],
+) -> str:
+    """
+    Compute requirement set hash from already-dumped metric limits and pass policy.
+    
+    Lets callers that have already serialized the requirement set reuse those
+    dicts instead of walking the model a second time. Produces the same hash
+    as RequirementSet.compute_hash().
+    """
+    if pass_policy is None:
+        pass_policy = PassPolicy().model_dump()
+    # Create a deterministic JSON representation
+    data = {
+        "name": name,
+        "test_type": test_type,
+        "metric_limits": [
+            {
+                "metric_name": m["metric_name"],
+                "aggregation": m["aggregation"],
+                "operator": m["operator"],
+                "limit_value": m["limit_value"],
+                "frequency_band": {
+                    "start_hz": m["frequency_band"]["start_hz"],
+                    "stop_hz": m["frequency_band"]["stop_hz"],
+                },
+            }
+            for m in metric_limits
+        ],
+        "pass_policy": {
+            "all_files_must_pass": pass_policy["all_files_must_pass"],
+            "required_paths": pass_policy["required_paths"],
+        },
+    }
+    return hashlib.sha256(_HASH_ENCODER.encode(data).encode()).hexdigest()[:16]
@@ -3,26 +3,45 @@ Main entry point for running the FastAPI server.
 """
 import uvicorn
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
+# Import string for the app; uvicorn needs this (not an app object) for reload/workers
+APP_IMPORT_STRING = "backend.src.api.main:app"
+
+
+def _server_options(dev_mode: bool) -> dict:
+    """
+    Build uvicorn options for the given mode.
+
+    Uses the uvloop event loop and httptools HTTP parser when installed (they
+    come with uvicorn[standard]; uvloop is not available on Windows). Prod mode
+    runs RF_TOOL_WORKERS worker processes (default 1: with the response cache
+    enabled each worker keeps its own, so only raise this if stale GET-by-id
+    reads are acceptable).
+    """
+    options = {
+        "loop": "uvloop" if find_spec("uvloop") else "asyncio",
+        "http": "httptools" if find_spec("httptools") else "h11",
+        "reload": dev_mode,  # Auto-reload in dev mode
+    }
+    if not dev_mode:
+        # uvicorn rejects reload together with multiple workers
+        options["workers"] = int(os.getenv("RF_TOOL_WORKERS", "1"))
+    return options
+
+
 if __name__ == "__main__":
     # Get configuration from environment variables
     host = os.getenv("RF_TOOL_HOST", "127.0.0.1")
     port = int(os.getenv("RF_TOOL_PORT", "8000"))
     dev_mode = os.getenv("RF_TOOL_DEV_MODE", "true").lower() == "true"
-    reload = dev_mode  # Auto-reload in dev mode
-    
-    # Import app
-    from backend.src.api.main import create_app
-    app = create_app(dev_mode=dev_mode)
-    
-    # Run server
+
+    # Run server (the app module reads RF_TOOL_DEV_MODE itself)
     uvicorn.run(
-        app,
+        APP_IMPORT_STRING,
         host=host,
         port=port,
-        reload=reload,
         log_level="info",
+        **_server_options(dev_mode),
     )
-
-
@@ -13,10 +13,15 @@ from backend.src.core.schemas.device import FrequencyBand
 class ComplianceResult:
     """Result of compliance evaluation."""
     
-    def __init__(self):
-        self.requirements: List[Dict[str, Any]] = []
+    __slots__ = ("requirements", "overall_pass", "failure_reasons", "_preallocated")
+    
+    def __init__(self, num_requirements: int = 0):
+        # Preallocated when the number of requirements is known up front; such
+        # results are filled by index with set_requirement_result() only
+        self.requirements: List[Optional[Dict[str, Any]]] = [None] * num_requirements
         self.overall_pass: bool = True
         self.failure_reasons: List[str] = []
+        self._preallocated = num_requirements > 0
     
     def add_requirement_result(
         self,
@@ -26,14 +31,31 @@ class ComplianceResult:
         passed: bool,
         failure_reason: Optional[str] = None,
     ):
-        """Add a requirement evaluation result."""
-        self.requirements.append({
+        """Add a requirement evaluation result (only for results built without preallocation)."""
+        if self._preallocated:
+            raise ValueError("ComplianceResult is preallocated; use set_requirement_result()")
+        self.requirements.append(None)
+        self.set_requirement_result(
+            len(self.requirements) - 1, requirement_name, limit_value, computed_value, passed, failure_reason
+        )
+    
+    def set_requirement_result(
+        self,
+        index: int,
+        requirement_name: str,
+        limit_value: float,
+        computed_value: float,
+        passed: bool,
+        failure_reason: Optional[str] = None,
+    ):
+        """Store the evaluation result of requirement `index` in its preallocated slot."""
+        self.requirements[index] = {
             "requirement_name": requirement_name,
             "limit_value": limit_value,
             "computed_value": computed_value,
             "passed": passed,
             "failure_reason": failure_reason,
-        })
+        }
         if not passed:
             self.overall_pass = False
             if failure_reason:
@@ -56,13 +78,40 @@ def evaluate_compliance(
     Returns:
         ComplianceResult with pass/fail for each requirement
     """
-    result = ComplianceResult()
+    limits = requirement_set.metric_limits
+    result = ComplianceResult(len(limits))
+    frequencies = np.asarray(frequencies)
+    
+    # Band reductions below use searchsorted slices, which need ascending
+    # frequencies; min/max/avg don't depend on order, so sort once if needed
+    order = None
+    if frequencies.size > 1 and np.any(frequencies[1:] < frequencies[:-1]):
+        order = np.argsort(frequencies, kind="stable")
+        frequencies = frequencies[order]
+    
+    # Evaluate all limits of each metric together; results keep input order
+    evaluated: Dict[int, tuple] = {}
+    by_metric: Dict[str, List[int]] = {}
+    for index, metric_limit in enumerate(limits):
+        by_metric.setdefault(metric_limit.metric_name, []).append(index)
     
-    for metric_limit in requirement_set.metric_limits:
+    for metric_name, indices in by_metric.items():
+        if metric_name not in metrics:
+            continue
+        metric_values = np.asarray(metrics[metric_name], dtype=np.float64)
+        if order is not None:
+            metric_values = metric_values[order]
+        group = [limits[i] for i in indices]
+        values, passed, non_empty = _evaluate_metric_limits(metric_values, frequencies, group)
+        for i, value, ok, has_points in zip(indices, values, passed, non_empty):
+            evaluated[i] = (float(value), bool(ok), bool(has_points))
+    
+    for index, metric_limit in enumerate(limits):
         metric_name = metric_limit.metric_name
         
-        if metric_name not in metrics:
-            result.add_requirement_result(
+        if index not in evaluated:
+            result.set_requirement_result(
+                index,
                 requirement_name=metric_limit.description or metric_name,
                 limit_value=metric_limit.limit_value,
                 computed_value=0.0,
@@ -71,13 +120,12 @@ def evaluate_compliance(
             )
             continue
         
-        # Get metric values within the frequency band
-        metric_values = metrics[metric_name]
-        band = metric_limit.frequency_band
-        mask = (frequencies >= band.start_hz) & (frequencies <= band.stop_hz)
+        aggregated_value, passed, has_points = evaluated[index]
         
-        if not np.any(mask):
-            result.add_requirement_result(
+        if not has_points:
+            band = metric_limit.frequency_band
+            result.set_requirement_result(
+                index,
                 requirement_name=metric_limit.description or metric_name,
                 limit_value=metric_limit.limit_value,
                 computed_value=0.0,
@@ -86,21 +134,6 @@ def evaluate_compliance(
             )
             continue
         
-        band_metric_values = metric_values[mask]
-        
-        # Aggregate based on aggregation method
-        aggregated_value = _aggregate_metric(
-            band_metric_values,
-            metric_limit.aggregation
-        )
-        
-        # Evaluate against limit
-        passed = _evaluate_limit(
-            aggregated_value,
-            metric_limit.limit_value,
-            metric_limit.operator
-        )
-        
         # Generate failure reason if needed
         failure_reason = None
         if not passed:
@@ -109,7 +142,8 @@ def evaluate_compliance(
                 f"{metric_limit.operator} {metric_limit.limit_value} (limit)"
             )
         
-        result.add_requirement_result(
+        result.set_requirement_result(
+            index,
             requirement_name=metric_limit.description or metric_name,
             limit_value=metric_limit.limit_value,
             computed_value=aggregated_value,
@@ -120,49 +154,69 @@ def evaluate_compliance(
     return result
 
 
-def _aggregate_metric(values: np.ndarray, aggregation: str) -> float:
-    """
-    Aggregate metric values over frequency band.
-    
-    Args:
-        values: Array of metric values
-        aggregation: Aggregation method (min, max, avg, pkpk)
-    
-    Returns:
-        Aggregated value
-    """
-    if aggregation == "min":
-        return float(np.min(values))
-    elif aggregation == "max":
-        return float(np.max(values))
-    elif aggregation == "avg":
-        return float(np.mean(values))
-    elif aggregation == "pkpk":
-        return float(np.max(values) - np.min(values))
-    else:
-        raise ValueError(f"Unknown aggregation method: {aggregation}")
+# Aggregation / operator names -> row index used by _evaluate_metric_limits
+_AGGREGATION_CODES = {"min": 0, "max": 1, "avg": 2, "pkpk": 3}
+_OPERATOR_CODES = {"<=": 0, ">=": 1, "<": 2, ">": 3}
 
 
-def _evaluate_limit(value: float, limit: float, operator: str) -> bool:
+def _evaluate_metric_limits(
+    values: np.ndarray,
+    frequencies: np.ndarray,
+    limits: List[MetricLimit],
+) -> tuple:
     """
-    Evaluate value against limit using operator.
+    Aggregate and check several limits on one metric in a few vectorized calls.
     
     Args:
-        value: Computed value
-        limit: Limit value
-        operator: Comparison operator (<=, >=, <, >)
+        values: Metric values (aligned with ascending frequencies)
+        frequencies: Ascending frequency array in Hz
+        limits: Metric limits on this metric
     
     Returns:
-        True if condition is met, False otherwise
+        Tuple of (aggregated values, pass flags, band-has-points flags) arrays
     """
-    if operator == "<=":
-        return value <= limit
-    elif operator == ">=":
-        return value >= limit
-    elif operator == "<":
-        return value < limit
-    elif operator == ">":
-        return value > limit
-    else:
-        raise ValueError(f"Unknown operator: {operator}")
+    try:
+        agg_codes = np.array([_AGGREGATION_CODES[m.aggregation] for m in limits])
+    except KeyError as e:
+        raise ValueError(f"Unknown aggregation method: {e.args[0]}") from None
+    try:
+        op_codes = np.array([_OPERATOR_CODES[m.operator] for m in limits])
+    except KeyError as e:
+        raise ValueError(f"Unknown operator: {e.args[0]}") from None
+    starts = np.array([m.frequency_band.start_hz for m in limits])
+    stops = np.array([m.frequency_band.stop_hz for m in limits])
+    limit_values = np.array([m.limit_value for m in limits], dtype=np.float64)
+    
+    # Band [start, stop] (inclusive) -> slice [lo, hi)
+    lo = np.searchsorted(frequencies, starts, side="left")
+    hi = np.searchsorted(frequencies, stops, side="right")
+    non_empty = hi > lo
+    
+    aggregated = np.zeros(len(limits), dtype=np.float64)
+    if np.any(non_empty):
+        lo_ne, hi_ne = lo[non_empty], hi[non_empty]
+        # reduceat over [lo0, hi0, lo1, hi1, ...]; even entries are the bands.
+        # A trailing pad element keeps hi == len(values) a valid index.
+        bounds = np.stack([lo_ne, hi_ne], axis=1).ravel()
+        padded = np.append(values, 0.0)
+        codes = agg_codes[non_empty]
+        # Only run the reductions some limit actually asks for
+        candidates = np.zeros((4, len(lo_ne)))
+        if np.any((codes == 0) | (codes == 3)):
+            candidates[0] = np.minimum.reduceat(padded, bounds)[::2]
+        if np.any((codes == 1) | (codes == 3)):
+            candidates[1] = np.maximum.reduceat(padded, bounds)[::2]
+        if np.any(codes == 2):
+            candidates[2] = np.add.reduceat(padded, bounds)[::2] / (hi_ne - lo_ne)
+        candidates[3] = candidates[1] - candidates[0]
+        aggregated[non_empty] = candidates[codes, np.arange(len(lo_ne))]
+    
+    comparisons = np.stack([
+        aggregated <= limit_values,
+        aggregated >= limit_values,
+        aggregated < limit_values,
+        aggregated > limit_values,
+    ])
+    passed = comparisons[op_codes, np.arange(len(limits))] & non_empty
+    return aggregated, passed, non_empty
 
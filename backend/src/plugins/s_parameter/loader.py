@@ -4,10 +4,22 @@ S-parameter file loader using scikit-rf.
 Supports S2P, S3P, S4P file formats.
 This is a boundary component (reads filesystem).
 """
+from __future__ import annotations
+
+from io import BytesIO
 from pathlib import Path
-from typing import Union
-import skrf as rf
-from skrf import Network
+from typing import TYPE_CHECKING, Optional, Union
+import numpy as np
+
+# scikit-rf is imported on first load so that importing this module (and the
+# API app, via the test run service) stays cheap
+if TYPE_CHECKING:
+    from skrf import Network
+
+
+# Touchstone option line units -> Hz multiplier
+_FREQ_MULTIPLIERS = {b"HZ": 1.0, b"KHZ": 1e3, b"MHZ": 1e6, b"GHZ": 1e9}
+_DATA_FORMATS = (b"RI", b"MA", b"DB")
 
 
 def load_s_parameter_file(file_path: Union[str, Path]) -> Network:
@@ -34,6 +46,13 @@ def load_s_parameter_file(file_path: Union[str, Path]) -> Network:
     if suffix not in ('.s1p', '.s2p', '.s3p', '.s4p'):
         raise ValueError(f"Unsupported S-parameter file format: {suffix}. Supported: .s1p, .s2p, .s3p, .s4p")
     
+    # Fast path for plain Touchstone v1 files; anything unusual goes to scikit-rf
+    network = _load_touchstone_fast(file_path, int(suffix[2]))
+    if network is not None:
+        return network
+    
+    import skrf as rf
+    
     try:
         # Load network using scikit-rf
         network = rf.Network(str(file_path))
@@ -41,3 +60,95 @@ def load_s_parameter_file(file_path: Union[str, Path]) -> Network:
     except Exception as e:
         raise ValueError(f"Failed to load S-parameter file {file_path}: {str(e)}") from e
 
+
+def _load_touchstone_fast(file_path: Path, nports: int) -> Optional[Network]:
+    """
+    Parse a plain Touchstone v1 file with a single NumPy numeric parse.
+    
+    Only handles files with one option line, S-parameter data and no comments
+    after the data starts. Returns None for anything else (v2 keywords, inline
+    comments, noise data, non-S parameters) so the caller falls back to scikit-rf.
+    """
+    try:
+        raw = file_path.read_bytes()
+    except OSError:
+        return None
+    
+    # Header: comment/option lines before the first data line
+    unit, data_format, z0 = b"GHZ", b"MA", 50.0
+    option_seen = False
+    pos = 0
+    while pos < len(raw):
+        end = raw.find(b"\n", pos)
+        if end == -1:
+            end = len(raw)
+        line = raw[pos:end].strip()
+        if line and not line.startswith(b"!"):
+            if not line.startswith(b"#"):
+                break
+            if option_seen:
+                return None
+            option_seen = True
+            options = line[1:].upper().split()
+            if b"R" in options:
+                r_index = options.index(b"R")
+                try:
+                    z0 = float(options[r_index + 1])
+                except (IndexError, ValueError):
+                    return None
+                del options[r_index:r_index + 2]
+            for token in options:
+                if token in _FREQ_MULTIPLIERS:
+                    unit = token
+                elif token in _DATA_FORMATS:
+                    data_format = token
+                elif token != b"S":
+                    return None
+        pos = end + 1
+    
+    body = raw[pos:]
+    if not body.strip() or b"!" in body or b"[" in body:
+        return None
+    
+    ncols = 1 + 2 * nports * nports
+    try:
+        if nports <= 2:
+            # One record per line: loadtxt parses in C and rejects ragged rows
+            data = np.loadtxt(BytesIO(body), dtype=np.float64, ndmin=2)
+        else:
+            # 3+ port records wrap across lines, so parse a flat token stream
+            data = np.array(body.split(), dtype=np.float64)
+            if data.size % ncols:
+                return None
+            data = data.reshape(-1, ncols)
+    except ValueError:
+        return None
+    if data.shape[1] != ncols:
+        return None
+    
+    f = data[:, 0] * _FREQ_MULTIPLIERS[unit]
+    if f.size > 1 and not np.all(np.diff(f) > 0):
+        # Non-increasing frequency means noise data or a malformed file
+        return None
+    
+    a = data[:, 1::2]
+    b = data[:, 2::2]
+    if data_format == b"RI":
+        s_flat = a + 1j * b
+    else:
+        mag = a if data_format == b"MA" else 10.0 ** (a / 20.0)
+        s_flat = mag * np.exp(1j * np.deg2rad(b))
+    
+    s = s_flat.reshape(-1, nports, nports)
+    if nports == 2:
+        # 2-port files are ordered S11 S21 S12 S22 (column-major)
+        s = s.transpose(0, 2, 1)
+    
+    import skrf as rf
+    
+    return rf.Network(
+        frequency=rf.Frequency.from_f(f, unit="Hz"),
+        s=np.ascontiguousarray(s),
+        z0=z0,
+        name=file_path.stem,
+    )
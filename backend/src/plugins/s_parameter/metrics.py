@@ -4,9 +4,21 @@ S-parameter metrics computation.
 Pure functions for computing RF metrics from S-parameter networks.
 No side effects, no I/O operations.
 """
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 import numpy as np
-from skrf import Network
-from backend.src.core.schemas.device import FrequencyBand
+from backend.src.core.schemas.device import FrequencyBand, SParameterConfig
+
+if TYPE_CHECKING:
+    from skrf import Network
+
+
+# |Γ| at which VSWR = (1 + |Γ|) / (1 - |Γ|) reaches its 1000 cap
+_MAX_GAMMA = 999.0 / 1001.0
+
+# |Sii| at which return loss = -20 * log10(|Sii|) reaches its 100 dB cap
+_MIN_RETURN_MAG = 1e-5
 
 
 def compute_gain_db(network: Network, sij_param: str) -> np.ndarray:
@@ -61,11 +73,11 @@ def compute_vswr(network: Network, sii_param: str) -> np.ndarray:
     gamma_mag = np.abs(s_ii)
     
     # Compute VSWR: (1 + |Γ|) / (1 - |Γ|)
-    # Handle edge case where gamma_mag = 1 (infinite VSWR)
-    with np.errstate(divide='ignore', invalid='ignore'):
-        vswr = (1 + gamma_mag) / (1 - gamma_mag)
-        # Set infinite values to a large number (e.g., 1000)
-        vswr = np.where(np.isfinite(vswr), vswr, 1000.0)
+    # Clip |Γ| first so total reflection gives the VSWR cap (1000) without
+    # ever dividing by zero
+    np.minimum(gamma_mag, _MAX_GAMMA, out=gamma_mag)
+    vswr = np.add(1.0, gamma_mag)
+    np.divide(vswr, np.subtract(1.0, gamma_mag, out=gamma_mag), out=vswr)
     
     return vswr
 
@@ -92,11 +104,11 @@ def compute_return_loss_db(network: Network, sii_param: str) -> np.ndarray:
     # Compute magnitude
     s_mag = np.abs(s_ii)
     
-    # Handle zero values (infinite return loss)
-    with np.errstate(divide='ignore'):
-        return_loss_db = -20 * np.log10(s_mag)
-        # Set infinite values to a large number (e.g., 100 dB)
-        return_loss_db = np.where(np.isfinite(return_loss_db), return_loss_db, 100.0)
+    # Clip |Sii| first so a perfect match gives the return-loss cap (100 dB)
+    # without taking log10(0)
+    np.maximum(s_mag, _MIN_RETURN_MAG, out=s_mag)
+    return_loss_db = np.log10(s_mag, out=s_mag)
+    np.multiply(return_loss_db, -20.0, out=return_loss_db)
     
     return return_loss_db
 
@@ -117,17 +129,147 @@ def compute_gain_flatness(
     Returns:
         Peak-to-peak gain variation in dB over the specified band
     """
-    # Find frequencies within the band
-    mask = (frequencies >= band.start_hz) & (frequencies <= band.stop_hz)
+    # Band [start, stop] as a slice: a view of gain_db, no mask or copy
+    band_slice = _band_slice(frequencies, band)
+    
+    # Compute peak-to-peak (max - min) in a single pass
+    gain_flatness = np.ptp(gain_db[band_slice])
+    
+    return float(gain_flatness)
+
+
+def compute_gain_flatness_multi(
+    gain_db: np.ndarray,
+    frequencies: np.ndarray,
+    bands: list[FrequencyBand]
+) -> list[float]:
+    """
+    Compute gain flatness over several frequency bands at once.
+    
+    All band edges are located with one vectorized search per side instead of
+    a search per band. Results match compute_gain_flatness for each band.
+    
+    Args:
+        gain_db: Array of gain values in dB
+        frequencies: Array of frequency values in Hz (ascending)
+        bands: Frequency bands to evaluate
+    
+    Returns:
+        Peak-to-peak gain variation in dB for each band, in order
+    
+    Raises:
+        ValueError: If no frequency points fall inside one of the bands
+    """
+    los = np.searchsorted(frequencies, [band.start_hz for band in bands], side='left')
+    his = np.searchsorted(frequencies, [band.stop_hz for band in bands], side='right')
+    
+    flatness = []
+    for band, lo, hi in zip(bands, los.tolist(), his.tolist()):
+        if hi <= lo:
+            raise ValueError(f"No frequency points found in band {band.start_hz} to {band.stop_hz} Hz")
+        flatness.append(float(np.ptp(gain_db[lo:hi])))
+    return flatness
+
+
+def _band_slice(frequencies: np.ndarray, band: FrequencyBand) -> slice:
+    """
+    Return the slice of an ascending frequency array that lies within a band (inclusive).
+    
+    scikit-rf networks always have ascending frequencies, so the band can be
+    located with two binary searches instead of a full boolean mask.
     
-    if not np.any(mask):
+    Raises:
+        ValueError: If no frequency points fall inside the band
+    """
+    lo = int(np.searchsorted(frequencies, band.start_hz, side='left'))
+    hi = int(np.searchsorted(frequencies, band.stop_hz, side='right'))
+    if hi <= lo:
         raise ValueError(f"No frequency points found in band {band.start_hz} to {band.stop_hz} Hz")
+    return slice(lo, hi)
+
+
+# Transform codes for compute_sp_metrics
+SP_GAIN_DB = 0
+SP_VSWR = 1
+SP_RETURN_LOSS_DB = 2
+
+
+def compute_sp_metrics(s: np.ndarray, specs: list[tuple[int, int, int]]) -> np.ndarray:
+    """
+    Compute several |Sij| transforms from an S-parameter tensor in one gather.
     
-    # Extract gain values within the band
-    band_gain = gain_db[mask]
+    All requested traces are pulled out of the tensor with a single fancy index
+    and one np.abs pass, then each row is transformed in place. Results match
+    compute_gain_db, compute_vswr and compute_return_loss_db.
     
-    # Compute peak-to-peak (max - min)
-    gain_flatness = np.max(band_gain) - np.min(band_gain)
+    Args:
+        s: Complex S-parameter array of shape (n_freq, n_ports, n_ports)
+        specs: (op, i, j) tuples with 0-based port indices, where op is one of
+            SP_GAIN_DB, SP_VSWR, SP_RETURN_LOSS_DB
     
-    return float(gain_flatness)
+    Returns:
+        Array of shape (len(specs), n_freq); row m holds the result for specs[m]
+    """
+    rows = [i for _, i, _ in specs]
+    cols = [j for _, _, j in specs]
+    
+    # (n_freq, m) gather -> (m, n_freq) so each metric is a contiguous row
+    out = np.abs(s[:, rows, cols].T)
+    
+    for row, (op, _, _) in zip(out, specs):
+        if op == SP_GAIN_DB:
+            # Gain(dB) = 20 * log10(|Sij|)
+            with np.errstate(divide='ignore'):
+                np.log10(row, out=row)
+            np.multiply(row, 20.0, out=row)
+        elif op == SP_VSWR:
+            # VSWR = (1 + |Γ|) / (1 - |Γ|), capped at 1000
+            np.minimum(row, _MAX_GAMMA, out=row)
+            denominator = 1.0 - row
+            np.add(row, 1.0, out=row)
+            np.divide(row, denominator, out=row)
+        elif op == SP_RETURN_LOSS_DB:
+            # ReturnLoss(dB) = -20 * log10(|Sii|), capped at 100 dB
+            np.maximum(row, _MIN_RETURN_MAG, out=row)
+            np.log10(row, out=row)
+            np.multiply(row, -20.0, out=row)
+        else:
+            raise ValueError(f"Unknown S-parameter metric op: {op}")
+    
+    return out
 
+
+def compute_all_metrics(network: Network, s_config: SParameterConfig) -> dict:
+    """
+    Compute gain, VSWR, return loss and operational-band gain flatness in one pass.
+    
+    Equivalent to calling compute_gain_db, compute_vswr, compute_return_loss_db
+    and compute_gain_flatness separately, but the S-parameter traces are pulled
+    out of the network once (see compute_sp_metrics).
+    
+    Args:
+        network: scikit-rf Network object
+        s_config: S-parameter configuration (gain/return parameters and bands)
+    
+    Returns:
+        Dictionary with "gain", "vswr", "return_loss" arrays and "gain_flatness" float
+    """
+    gain_i = int(s_config.gain_parameter[1]) - 1
+    gain_j = int(s_config.gain_parameter[2]) - 1
+    return_i = int(s_config.input_return_parameter[1]) - 1
+    
+    gain_db, vswr, return_loss_db = compute_sp_metrics(network.s, [
+        (SP_GAIN_DB, gain_i, gain_j),
+        (SP_VSWR, return_i, return_i),
+        (SP_RETURN_LOSS_DB, return_i, return_i),
+    ])
+    
+    # Gain flatness over the operational band (frequencies are ascending)
+    gain_flatness = float(np.ptp(gain_db[_band_slice(network.f, s_config.operational_band_hz)]))
+    
+    return {
+        "gain": gain_db,
+        "vswr": vswr,
+        "return_loss": return_loss_db,
+        "gain_flatness": gain_flatness,
+    }
@@ -15,11 +15,28 @@ Rules:
 - Unknown tokens are ignored
 """
 import re
-from datetime import datetime
+from datetime import date
 from typing import Optional
 from backend.src.core.schemas.metadata import ParsedMetadata
 
 
+# All token kinds in one pattern (compiled once at import time); the named
+# group that matched identifies the token kind
+_TOKEN_RE = re.compile(
+    r'^(?:'
+    r'sn(?P<serial>\d+)'        # Serial number: SNxxxx
+    r'|(?P<path>pri|red)'       # Path: PRI or RED
+    r'|l(?P<part>\d+)'          # Part number: Lxxxxxx
+    r'|(?P<temp>cld|amb|hot)'   # Temperature: CLD, AMB, HOT
+    r'|(?P<date8>\d{8})'        # Date: YYYYMMDD
+    r'|(?P<date6>\d{6})'        # Date: YYMMDD
+    r')$',
+    re.IGNORECASE,
+)
+# Underscores and dashes become spaces so str.split() can do the tokenizing
+_DELIMITER_TRANS = str.maketrans('_-', '  ')
+
+
 def parse_filename_metadata(filename: str) -> ParsedMetadata:
     """
     Parse metadata from filename.
@@ -38,80 +55,43 @@ def parse_filename_metadata(filename: str) -> ParsedMetadata:
     path: Optional[str] = None
     part_number: Optional[str] = None
     temperature: Optional[str] = None
-    date_value: Optional[datetime.date] = None
+    date_value: Optional[date] = None
     unknown_tokens: list[str] = []
     
-    # Split filename into tokens (by underscore, dash, or space)
-    tokens = re.split(r'[_\-\s]+', name_without_ext)
-    
-    # Patterns for each token type
-    serial_pattern = re.compile(r'^sn(\d+)$', re.IGNORECASE)
-    path_pattern = re.compile(r'^(pri|red)$', re.IGNORECASE)
-    part_pattern = re.compile(r'^l(\d+)$', re.IGNORECASE)
-    temp_pattern = re.compile(r'^(cld|amb|hot)$', re.IGNORECASE)
-    date_pattern_yyyy = re.compile(r'^(\d{4})(\d{2})(\d{2})$')  # YYYYMMDD
-    date_pattern_yy = re.compile(r'^(\d{2})(\d{2})(\d{2})$')    # YYMMDD
+    # Split filename into tokens (by underscore, dash, or whitespace);
+    # split() drops empty tokens from repeated delimiters
+    tokens = name_without_ext.translate(_DELIMITER_TRANS).split()
     
     # Process each token
     for token in tokens:
-        token = token.strip()
-        if not token:
+        match = _TOKEN_RE.match(token)
+        if match is None:
+            # If no pattern matched, it's an unknown token
+            unknown_tokens.append(token)
             continue
         
-        matched = False
-        
-        # Check serial number (SNxxxx)
-        match = serial_pattern.match(token)
-        if match:
-            serial_number = f"SN{match.group(1).zfill(4)}"  # Normalize to SN0001 format
-            matched = True
-        
-        # Check path (PRI or RED)
-        match = path_pattern.match(token)
-        if match:
-            path = match.group(1).upper()  # Normalize to uppercase
-            matched = True
-        
-        # Check part number (Lxxxxxx)
-        match = part_pattern.match(token)
-        if match:
-            part_number = f"L{match.group(1)}"
-            matched = True
-        
-        # Check temperature (CLD, AMB, HOT)
-        match = temp_pattern.match(token)
-        if match:
-            temperature = match.group(1).upper()  # Normalize to uppercase
-            matched = True
-        
-        # Check date (YYYYMMDD or YYMMDD)
-        match = date_pattern_yyyy.match(token)
-        if match:
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "serial":
+            serial_number = f"SN{value.zfill(4)}"  # Normalize to SN0001 format
+        elif kind == "path":
+            path = value.upper()  # Normalize to uppercase
+        elif kind == "part":
+            part_number = f"L{value}"
+        elif kind == "temp":
+            temperature = value.upper()  # Normalize to uppercase
+        else:
+            # Date (YYYYMMDD or YYMMDD): one int() parse, then split the fields
+            year, month_day = divmod(int(value), 10000)
+            month, day = divmod(month_day, 100)
+            if kind == "date6":
+                # Assume years 00-50 are 2000-2050, 51-99 are 1951-1999
+                year += 2000 if year <= 50 else 1900
             try:
-                year, month, day = int(match.group(1)), int(match.group(2)), int(match.group(3))
-                date_value = datetime(year, month, day).date()
-                matched = True
+                date_value = date(year, month, day)
             except ValueError:
-                pass  # Invalid date, treat as unknown
-        
-        if not matched:
-            # Try YYMMDD format
-            match = date_pattern_yy.match(token)
-            if match:
-                try:
-                    year_2dig = int(match.group(1))
-                    month = int(match.group(2))
-                    day = int(match.group(3))
-                    # Assume years 00-50 are 2000-2050, 51-99 are 1951-1999
-                    year = 2000 + year_2dig if year_2dig <= 50 else 1900 + year_2dig
-                    date_value = datetime(year, month, day).date()
-                    matched = True
-                except ValueError:
-                    pass  # Invalid date, treat as unknown
-        
-        # If no pattern matched, it's an unknown token
-        if not matched:
-            unknown_tokens.append(token)
+                # Invalid date, treat as unknown
+                unknown_tokens.append(token)
     
     # Determine missing tokens
     missing_tokens: list[str] = []
@@ -4,14 +4,51 @@ Plotting system for S-parameter data.
 Uses matplotlib to generate PNG plots.
 This is a boundary component (writes filesystem).
 """
+import threading
 from pathlib import Path
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend for server use
-import matplotlib.pyplot as plt
 import numpy as np
+# matplotlib is imported on first render so importing this module stays cheap
 from backend.src.core.schemas.plotting import PlotSpec, PlotConfig
 
 
+# Figures are expensive to create, so one figure per (width, height, dpi) is
+# kept and cleared between plots. matplotlib is not thread-safe: the lock
+# serializes rendering.
+_FIGURE_POOL: dict[tuple[float, float, int], tuple] = {}
+_FIGURE_POOL_MAX_SIZE = 8
+_FIGURE_POOL_LOCK = threading.Lock()
+
+# Series sharing a style are drawn as one LineCollection from this many on
+_LINE_COLLECTION_MIN_SERIES = 4
+
+# x_unit -> multiplier from Hz
+_FREQ_UNIT_SCALE = {"GHz": 1e-9, "MHz": 1e-6}
+
+
+def _get_pooled_figure(width: float, height: float, dpi: int) -> tuple:
+    """Return a cleared (figure, axes) pair of the given size, creating it if needed."""
+    key = (width, height, dpi)
+    pooled = _FIGURE_POOL.get(key)
+    if pooled is not None:
+        return pooled
+    
+    # Agg canvas used directly (no pyplot state or GUI backend selection)
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    
+    if len(_FIGURE_POOL) >= _FIGURE_POOL_MAX_SIZE:
+        # Evict the oldest size
+        del _FIGURE_POOL[next(iter(_FIGURE_POOL))]
+    
+    # Tight layout is computed while drawing, so saving needs no extra
+    # bbox_inches='tight' render pass
+    fig = Figure(figsize=(width, height), dpi=dpi, layout="tight")
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    _FIGURE_POOL[key] = (fig, ax)
+    return fig, ax
+
+
 def render_plot(plot_spec: PlotSpec, plot_config: PlotConfig, output_path: Path) -> Path:
     """
     Render a plot to PNG file.
@@ -24,31 +61,58 @@ def render_plot(plot_spec: PlotSpec, plot_config: PlotConfig, output_path: Path)
     Returns:
         Path to generated PNG file
     """
-    # Create figure
-    fig, ax = plt.subplots(figsize=(plot_config.figure_width, plot_config.figure_height), dpi=plot_config.dpi)
+    with _FIGURE_POOL_LOCK:
+        fig, ax = _get_pooled_figure(plot_config.figure_width, plot_config.figure_height, plot_config.dpi)
+        try:
+            return _draw_and_save(fig, ax, plot_spec, plot_config, output_path)
+        finally:
+            # Drop the plotted data but keep the figure for the next plot
+            ax.clear()
+
+
+def _draw_and_save(fig, ax, plot_spec: PlotSpec, plot_config: PlotConfig, output_path: Path) -> Path:
+    """Draw the plot onto a cleared axes and save the figure as PNG."""
+    from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
     
-    # Plot each series
+    # Convert frequency to appropriate unit if specified (one scale for all series)
+    freq_scale = _FREQ_UNIT_SCALE.get(plot_spec.x_unit, 1.0)
+    
+    # (color, linestyle) per trace identity; anything else is plotted solid blue
+    style_map = {
+        "PRI": (plot_config.color_pri, plot_config.line_style_pri),
+        "RED": (plot_config.color_red, plot_config.line_style_red),
+    }
+    default_style = ("blue", "solid")
+    
+    # Resolve each series' style, grouping series that share one
+    groups: dict[tuple[str, str], list] = {}
     for series in plot_spec.series:
-        # Convert frequency to appropriate unit if specified
-        freq = np.array(series.frequency_hz)
-        if plot_spec.x_unit == "GHz":
-            freq = freq / 1e9
-        elif plot_spec.x_unit == "MHz":
-            freq = freq / 1e6
+        style = style_map.get(series.trace_identity, default_style)
+        groups.setdefault(style, []).append(series)
+    
+    legend_entries = {}
+    for (color, linestyle), group in groups.items():
+        # PlotSeries already holds float64 arrays, so asarray does not copy
+        freqs = [np.asarray(series.frequency_hz, dtype=np.float64) for series in group]
+        if freq_scale != 1.0:
+            freqs = [freq * freq_scale for freq in freqs]
         
-        # Determine line style based on trace identity
-        if series.trace_identity == "PRI":
-            linestyle = plot_config.line_style_pri
-            color = plot_config.color_pri
-        elif series.trace_identity == "RED":
-            linestyle = plot_config.line_style_red
-            color = plot_config.color_red
-        else:
-            linestyle = "solid"
-            color = "blue"
+        if len(group) < _LINE_COLLECTION_MIN_SERIES:
+            # Plot the series
+            for series, freq in zip(group, freqs):
+                line, = ax.plot(freq, series.values, label=series.label, linestyle=linestyle, color=color)
+                legend_entries[id(series)] = line
+            continue
         
-        # Plot the series
-        ax.plot(freq, series.values, label=series.label, linestyle=linestyle, color=color)
+        # Many traces with the same style: one collection, drawn in one call
+        segments = [np.column_stack((freq, series.values)) for series, freq in zip(group, freqs)]
+        ax.add_collection(LineCollection(segments, colors=color, linestyles=linestyle))
+        # Legend still lists every series, via artists that are never drawn
+        proxy = Line2D([], [], color=color, linestyle=linestyle)
+        for series in group:
+            legend_entries[id(series)] = proxy
+    ax.autoscale_view()
     
     # Set axis limits
     if plot_config.x_min is not None:
@@ -75,7 +139,13 @@ def render_plot(plot_spec: PlotSpec, plot_config: PlotConfig, output_path: Path)
     
     # Configure legend
     if plot_config.legend_visible:
-        ax.legend(loc=plot_config.legend_location)
+        # Series order, skipping "_"-prefixed labels like ax.legend() does
+        labelled = [s for s in plot_spec.series if not s.label.startswith("_")]
+        ax.legend(
+            [legend_entries[id(s)] for s in labelled],
+            [s.label for s in labelled],
+            loc=plot_config.legend_location,
+        )
     
     # Configure grid
     if plot_config.grid_visible:
@@ -84,8 +154,8 @@ def render_plot(plot_spec: PlotSpec, plot_config: PlotConfig, output_path: Path)
     # Save figure
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(output_path, dpi=plot_config.dpi, bbox_inches='tight')
-    plt.close(fig)
+    # The pooled figure already has dpi=plot_config.dpi
+    fig.canvas.print_png(output_path)
     
     return output_path
 
@@ -4,10 +4,12 @@ Test run service - orchestrates the full analysis pipeline.
 Pure business logic, no FastAPI dependencies.
 Uses dependency injection for storage interfaces.
 """
-from typing import List, Optional
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, List, Optional
 from pathlib import Path
-import numpy as np
-from skrf import Network
 
 from backend.src.storage.interfaces import IDatabase, IFileStorage
 from backend.src.plugins.s_parameter.parser import parse_filename_metadata
@@ -16,7 +18,7 @@ from backend.src.plugins.s_parameter.metrics import (
     compute_gain_db,
     compute_vswr,
     compute_return_loss_db,
-    compute_gain_flatness,
+    compute_gain_flatness_multi,
 )
 from backend.src.plugins.s_parameter.compliance import evaluate_compliance
 from backend.src.core.schemas.device import DeviceConfig, SParameterConfig
@@ -24,20 +26,30 @@ from backend.src.core.schemas.requirement_set import RequirementSet
 from backend.src.core.schemas.metadata import EffectiveMetadata, UserOverrides
 from backend.src.core.schemas.test_run import TestRunStatus
 
+if TYPE_CHECKING:
+    from skrf import Network
+
 
 class TestRunService:
     """Service for processing test runs."""
     
-    def __init__(self, database: IDatabase, file_storage: IFileStorage):
+    def __init__(
+        self,
+        database: IDatabase,
+        file_storage: IFileStorage,
+        max_workers: Optional[int] = None,
+    ):
         """
         Initialize service with storage dependencies.
         
         Args:
             database: Database interface
             file_storage: File storage interface
+            max_workers: Worker processes for multi-file runs (default: CPU count, 1 disables)
         """
         self.db = database
         self.file_storage = file_storage
+        self.max_workers = max_workers
     
     def process_test_run(
         self,
@@ -63,70 +75,69 @@ class TestRunService:
             if not s_param_config:
                 raise ValueError("Device config must include S-parameter configuration")
             
-            # Process each file
-            for file_path in file_paths:
-                # 1. Parse filename metadata
-                filename = file_path.name
-                parsed_metadata = parse_filename_metadata(filename)
-                
-                # 2. Load S-parameter file
-                network = load_s_parameter_file(file_path)
-                
-                # 3. Store uploaded file
-                file_content = file_path.read_bytes()
-                stored_path = self.file_storage.store_uploaded_file(
-                    test_run_id, filename, file_content
-                )
-                
-                # 4. Create effective metadata (no overrides for now)
-                effective_metadata = EffectiveMetadata.from_parsed_and_overrides(parsed_metadata)
-                
-                # 5. Add file to test run
-                file_id = self.db.add_test_run_file(test_run_id, {
-                    "original_filename": filename,
-                    "stored_path": str(stored_path),
-                    "effective_metadata": effective_metadata.model_dump(mode='json'),
-                })
-                
-                # 6. Compute metrics
-                metrics_dict = self._compute_all_metrics(
-                    network, s_param_config, device_config
-                )
-                
-                # 7. Store metrics
-                self.db.store_metrics(test_run_id, file_id, {
-                    "metrics": {k: v.tolist() if isinstance(v, np.ndarray) else v 
-                               for k, v in metrics_dict.items()},
-                    "frequencies": network.f.tolist(),
-                })
-                
-                # 8. Evaluate compliance
-                compliance_result = evaluate_compliance(
-                    metrics_dict,
-                    network.f,
-                    requirement_set,
+            # Parse, load, compute and evaluate every file (in parallel when
+            # there are several); storage and DB writes stay in this process
+            results = self._process_files(file_paths, s_param_config, requirement_set)
+            
+            file_records = []
+            metrics_records = []
+            compliance_records = []
+            for file_path, (file_data, metrics_data, compliance_data) in zip(file_paths, results):
+                # 6. Store uploaded file
+                stored_path = self.file_storage.store_uploaded_file_from_path(
+                    test_run_id, file_path.name, file_path
                 )
-                
-                # 9. Store compliance results
-                self.db.store_compliance(test_run_id, file_id, {
-                    "overall_pass": compliance_result.overall_pass,
-                    "requirements": compliance_result.requirements,
-                    "failure_reasons": compliance_result.failure_reasons,
-                })
+                file_records.append({**file_data, "stored_path": str(stored_path)})
+                metrics_records.append(metrics_data)
+                compliance_records.append(compliance_data)
             
-            # Update status to completed
-            self.db.update_test_run_status(test_run_id, "completed")
+            # 7. Write files, metrics and compliance with one DB call each,
+            # committed together with the completed status
+            with self.db.transaction():
+                file_ids = self.db.add_test_run_files_bulk(test_run_id, file_records)
+                self.db.store_metrics_binary_bulk(test_run_id, dict(zip(file_ids, metrics_records)))
+                self.db.store_compliance_bulk(test_run_id, dict(zip(file_ids, compliance_records)))
+                
+                # Update status to completed
+                self.db.update_test_run_status(test_run_id, "completed")
             
         except Exception as e:
             # Update status to failed
             self.db.update_test_run_status(test_run_id, "failed", str(e))
             raise
     
-    def _compute_all_metrics(
+    def _process_files(
         self,
+        file_paths: List[Path],
+        s_param_config: SParameterConfig,
+        requirement_set: RequirementSet,
+    ) -> list:
+        """
+        Run _process_single_file for each file, preserving input order.
+        
+        Files are independent and CPU-bound, so multi-file runs are fanned out
+        to worker processes. A single file is handled in-process to avoid the
+        pool start-up cost.
+        """
+        max_workers = self.max_workers or os.cpu_count() or 1
+        max_workers = min(max_workers, len(file_paths))
+        if max_workers <= 1:
+            return [_process_single_file(path, s_param_config, requirement_set) for path in file_paths]
+        
+        chunksize = max(1, len(file_paths) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                _process_single_file,
+                file_paths,
+                [s_param_config] * len(file_paths),
+                [requirement_set] * len(file_paths),
+                chunksize=chunksize,
+            ))
+    
+    @staticmethod
+    def _compute_all_metrics(
         network: Network,
         s_param_config: SParameterConfig,
-        device_config: DeviceConfig,
     ) -> dict:
         """
         Compute all metrics for a network.
@@ -150,17 +161,57 @@ class TestRunService:
         )
         metrics["return_loss"] = return_loss_db
         
-        # Compute gain flatness (operational band)
-        gain_flatness_op = compute_gain_flatness(
-            gain_db, network.f, s_param_config.operational_band_hz
+        # Compute gain flatness (operational band and wideband together)
+        gain_flatness_op, gain_flatness_wb = compute_gain_flatness_multi(
+            gain_db, network.f,
+            [s_param_config.operational_band_hz, s_param_config.wideband_band_hz],
         )
         metrics["gain_flatness_operational"] = gain_flatness_op
-        
-        # Compute gain flatness (wideband)
-        gain_flatness_wb = compute_gain_flatness(
-            gain_db, network.f, s_param_config.wideband_band_hz
-        )
         metrics["gain_flatness_wideband"] = gain_flatness_wb
         
         return metrics
 
+
+def _process_single_file(
+    file_path: Path,
+    s_param_config: SParameterConfig,
+    requirement_set: RequirementSet,
+) -> tuple[dict, dict, dict]:
+    """
+    Parse, load, compute metrics and evaluate compliance for one file.
+    
+    Module-level (and free of storage access) so it can run in a worker process.
+    
+    Returns:
+        Tuple of (file data without stored_path, metric arrays incl. frequencies,
+        compliance data),
+        ready to pass to the database
+    """
+    # 1. Parse filename metadata
+    parsed_metadata = parse_filename_metadata(file_path.name)
+    
+    # 2. Load S-parameter file
+    network = load_s_parameter_file(file_path)
+    
+    # 3. Compute metrics
+    metrics_dict = TestRunService._compute_all_metrics(network, s_param_config)
+    frequencies = network.f
+    
+    # 4. Evaluate compliance
+    compliance_result = evaluate_compliance(metrics_dict, frequencies, requirement_set)
+    
+    # 5. Create effective metadata (no overrides for now)
+    effective_metadata = EffectiveMetadata.from_parsed_and_overrides(parsed_metadata)
+    
+    file_data = {
+        "original_filename": file_path.name,
+        "effective_metadata": effective_metadata.model_dump(mode='json'),
+    }
+    # Arrays are stored as-is (binary), so no .tolist() conversion
+    metrics_data = {**metrics_dict, "frequencies": frequencies}
+    compliance_data = {
+        "overall_pass": compliance_result.overall_pass,
+        "requirements": compliance_result.requirements,
+        "failure_reasons": compliance_result.failure_reasons,
+    }
+    return file_data, metrics_data, compliance_data
@@ -1,45 +1,195 @@
 """
 Database initialization and session management.
 """
-from sqlalchemy import create_engine
+from functools import lru_cache
+import orjson
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateTable
 from pathlib import Path
 from typing import Optional
 from .models import Base
 
 
+# Pragmas applied to every SQLite connection (SQLite leaves FK enforcement off by default)
+SQLITE_FOREIGN_KEYS_PRAGMA = "foreign_keys=ON"
+
+# Pragmas applied to every file-backed SQLite connection
+SQLITE_PRAGMAS = (
+    SQLITE_FOREIGN_KEYS_PRAGMA,
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",  # 256 MiB
+    "cache_size=-64000",    # ~64 MB (negative = KiB)
+)
+
+# Connections kept open per file-backed SQLite engine, plus extra connections
+# opened under burst load (closed again when returned)
+SQLITE_POOL_SIZE = 10
+SQLITE_MAX_OVERFLOW = 10
+
+# Seconds a connection waits on a locked database before raising "database is locked"
+SQLITE_BUSY_TIMEOUT = 30
+
+# JSON columns accept NumPy arrays directly (no .tolist()) and int dict keys
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _json_serializer(value) -> str:
+    """Serialize a JSON column value with orjson."""
+    return orjson.dumps(value, option=_ORJSON_OPTIONS).decode()
+
+
 def create_database_engine(database_url: str = "sqlite:///:memory:"):
     """
     Create SQLAlchemy engine.
     
     Args:
-        database_url: Database URL (default: in-memory SQLite)
+        database_url: Database URL (default: in-memory SQLite; a
+            "sqlite:///file:<name>?mode=memory&cache=shared&uri=true" URL gives
+            a named in-memory database shared across engines)
     
     Returns:
         SQLAlchemy engine
     """
     if database_url.startswith("sqlite"):
-        # Use StaticPool for in-memory SQLite to allow multiple connections
+        if ":memory:" in database_url or "mode=memory" in database_url:
+            # Use StaticPool for in-memory SQLite to allow multiple connections
+            # (named shared-cache URIs, "file:name?mode=memory&cache=shared&uri=true",
+            # are shared by every engine opened on the same name)
+            engine = create_engine(
+                database_url,
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool,
+                json_serializer=_json_serializer,
+                json_deserializer=orjson.loads,
+                echo=False,  # Set to True for SQL debugging
+            )
+            # No WAL/mmap for in-memory databases, just foreign key enforcement
+            event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+        else:
+            # File-backed: pooled connections (WAL lets readers run alongside the writer)
+            # (no pre-ping/recycle: a local file has no server to drop connections)
+            engine = create_engine(
+                database_url,
+                connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT},
+                pool_size=SQLITE_POOL_SIZE,
+                max_overflow=SQLITE_MAX_OVERFLOW,
+                json_serializer=_json_serializer,
+                json_deserializer=orjson.loads,
+                echo=False,  # Set to True for SQL debugging
+            )
+            event.listen(engine, "connect", _set_sqlite_pragmas)
+    else:
         engine = create_engine(
             database_url,
-            connect_args={"check_same_thread": False} if ":memory:" in database_url else {},
-            poolclass=StaticPool if ":memory:" in database_url else None,
-            echo=False,  # Set to True for SQL debugging
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
+            echo=False,
         )
-    else:
-        engine = create_engine(database_url, echo=False)
     
     return engine
 
 
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """Enforce foreign keys on each new in-memory SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA {SQLITE_FOREIGN_KEYS_PRAGMA}")
+    cursor.close()
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune each new file-backed SQLite connection.
+    
+    Foreign key enforcement, WAL journaling with NORMAL sync (one fsync per checkpoint, not per
+    commit), temp tables in memory, memory-mapped reads and a larger page cache.
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
 def init_database(engine):
-    """Initialize database schema."""
+    """Initialize database schema (and upgrade SQLite databases created by older versions)."""
     Base.metadata.create_all(engine)
+    if engine.dialect.name == "sqlite":
+        upgrade_sqlite_schema(engine)
+
+
+def upgrade_sqlite_schema(engine) -> None:
+    """
+    Bring tables created by older versions of the models up to date.
+    
+    create_all() never alters existing tables. SQLite cannot add server defaults
+    or drop NOT NULL with ALTER TABLE, so outdated tables are rebuilt from the
+    current model and their rows copied across (the documented SQLite procedure).
+    Missing indexes are then added. Safe to run on every start: up-to-date
+    tables are left alone.
+    """
+    inspector = inspect(engine)
+    outdated = [
+        table for table in Base.metadata.sorted_tables
+        if inspector.has_table(table.name)
+        and _is_outdated(table, inspector.get_columns(table.name))
+    ]
+    
+    with engine.connect() as conn:
+        if outdated:
+            # Parent tables are dropped and recreated, so FK enforcement must be off
+            # (the pragma is ignored inside a transaction, so set it before BEGIN)
+            conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            try:
+                conn.exec_driver_sql("BEGIN")
+                for table in outdated:
+                    _rebuild_sqlite_table(conn, table, inspector.get_columns(table.name))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.exec_driver_sql(f"PRAGMA {SQLITE_FOREIGN_KEYS_PRAGMA}")
+        
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        conn.commit()
+
+
+def _is_outdated(table, existing_columns: list[dict]) -> bool:
+    """Check whether an existing table lacks a column, nullability or server default of the model."""
+    existing = {column["name"]: column for column in existing_columns}
+    for column in table.columns:
+        current = existing.get(column.name)
+        if current is None:
+            return True
+        if column.nullable and not current["nullable"]:
+            return True
+        if column.server_default is not None and current["default"] is None:
+            return True
+    return False
+
+
+def _rebuild_sqlite_table(conn, table, existing_columns: list[dict]) -> None:
+    """Recreate a table from its model and copy over the columns both versions share."""
+    new_name = f"_new_{table.name}"
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect))
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {new_name}")
+    conn.exec_driver_sql(ddl.replace(f"CREATE TABLE {table.name} ", f"CREATE TABLE {new_name} ", 1))
+    
+    existing = {column["name"] for column in existing_columns}
+    columns = ", ".join(column.name for column in table.columns if column.name in existing)
+    conn.exec_driver_sql(f"INSERT INTO {new_name} ({columns}) SELECT {columns} FROM {table.name}")
+    conn.exec_driver_sql(f"DROP TABLE {table.name}")
+    conn.exec_driver_sql(f"ALTER TABLE {new_name} RENAME TO {table.name}")
 
 
+@lru_cache(maxsize=8)
 def get_session_factory(engine):
-    """Get session factory."""
+    """Get session factory (one sessionmaker per engine, reused across calls)."""
     return sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 
@@ -1,8 +1,12 @@
 """
 Filesystem file storage implementation.
 """
+import os
+import shutil
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Optional, AsyncIterator, Any
+import aiofiles
 from .interfaces import IFileStorage
 
 
@@ -18,6 +22,8 @@ class FilesystemFileStorage(IFileStorage):
         """
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        # String form for lookups: os.path.join is much cheaper than Path division
+        self._base_str = os.fspath(self.base_path)
     
     def store_uploaded_file(self, test_run_id: int, original_filename: str, file_content: bytes) -> Path:
         """Store an uploaded file and return the storage path."""
@@ -29,12 +35,54 @@ class FilesystemFileStorage(IFileStorage):
         
         return storage_path
     
+    def store_uploaded_file_from_path(self, test_run_id: int, original_filename: str, source_path: Path) -> Path:
+        """
+        Copy an existing file into storage as an uploaded file and return the storage path.
+        
+        shutil.copyfile copies in the kernel where it can (sendfile /
+        copy_file_range on Linux), so the file is never read into Python memory.
+        """
+        storage_dir = self.base_path / str(test_run_id) / "inputs"
+        storage_dir.mkdir(parents=True, exist_ok=True)
+        
+        storage_path = storage_dir / original_filename
+        try:
+            shutil.copyfile(source_path, storage_path)
+        except shutil.SameFileError:
+            pass  # Already stored (e.g. processing a previously uploaded file)
+        
+        return storage_path
+    
+    @asynccontextmanager
+    async def open_upload_stream(
+        self, test_run_id: int, original_filename: str, size_hint: Optional[int] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Open an async writable stream for an uploaded file.
+        
+        When size_hint is given, the file's blocks are reserved up front
+        (posix_fallocate) so large uploads are written into contiguous
+        extents; the file is trimmed to the bytes actually written on exit.
+        """
+        storage_dir = self.base_path / str(test_run_id) / "inputs"
+        storage_dir.mkdir(parents=True, exist_ok=True)
+        
+        async with aiofiles.open(storage_dir / original_filename, "wb") as out:
+            preallocated = False
+            if size_hint and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(out.fileno(), 0, size_hint)
+                    preallocated = True
+                except OSError:
+                    pass  # Filesystem doesn't support preallocation
+            yield out
+            if preallocated:
+                await out.truncate()
+    
     def get_file_path(self, test_run_id: int, filename: str) -> Optional[Path]:
         """Get the path to a stored file."""
-        storage_path = self.base_path / str(test_run_id) / "inputs" / filename
-        if storage_path.exists():
-            return storage_path
-        return None
+        storage_path = os.path.join(self._base_str, str(test_run_id), "inputs", filename)
+        return Path(storage_path) if os.path.exists(storage_path) else None
     
     def create_artifact_directory(self, test_run_id: int, artifact_type: str) -> Path:
         """Create directory for artifacts and return the path."""
@@ -51,8 +99,6 @@ class FilesystemFileStorage(IFileStorage):
     
     def get_artifact_path(self, test_run_id: int, artifact_type: str, filename: str) -> Optional[Path]:
         """Get the path to a stored artifact."""
-        artifact_path = self.base_path / str(test_run_id) / "artifacts" / artifact_type / filename
-        if artifact_path.exists():
-            return artifact_path
-        return None
+        artifact_path = os.path.join(self._base_str, str(test_run_id), "artifacts", artifact_type, filename)
+        return Path(artifact_path) if os.path.exists(artifact_path) else None
 
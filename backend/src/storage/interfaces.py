@@ -2,8 +2,9 @@
 Storage interfaces for dependency injection and testability.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, Any
+from typing import Optional, Any, AsyncContextManager, ContextManager
 from pathlib import Path
+import numpy as np
 
 
 class IDatabase(ABC):
@@ -59,15 +60,50 @@ class IDatabase(ABC):
         """Add a file to a test run and return file ID."""
         pass
     
+    @abstractmethod
+    def add_test_run_files_bulk(self, test_run_id: int, files_data: list[dict]) -> list[int]:
+        """Add several files to a test run in one transaction and return their IDs."""
+        pass
+    
     @abstractmethod
     def store_metrics(self, test_run_id: int, file_id: int, metrics_data: dict) -> None:
         """Store computed metrics for a test run file."""
         pass
     
+    @abstractmethod
+    def store_metrics_bulk(self, test_run_id: int, metrics_by_file: dict[int, dict]) -> None:
+        """Store computed metrics for several files (file ID -> metrics data) in one transaction."""
+        pass
+    
+    @abstractmethod
+    def store_metrics_binary(self, test_run_id: int, file_id: int, arrays: dict[str, np.ndarray]) -> None:
+        """Store computed metrics as NumPy arrays (metric name -> array, plus "frequencies")."""
+        pass
+    
+    @abstractmethod
+    def store_metrics_binary_bulk(self, test_run_id: int, arrays_by_file: dict[int, dict[str, np.ndarray]]) -> None:
+        """Store NumPy metric arrays for several files (file ID -> arrays) in one transaction."""
+        pass
+    
     @abstractmethod
     def store_compliance(self, test_run_id: int, file_id: int, compliance_data: dict) -> None:
         """Store compliance results for a test run file."""
         pass
+    
+    @abstractmethod
+    def store_compliance_bulk(self, test_run_id: int, compliance_by_file: dict[int, dict]) -> None:
+        """Store compliance results for several files (file ID -> compliance data) in one transaction."""
+        pass
+    
+    @abstractmethod
+    def transaction(self) -> ContextManager[None]:
+        """
+        Group several calls into one transaction.
+        
+        Writes inside the block are committed together when it exits (or all
+        rolled back if it raises) instead of one commit per call.
+        """
+        pass
 
 
 class IFileStorage(ABC):
@@ -78,6 +114,18 @@ class IFileStorage(ABC):
         """Store an uploaded file and return the storage path."""
         pass
     
+    @abstractmethod
+    def store_uploaded_file_from_path(self, test_run_id: int, original_filename: str, source_path: Path) -> Path:
+        """Copy an existing file into storage as an uploaded file and return the storage path."""
+        pass
+    
+    @abstractmethod
+    def open_upload_stream(
+        self, test_run_id: int, original_filename: str, size_hint: Optional[int] = None
+    ) -> AsyncContextManager[Any]:
+        """Open an async writable stream for an uploaded file (yields an object with async write())."""
+        pass
+    
     @abstractmethod
     def get_file_path(self, test_run_id: int, filename: str) -> Optional[Path]:
         """Get the path to a stored file."""
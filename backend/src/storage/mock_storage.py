@@ -1,9 +1,10 @@
 """
 In-memory mock storage implementations for testing.
 """
-from typing import Optional, Dict, Any
+from contextlib import asynccontextmanager, contextmanager
+from itertools import count
+from typing import Optional, Dict, Any, AsyncIterator, Iterator
 from pathlib import Path
-from collections import defaultdict
 from .interfaces import IDatabase, IFileStorage, IStorageFactory
 
 
@@ -15,16 +16,14 @@ class MockDatabase(IDatabase):
         self.test_stages: Dict[int, dict] = {}
         self.requirement_sets: Dict[int, dict] = {}
         self.test_runs: Dict[int, dict] = {}
-        self.test_run_files: Dict[int, Dict[int, dict]] = defaultdict(dict)
-        self.metrics: Dict[int, Dict[int, dict]] = defaultdict(dict)
-        self.compliance: Dict[int, Dict[int, dict]] = defaultdict(dict)
-        self._next_id = 1
+        self.test_run_files: Dict[int, Dict[int, dict]] = {}
+        self.metrics: Dict[int, Dict[int, dict]] = {}
+        self.compliance: Dict[int, Dict[int, dict]] = {}
+        self._id_iter = count(1)
     
     def _get_next_id(self) -> int:
         """Get next available ID."""
-        id = self._next_id
-        self._next_id += 1
-        return id
+        return next(self._id_iter)
     
     def create_device(self, device_data: dict) -> int:
         device_id = self._get_next_id()
@@ -77,22 +76,49 @@ class MockDatabase(IDatabase):
         if test_run_id not in self.test_runs:
             raise ValueError(f"Test run {test_run_id} not found")
         file_id = self._get_next_id()
-        self.test_run_files[test_run_id][file_id] = {**file_data, "id": file_id}
+        self.test_run_files.setdefault(test_run_id, {})[file_id] = {**file_data, "id": file_id}
         return file_id
     
+    def add_test_run_files_bulk(self, test_run_id: int, files_data: list[dict]) -> list[int]:
+        if test_run_id not in self.test_runs:
+            raise ValueError(f"Test run {test_run_id} not found")
+        return [self.add_test_run_file(test_run_id, file_data) for file_data in files_data]
+    
     def store_metrics(self, test_run_id: int, file_id: int, metrics_data: dict) -> None:
         if test_run_id not in self.test_runs:
             raise ValueError(f"Test run {test_run_id} not found")
-        if file_id not in self.test_run_files[test_run_id]:
+        if file_id not in self.test_run_files.get(test_run_id, ()):
             raise ValueError(f"File {file_id} not found in test run {test_run_id}")
-        self.metrics[test_run_id][file_id] = metrics_data
+        self.metrics.setdefault(test_run_id, {})[file_id] = metrics_data
+    
+    def store_metrics_bulk(self, test_run_id: int, metrics_by_file: dict[int, dict]) -> None:
+        for file_id, metrics_data in metrics_by_file.items():
+            self.store_metrics(test_run_id, file_id, metrics_data)
+    
+    def store_metrics_binary(self, test_run_id: int, file_id: int, arrays: dict) -> None:
+        metrics = dict(arrays)
+        frequencies = metrics.pop("frequencies")
+        self.store_metrics(test_run_id, file_id, {"metrics": metrics, "frequencies": frequencies})
+    
+    def store_metrics_binary_bulk(self, test_run_id: int, arrays_by_file: dict[int, dict]) -> None:
+        for file_id, arrays in arrays_by_file.items():
+            self.store_metrics_binary(test_run_id, file_id, arrays)
     
     def store_compliance(self, test_run_id: int, file_id: int, compliance_data: dict) -> None:
         if test_run_id not in self.test_runs:
             raise ValueError(f"Test run {test_run_id} not found")
-        if file_id not in self.test_run_files[test_run_id]:
+        if file_id not in self.test_run_files.get(test_run_id, ()):
             raise ValueError(f"File {file_id} not found in test run {test_run_id}")
-        self.compliance[test_run_id][file_id] = compliance_data
+        self.compliance.setdefault(test_run_id, {})[file_id] = compliance_data
+    
+    def store_compliance_bulk(self, test_run_id: int, compliance_by_file: dict[int, dict]) -> None:
+        for file_id, compliance_data in compliance_by_file.items():
+            self.store_compliance(test_run_id, file_id, compliance_data)
+    
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        # Writes apply immediately; there is nothing to roll back to
+        yield
 
 
 class MockFileStorage(IFileStorage):
@@ -109,6 +135,17 @@ class MockFileStorage(IFileStorage):
         self.files[key] = file_content
         return storage_path
     
+    def store_uploaded_file_from_path(self, test_run_id: int, original_filename: str, source_path: Path) -> Path:
+        return self.store_uploaded_file(test_run_id, original_filename, Path(source_path).read_bytes())
+    
+    @asynccontextmanager
+    async def open_upload_stream(
+        self, test_run_id: int, original_filename: str, size_hint: Optional[int] = None
+    ) -> AsyncIterator[Any]:
+        stream = _MockUploadStream()
+        yield stream
+        self.store_uploaded_file(test_run_id, original_filename, bytes(stream.buffer))
+    
     def get_file_path(self, test_run_id: int, filename: str) -> Optional[Path]:
         storage_path = self.base_path / str(test_run_id) / "inputs" / filename
         key = str(storage_path)
@@ -134,6 +171,17 @@ class MockFileStorage(IFileStorage):
         return None
 
 
+class _MockUploadStream:
+    """Async write target that buffers upload chunks in memory."""
+    
+    def __init__(self):
+        self.buffer = bytearray()
+    
+    async def write(self, chunk: bytes) -> int:
+        self.buffer.extend(chunk)
+        return len(chunk)
+
+
 class MockStorageFactory(IStorageFactory):
     """Factory for creating mock storage instances."""
     
@@ -1,11 +1,10 @@
 """
 SQLAlchemy database models.
 """
-from datetime import datetime, timezone
 from typing import Optional
 from sqlalchemy import (
     Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey,
-    JSON, CheckConstraint, UniqueConstraint
+    JSON, LargeBinary, CheckConstraint, UniqueConstraint, Index, func
 )
 from sqlalchemy.orm import declarative_base, relationship
 
@@ -17,12 +16,12 @@ class Device(Base):
     __tablename__ = "devices"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(200), nullable=False)
-    part_number = Column(String(100))
+    name = Column(Text, nullable=False)
+    part_number = Column(Text)
     description = Column(Text)
     s_parameter_config = Column(JSON, nullable=False)  # Stores DeviceConfig.s_parameter_config
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
     test_runs = relationship("TestRun", back_populates="device")
@@ -33,10 +32,10 @@ class TestStage(Base):
     __tablename__ = "test_stages"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(100), nullable=False, unique=True)
+    name = Column(Text, nullable=False, unique=True)
     description = Column(Text)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
     test_runs = relationship("TestRun", back_populates="test_stage")
@@ -51,13 +50,13 @@ class RequirementSet(Base):
     __tablename__ = "requirement_sets"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(200), nullable=False)
-    test_type = Column(String(50), nullable=False)
+    name = Column(Text, nullable=False)
+    test_type = Column(Text, nullable=False)
     metric_limits = Column(JSON, nullable=False)  # Stores list of MetricLimit
     pass_policy = Column(JSON)  # Stores PassPolicy
-    requirement_hash = Column(String(64), nullable=False)  # SHA-256 hash of requirement set
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    requirement_hash = Column(String(16), nullable=False, index=True)  # Truncated SHA-256 of requirement set
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
     test_runs = relationship("TestRun", back_populates="requirement_set")
@@ -68,13 +67,13 @@ class TestRun(Base):
     __tablename__ = "test_runs"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    device_id = Column(Integer, ForeignKey("devices.id"), nullable=False)
-    test_stage_id = Column(Integer, ForeignKey("test_stages.id"), nullable=False)
-    requirement_set_id = Column(Integer, ForeignKey("requirement_sets.id"), nullable=False)
-    test_type = Column(String(50), nullable=False)
-    status = Column(String(20), nullable=False, default="created")  # created, processing, completed, failed
+    device_id = Column(Integer, ForeignKey("devices.id"), nullable=False, index=True)
+    test_stage_id = Column(Integer, ForeignKey("test_stages.id"), nullable=False, index=True)
+    requirement_set_id = Column(Integer, ForeignKey("requirement_sets.id"), nullable=False, index=True)
+    test_type = Column(Text, nullable=False)
+    status = Column(Text, nullable=False, default="created")  # created, processing, completed, failed
     error_message = Column(Text)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     completed_at = Column(DateTime)
     
     # Relationships
@@ -93,16 +92,17 @@ class TestRunFile(Base):
     __tablename__ = "test_run_files"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    test_run_id = Column(Integer, ForeignKey("test_runs.id"), nullable=False)
-    original_filename = Column(String(500), nullable=False)
-    stored_path = Column(String(1000), nullable=False)
+    test_run_id = Column(Integer, ForeignKey("test_runs.id"), nullable=False, index=True)
+    original_filename = Column(Text, nullable=False)
+    stored_path = Column(Text, nullable=False)
     effective_metadata = Column(JSON, nullable=False)  # Stores EffectiveMetadata
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     
     # Relationships
     test_run = relationship("TestRun", back_populates="files")
     metrics = relationship("TestRunMetrics", back_populates="file", uselist=False, cascade="all, delete-orphan")
     compliance = relationship("TestRunCompliance", back_populates="file", uselist=False, cascade="all, delete-orphan")
+    requirement_results = relationship("TestRunRequirementResult", cascade="all, delete-orphan")
 
 
 class TestRunMetrics(Base):
@@ -110,11 +110,12 @@ class TestRunMetrics(Base):
     __tablename__ = "test_run_metrics"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    test_run_id = Column(Integer, ForeignKey("test_runs.id"), nullable=False)
+    test_run_id = Column(Integer, ForeignKey("test_runs.id"), nullable=False, index=True)
     file_id = Column(Integer, ForeignKey("test_run_files.id"), nullable=False, unique=True)
-    metrics = Column(JSON, nullable=False)  # Dictionary of metric arrays
-    frequencies = Column(JSON, nullable=False)  # Frequency array
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    metrics = Column(JSON, nullable=True)  # Dictionary of metric arrays (JSON storage)
+    frequencies = Column(JSON, nullable=True)  # Frequency array (JSON storage)
+    arrays = Column(LargeBinary, nullable=True)  # Compressed .npz of frequencies + metric arrays (binary storage)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     
     # Relationships
     file = relationship("TestRunFile", back_populates="metrics")
@@ -129,12 +130,12 @@ class TestRunCompliance(Base):
     __tablename__ = "test_run_compliance"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    test_run_id = Column(Integer, ForeignKey("test_runs.id"), nullable=False)
+    test_run_id = Column(Integer, ForeignKey("test_runs.id"), nullable=False, index=True)
     file_id = Column(Integer, ForeignKey("test_run_files.id"), nullable=False, unique=True)
     overall_pass = Column(Boolean, nullable=False)
     requirements = Column(JSON, nullable=False)  # List of requirement results
     failure_reasons = Column(JSON)  # List of failure reason strings
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     
     # Relationships
     file = relationship("TestRunFile", back_populates="compliance")
@@ -143,3 +144,26 @@ class TestRunCompliance(Base):
         UniqueConstraint('file_id', name='uq_test_run_compliance_file_id'),
     )
 
+
+class TestRunRequirementResult(Base):
+    """
+    One requirement's result for a test run file.
+    
+    Mirrors the entries of TestRunCompliance.requirements as rows, so results
+    can be filtered and aggregated in SQL (e.g. all failing gain results of a run).
+    """
+    __tablename__ = "test_run_requirement_results"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    test_run_id = Column(Integer, ForeignKey("test_runs.id"), nullable=False)
+    file_id = Column(Integer, ForeignKey("test_run_files.id"), nullable=False, index=True)
+    requirement_name = Column(Text)
+    passed = Column(Boolean, nullable=False)
+    computed_value = Column(Float)
+    limit_value = Column(Float)
+    failure_reason = Column(Text)
+    
+    __table_args__ = (
+        # Also serves test_run_id-only lookups (leftmost column)
+        Index('ix_test_run_requirement_results_run_requirement', 'test_run_id', 'requirement_name'),
+    )
@@ -1,95 +1,218 @@
 """
 SQLite implementation of IDatabase interface.
 """
-from typing import Optional, Dict, Any
-from sqlalchemy.orm import Session
+import io
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator
+import numpy as np
+from sqlalchemy import bindparam, delete, insert, lambda_stmt, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, raiseload
 from sqlalchemy.exc import IntegrityError
 from .interfaces import IDatabase
 from .models import (
     Device, TestStage, RequirementSet, TestRun, TestRunFile,
-    TestRunMetrics, TestRunCompliance
+    TestRunMetrics, TestRunCompliance, TestRunRequirementResult
 )
 
 
+def _pack_arrays(arrays: dict[str, np.ndarray]) -> bytes:
+    """
+    Serialize named arrays to compressed .npz bytes (no pickling, so load is safe).
+    
+    The .npz header records each array's dtype and shape; members are
+    deflate-compressed, which shrinks smooth RF sweeps well below raw size.
+    """
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def _downcast_metric_arrays(arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """
+    Store metric traces as float32 (plenty for ~6 significant digits of RF data).
+    
+    Frequencies stay float64 so band-edge comparisons on stored data are exact,
+    and scalar metrics (e.g. gain flatness) are left as they are.
+    """
+    return {
+        name: values if name == "frequencies" or np.ndim(values) == 0 else np.asarray(values, dtype=np.float32)
+        for name, values in arrays.items()
+    }
+
+
+def _unpack_arrays(blob: bytes) -> dict:
+    """Deserialize .npz bytes written by _pack_arrays (0-d arrays come back as floats)."""
+    with np.load(io.BytesIO(blob), allow_pickle=False) as npz:
+        return {name: npz[name].item() if npz[name].ndim == 0 else npz[name] for name in npz.files}
+
+
+# Primary-key lookups as cached lambda statements: the select() is built and
+# compiled once, and each call only binds the id. Entity loads (for updates)
+# go through _SELECT_BY_ID, read-only getters through _SELECT_MAPPING_BY_ID.
+_SELECT_BY_ID = {
+    TestRun: lambda_stmt(lambda: select(TestRun).where(TestRun.id == bindparam("id"))),
+}
+
+# Read-only getters select just these columns and return the row mapping as a
+# dict, skipping ORM entity construction and identity-map bookkeeping
+_DEVICE_COLUMNS = (
+    Device.id, Device.name, Device.part_number, Device.description,
+    Device.s_parameter_config, Device.created_at, Device.updated_at,
+)
+_TEST_STAGE_COLUMNS = (
+    TestStage.id, TestStage.name, TestStage.description, TestStage.created_at, TestStage.updated_at,
+)
+_REQUIREMENT_SET_COLUMNS = (
+    RequirementSet.id, RequirementSet.name, RequirementSet.test_type, RequirementSet.metric_limits,
+    RequirementSet.pass_policy, RequirementSet.requirement_hash,
+    RequirementSet.created_at, RequirementSet.updated_at,
+)
+_TEST_RUN_COLUMNS = (
+    TestRun.id, TestRun.device_id, TestRun.test_stage_id, TestRun.requirement_set_id,
+    TestRun.test_type, TestRun.status, TestRun.error_message, TestRun.created_at, TestRun.completed_at,
+)
+_TEST_RUN_FILE_COLUMNS = (
+    TestRunFile.id, TestRunFile.test_run_id, TestRunFile.original_filename,
+    TestRunFile.stored_path, TestRunFile.effective_metadata, TestRunFile.created_at,
+)
+
+_SELECT_MAPPING_BY_ID = {
+    Device: lambda_stmt(lambda: select(*_DEVICE_COLUMNS).where(Device.id == bindparam("id"))),
+    TestStage: lambda_stmt(lambda: select(*_TEST_STAGE_COLUMNS).where(TestStage.id == bindparam("id"))),
+    RequirementSet: lambda_stmt(
+        lambda: select(*_REQUIREMENT_SET_COLUMNS).where(RequirementSet.id == bindparam("id"))
+    ),
+    TestRun: lambda_stmt(lambda: select(*_TEST_RUN_COLUMNS).where(TestRun.id == bindparam("id"))),
+}
+
+
 class SQLiteDatabase(IDatabase):
     """SQLite implementation of IDatabase."""
     
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, strict: bool = False):
         """
         Initialize with SQLAlchemy session.
         
         Args:
             session: SQLAlchemy session
+            strict: If True, ORM entities are loaded with raiseload('*') so
+                any accidental relationship access (an N+1 lazy load) raises
+                instead of silently querying; meant for tests
         """
         self.session = session
+        self.strict = strict
+        self._transaction_depth = 0
+    
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group several calls into one transaction (one commit, not one per call).
+        
+        Inside the block, methods flush instead of committing; the outermost
+        block commits on exit, or rolls everything back if it raises. Nesting
+        is allowed.
+        """
+        self._transaction_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.session.rollback()
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self.session.commit()
+    
+    def _commit(self) -> None:
+        """Commit, or just flush when inside transaction()."""
+        if self._transaction_depth:
+            self.session.flush()
+        else:
+            self.session.commit()
+    
+    def _get_by_id(self, model, row_id: int):
+        """Load one row by primary key (None if missing) using a cached statement."""
+        stmt = _SELECT_BY_ID[model]
+        if self.strict:
+            stmt = stmt + (lambda s: s.options(raiseload("*")))
+        return self.session.execute(stmt, {"id": row_id}).scalar_one_or_none()
+    
+    def _get_mapping_by_id(self, model, row_id: int) -> Optional[dict]:
+        """Read one row's columns by primary key as a plain dict (None if missing)."""
+        row = self.session.execute(_SELECT_MAPPING_BY_ID[model], {"id": row_id}).mappings().first()
+        return None if row is None else dict(row)
+    
+    def _query(self, model):
+        """Start a query for `model`, with relationship loading disabled in strict mode."""
+        query = self.session.query(model)
+        if self.strict:
+            query = query.options(raiseload("*"))
+        return query
     
     def create_device(self, device_data: dict) -> int:
         """Create a device and return its ID."""
         device = Device(**device_data)
         self.session.add(device)
-        self.session.commit()
-        self.session.refresh(device)
-        return device.id
+        self.session.flush()  # The INSERT fills in device.id; no refresh SELECT needed
+        device_id = device.id
+        self._commit()
+        return device_id
     
     def get_device(self, device_id: int) -> Optional[dict]:
         """Get a device by ID."""
-        device = self.session.query(Device).filter(Device.id == device_id).first()
-        if device is None:
-            return None
-        return self._device_to_dict(device)
+        return self._get_mapping_by_id(Device, device_id)
     
     def create_test_stage(self, stage_data: dict) -> int:
         """Create a test stage and return its ID."""
         stage = TestStage(**stage_data)
         self.session.add(stage)
         try:
-            self.session.commit()
-            self.session.refresh(stage)
-            return stage.id
+            self.session.flush()  # The INSERT fills in stage.id; no refresh SELECT needed
+            stage_id = stage.id
+            self._commit()
+            return stage_id
         except IntegrityError:
-            self.session.rollback()
+            # Inside transaction() the whole block must fail: rolling back here
+            # would drop its earlier writes while the block carries on
+            if not self._transaction_depth:
+                self.session.rollback()
             raise ValueError(f"Test stage with name '{stage_data.get('name')}' already exists")
     
     def get_test_stage(self, stage_id: int) -> Optional[dict]:
         """Get a test stage by ID."""
-        stage = self.session.query(TestStage).filter(TestStage.id == stage_id).first()
-        if stage is None:
-            return None
-        return self._test_stage_to_dict(stage)
+        return self._get_mapping_by_id(TestStage, stage_id)
     
     def create_requirement_set(self, req_set_data: dict) -> int:
         """Create a requirement set and return its ID."""
         req_set = RequirementSet(**req_set_data)
         self.session.add(req_set)
-        self.session.commit()
-        self.session.refresh(req_set)
-        return req_set.id
+        self.session.flush()  # The INSERT fills in req_set.id; no refresh SELECT needed
+        req_set_id = req_set.id
+        self._commit()
+        return req_set_id
     
     def get_requirement_set(self, req_set_id: int) -> Optional[dict]:
         """Get a requirement set by ID."""
-        req_set = self.session.query(RequirementSet).filter(RequirementSet.id == req_set_id).first()
-        if req_set is None:
-            return None
-        return self._requirement_set_to_dict(req_set)
+        return self._get_mapping_by_id(RequirementSet, req_set_id)
     
     def create_test_run(self, test_run_data: dict) -> int:
         """Create a test run and return its ID."""
         test_run = TestRun(**test_run_data)
         self.session.add(test_run)
-        self.session.commit()
-        self.session.refresh(test_run)
-        return test_run.id
+        self.session.flush()  # The INSERT fills in test_run.id; no refresh SELECT needed
+        test_run_id = test_run.id
+        self._commit()
+        return test_run_id
     
     def get_test_run(self, test_run_id: int) -> Optional[dict]:
         """Get a test run by ID."""
-        test_run = self.session.query(TestRun).filter(TestRun.id == test_run_id).first()
-        if test_run is None:
-            return None
-        return self._test_run_to_dict(test_run)
+        return self._get_mapping_by_id(TestRun, test_run_id)
     
     def update_test_run_status(self, test_run_id: int, status: str, error_message: Optional[str] = None) -> None:
         """Update test run status. Raises error if test run is immutable."""
-        test_run = self.session.query(TestRun).filter(TestRun.id == test_run_id).first()
+        test_run = self._get_by_id(TestRun, test_run_id)
         if test_run is None:
             raise ValueError(f"Test run {test_run_id} not found")
         
@@ -105,106 +228,133 @@ class SQLiteDatabase(IDatabase):
             from datetime import datetime, timezone
             test_run.completed_at = datetime.now(timezone.utc)
         
-        self.session.commit()
+        self._commit()
     
     def add_test_run_file(self, test_run_id: int, file_data: dict) -> int:
         """Add a file to a test run and return file ID."""
         # Verify test run exists
-        test_run = self.session.query(TestRun).filter(TestRun.id == test_run_id).first()
+        test_run = self._get_by_id(TestRun, test_run_id)
         if test_run is None:
             raise ValueError(f"Test run {test_run_id} not found")
         
         file_data["test_run_id"] = test_run_id
         file = TestRunFile(**file_data)
         self.session.add(file)
-        self.session.commit()
-        self.session.refresh(file)
-        return file.id
-    
-    def get_test_run_files(self, test_run_id: int) -> list[dict]:
-        """Get all files for a test run."""
-        files = self.session.query(TestRunFile).filter(TestRunFile.test_run_id == test_run_id).all()
-        return [{
-            "id": f.id,
-            "test_run_id": f.test_run_id,
-            "original_filename": f.original_filename,
-            "stored_path": f.stored_path,
-            "effective_metadata": f.effective_metadata,
-            "created_at": f.created_at
-        } for f in files]
+        self.session.flush()  # The INSERT fills in file.id; no refresh SELECT needed
+        file_id = file.id
+        self._commit()
+        return file_id
     
-    def store_metrics(self, test_run_id: int, file_id: int, metrics_data: dict) -> None:
-        """Store computed metrics for a test run file."""
-        # Verify test run and file exist
-        test_run = self.session.query(TestRun).filter(TestRun.id == test_run_id).first()
+    def add_test_run_files_bulk(self, test_run_id: int, files_data: list[dict]) -> list[int]:
+        """Add several files to a test run in one transaction and return their IDs."""
+        # Verify test run exists (once for the whole batch)
+        test_run = self._get_by_id(TestRun, test_run_id)
         if test_run is None:
             raise ValueError(f"Test run {test_run_id} not found")
         
-        file = self.session.query(TestRunFile).filter(TestRunFile.id == file_id).first()
-        if file is None or file.test_run_id != test_run_id:
-            raise ValueError(f"File {file_id} not found in test run {test_run_id}")
-        
-        # Check if metrics already exist
-        existing = self.session.query(TestRunMetrics).filter(TestRunMetrics.file_id == file_id).first()
-        if existing:
-            existing.metrics = metrics_data["metrics"]
-            existing.frequencies = metrics_data["frequencies"]
-        else:
-            metrics = TestRunMetrics(
-                test_run_id=test_run_id,
-                file_id=file_id,
-                metrics=metrics_data["metrics"],
-                frequencies=metrics_data["frequencies"],
-            )
-            self.session.add(metrics)
+        if not files_data:
+            return []
         
-        self.session.commit()
+        # One multi-row INSERT ... RETURNING instead of a flush per ORM object
+        file_ids = self.session.scalars(
+            insert(TestRunFile).returning(TestRunFile.id, sort_by_parameter_order=True),
+            [{**file_data, "test_run_id": test_run_id} for file_data in files_data],
+        ).all()
+        self._commit()
+        return list(file_ids)
+    
+    def get_test_run_files(self, test_run_id: int) -> list[dict]:
+        """Get all files for a test run."""
+        rows = self.session.execute(
+            select(*_TEST_RUN_FILE_COLUMNS).where(TestRunFile.test_run_id == test_run_id)
+        ).mappings()
+        return [dict(row) for row in rows]
+    
+    def store_metrics(self, test_run_id: int, file_id: int, metrics_data: dict) -> None:
+        """Store computed metrics for a test run file (upsert on file_id, no existence SELECT)."""
+        self.store_metrics_bulk(test_run_id, {file_id: metrics_data})
+    
+    def store_metrics_bulk(self, test_run_id: int, metrics_by_file: dict[int, dict]) -> None:
+        """Store computed metrics for several files (file ID -> metrics data) in one transaction."""
+        self._check_files(test_run_id, metrics_by_file)
+        self._upsert_by_file_id(TestRunMetrics, [{
+            "test_run_id": test_run_id,
+            "file_id": file_id,
+            "metrics": metrics_data["metrics"],
+            "frequencies": metrics_data["frequencies"],
+            "arrays": None,
+        } for file_id, metrics_data in metrics_by_file.items()])
+        self._commit()
+    
+    def store_metrics_binary(self, test_run_id: int, file_id: int, arrays: dict[str, np.ndarray]) -> None:
+        """Store computed metrics as NumPy arrays (metric name -> array, plus "frequencies")."""
+        self.store_metrics_binary_bulk(test_run_id, {file_id: arrays})
+    
+    def store_metrics_binary_bulk(self, test_run_id: int, arrays_by_file: dict[int, dict[str, np.ndarray]]) -> None:
+        """Store NumPy metric arrays for several files (file ID -> arrays) in one transaction."""
+        self._check_files(test_run_id, arrays_by_file)
+        self._upsert_by_file_id(TestRunMetrics, [{
+            "test_run_id": test_run_id,
+            "file_id": file_id,
+            "metrics": None,
+            "frequencies": None,
+            "arrays": _pack_arrays(_downcast_metric_arrays(arrays)),
+        } for file_id, arrays in arrays_by_file.items()])
+        self._commit()
     
     def get_test_run_metrics(self, test_run_id: int, file_id: int) -> Optional[dict]:
-        """Get metrics for a test run file."""
-        metrics = self.session.query(TestRunMetrics).filter(
+        """Get metrics for a test run file (arrays for binary rows, lists for JSON rows)."""
+        metrics = self._query(TestRunMetrics).filter(
             TestRunMetrics.test_run_id == test_run_id,
             TestRunMetrics.file_id == file_id
         ).first()
         if metrics is None:
             return None
+        if metrics.arrays is not None:
+            arrays = _unpack_arrays(metrics.arrays)
+            frequencies = arrays.pop("frequencies")
+            return {"metrics": arrays, "frequencies": frequencies}
         return {
             "metrics": metrics.metrics,
             "frequencies": metrics.frequencies
         }
     
     def store_compliance(self, test_run_id: int, file_id: int, compliance_data: dict) -> None:
-        """Store compliance results for a test run file."""
-        # Verify test run and file exist
-        test_run = self.session.query(TestRun).filter(TestRun.id == test_run_id).first()
-        if test_run is None:
-            raise ValueError(f"Test run {test_run_id} not found")
-        
-        file = self.session.query(TestRunFile).filter(TestRunFile.id == file_id).first()
-        if file is None or file.test_run_id != test_run_id:
-            raise ValueError(f"File {file_id} not found in test run {test_run_id}")
-        
-        # Check if compliance already exists
-        existing = self.session.query(TestRunCompliance).filter(TestRunCompliance.file_id == file_id).first()
-        if existing:
-            existing.overall_pass = compliance_data["overall_pass"]
-            existing.requirements = compliance_data["requirements"]
-            existing.failure_reasons = compliance_data.get("failure_reasons", [])
-        else:
-            compliance = TestRunCompliance(
-                test_run_id=test_run_id,
-                file_id=file_id,
-                overall_pass=compliance_data["overall_pass"],
-                requirements=compliance_data["requirements"],
-                failure_reasons=compliance_data.get("failure_reasons", []),
-            )
-            self.session.add(compliance)
+        """Store compliance results for a test run file (upsert on file_id, no existence SELECT)."""
+        self.store_compliance_bulk(test_run_id, {file_id: compliance_data})
+    
+    def store_compliance_bulk(self, test_run_id: int, compliance_by_file: dict[int, dict]) -> None:
+        """Store compliance results for several files (file ID -> compliance data) in one transaction."""
+        self._check_files(test_run_id, compliance_by_file)
+        self._upsert_by_file_id(TestRunCompliance, [{
+            "test_run_id": test_run_id,
+            "file_id": file_id,
+            "overall_pass": compliance_data["overall_pass"],
+            "requirements": compliance_data["requirements"],
+            "failure_reasons": compliance_data.get("failure_reasons", []),
+        } for file_id, compliance_data in compliance_by_file.items()])
         
-        self.session.commit()
+        # Replace the per-requirement rows for these files
+        self.session.execute(
+            delete(TestRunRequirementResult).where(TestRunRequirementResult.file_id.in_(list(compliance_by_file)))
+        )
+        result_rows = [{
+            "test_run_id": test_run_id,
+            "file_id": file_id,
+            "requirement_name": requirement.get("requirement_name"),
+            "passed": requirement["passed"],
+            "computed_value": requirement.get("computed_value"),
+            "limit_value": requirement.get("limit_value"),
+            "failure_reason": requirement.get("failure_reason"),
+        } for file_id, compliance_data in compliance_by_file.items()
+            for requirement in compliance_data["requirements"]]
+        if result_rows:
+            self.session.execute(insert(TestRunRequirementResult), result_rows)
+        self._commit()
     
     def get_test_run_compliance(self, test_run_id: int, file_id: int) -> Optional[dict]:
         """Get compliance results for a test run file."""
-        compliance = self.session.query(TestRunCompliance).filter(
+        compliance = self._query(TestRunCompliance).filter(
             TestRunCompliance.test_run_id == test_run_id,
             TestRunCompliance.file_id == file_id
         ).first()
@@ -216,53 +366,34 @@ class SQLiteDatabase(IDatabase):
             "failure_reasons": compliance.failure_reasons
         }
     
-    # Helper methods to convert models to dicts
-    def _device_to_dict(self, device: Device) -> dict:
-        """Convert Device model to dict."""
-        return {
-            "id": device.id,
-            "name": device.name,
-            "part_number": device.part_number,
-            "description": device.description,
-            "s_parameter_config": device.s_parameter_config,
-            "created_at": device.created_at,
-            "updated_at": device.updated_at,
-        }
-    
-    def _test_stage_to_dict(self, stage: TestStage) -> dict:
-        """Convert TestStage model to dict."""
-        return {
-            "id": stage.id,
-            "name": stage.name,
-            "description": stage.description,
-            "created_at": stage.created_at,
-            "updated_at": stage.updated_at,
-        }
-    
-    def _requirement_set_to_dict(self, req_set: RequirementSet) -> dict:
-        """Convert RequirementSet model to dict."""
-        return {
-            "id": req_set.id,
-            "name": req_set.name,
-            "test_type": req_set.test_type,
-            "metric_limits": req_set.metric_limits,
-            "pass_policy": req_set.pass_policy,
-            "requirement_hash": req_set.requirement_hash,
-            "created_at": req_set.created_at,
-            "updated_at": req_set.updated_at,
+    def _check_files(self, test_run_id: int, file_ids) -> None:
+        """Verify the test run exists and all file IDs belong to it (two queries for the whole batch)."""
+        test_run = self._get_by_id(TestRun, test_run_id)
+        if test_run is None:
+            raise ValueError(f"Test run {test_run_id} not found")
+        
+        file_ids = list(file_ids)
+        found = {
+            file_id for (file_id,) in self.session.query(TestRunFile.id).filter(
+                TestRunFile.id.in_(file_ids), TestRunFile.test_run_id == test_run_id
+            )
         }
+        for file_id in file_ids:
+            if file_id not in found:
+                raise ValueError(f"File {file_id} not found in test run {test_run_id}")
     
-    def _test_run_to_dict(self, test_run: TestRun) -> dict:
-        """Convert TestRun model to dict."""
-        return {
-            "id": test_run.id,
-            "device_id": test_run.device_id,
-            "test_stage_id": test_run.test_stage_id,
-            "requirement_set_id": test_run.requirement_set_id,
-            "test_type": test_run.test_type,
-            "status": test_run.status,
-            "error_message": test_run.error_message,
-            "created_at": test_run.created_at,
-            "completed_at": test_run.completed_at,
-        }
-
+    def _upsert_by_file_id(self, model, rows: list[dict]) -> None:
+        """
+        Insert rows for `model`, updating the existing row on a file_id conflict.
+        
+        One INSERT ... ON CONFLICT(file_id) DO UPDATE executed for all rows,
+        so there is no existence SELECT; every column except the keys is updated.
+        """
+        if not rows:
+            return
+        stmt = sqlite_insert(model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["file_id"],
+            set_={name: stmt.excluded[name] for name in rows[0] if name not in ("test_run_id", "file_id")},
+        )
+        self.session.execute(stmt, rows)
@@ -3,8 +3,9 @@ Storage service that combines database and file storage.
 
 Implements IStorageFactory interface.
 """
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Iterator
 from sqlalchemy.orm import Session
 from .interfaces import IDatabase, IFileStorage, IStorageFactory
 from .database import create_database_engine, init_database, get_session_factory
@@ -34,6 +35,9 @@ class StorageService(IStorageFactory):
         self.engine = create_database_engine(database_url)
         init_database(self.engine)
         self.session_factory = get_session_factory(self.engine)
+        
+        # File storage is stateless, so one instance is shared by all callers
+        self._file_storage: Optional[IFileStorage] = None
     
     def create_database(self) -> IDatabase:
         """Create a database instance."""
@@ -41,10 +45,21 @@ class StorageService(IStorageFactory):
         return SQLiteDatabase(session)
     
     def create_file_storage(self) -> IFileStorage:
-        """Create a file storage instance."""
-        return FilesystemFileStorage(self.file_storage_path)
+        """Create a file storage instance (shared across calls)."""
+        if self._file_storage is None:
+            self._file_storage = FilesystemFileStorage(self.file_storage_path)
+        return self._file_storage
     
     def get_session(self) -> Session:
         """Get a database session (for advanced usage)."""
         return self.session_factory()
+    
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Provide a database session that is closed when the scope exits."""
+        session = self.session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
 
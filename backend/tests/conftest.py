@@ -4,6 +4,7 @@ Shared pytest fixtures for all tests.
 import pytest
 import tempfile
 import shutil
+import uuid
 from pathlib import Path
 
 
@@ -45,8 +46,13 @@ def sample_s4p_file():
 
 @pytest.fixture
 def in_memory_db():
-    """Return SQLite in-memory database connection string."""
-    return "sqlite:///:memory:"
+    """
+    Return a SQLite in-memory database connection string.
+    
+    A named shared-cache database, so every engine/connection opened on the
+    URL sees the same schema and data; the name is unique per test.
+    """
+    return f"sqlite:///file:testdb_{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true"
 
 
 @pytest.fixture
@@ -8,10 +8,8 @@ Tests the complete workflow:
 4. Verify results (metrics, compliance, plots)
 """
 import pytest
-import tempfile
-import shutil
+import uuid
 import numpy as np
-import skrf as rf
 from pathlib import Path
 from typing import Dict
 
@@ -21,85 +19,74 @@ from backend.src.core.schemas.device import DeviceConfig
 from backend.src.core.schemas.requirement_set import RequirementSet
 
 
-@pytest.fixture
-def temp_storage():
-    """Create temporary storage for E2E tests."""
-    temp_path = Path(tempfile.mkdtemp())
-    db_url = f"sqlite:///{temp_path / 'test.db'}"
+# Frequency grid (Hz) shared by the synthetic S-parameter files
+_FREQ = np.linspace(0.5e9, 3e9, 201)
+
+
+def _write_s2p(path: Path, freq_hz: np.ndarray, s: np.ndarray) -> None:
+    """Write a 2-port Touchstone file (Hz, real/imaginary) without going through scikit-rf."""
+    # 2-port Touchstone column order is S11, S21, S12, S22 (real/imaginary pairs)
+    data = np.column_stack([
+        freq_hz,
+        s[:, 0, 0].real, s[:, 0, 0].imag,
+        s[:, 1, 0].real, s[:, 1, 0].imag,
+        s[:, 0, 1].real, s[:, 0, 1].imag,
+        s[:, 1, 1].real, s[:, 1, 1].imag,
+    ])
+    np.savetxt(path, data, fmt="%.9e", header="# Hz S RI R 50", comments="")
+
+
+@pytest.fixture(scope="module")
+def temp_storage(tmp_path_factory):
+    """Create temporary storage shared by the E2E tests in this module."""
+    # Named in-memory database (no DB file to lock or delete); files stay on disk
+    # under a pytest-managed temporary directory
+    temp_path = tmp_path_factory.mktemp("e2e_storage")
+    db_url = f"sqlite:///file:e2e_{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true"
     storage_service = StorageService(
         database_url=db_url,
         file_storage_path=temp_path / "files"
     )
     yield storage_service
     
-    # Cleanup with retry for Windows file locking
-    try:
-        # Close any database connections
-        if hasattr(storage_service, 'engine'):
-            storage_service.engine.dispose()
-        
-        # Try to remove the directory
-        import time
-        max_retries = 3
-        for i in range(max_retries):
-            try:
-                shutil.rmtree(temp_path)
-                break
-            except PermissionError:
-                if i < max_retries - 1:
-                    time.sleep(0.1)
-                else:
-                    # On Windows, database may still be locked - just warn
-                    import warnings
-                    warnings.warn(f"Could not clean up temp directory: {temp_path}")
-    except Exception as e:
-        import warnings
-        warnings.warn(f"Error during cleanup: {e}")
-
-
-@pytest.fixture
-def sample_s2p_file(temp_storage):
-    """Create a sample S2P file programmatically."""
-    # Create temporary file
-    temp_file = temp_storage.file_storage_path.parent / "sample_SN1234_PRI_L567890_AMB_20240101.s2p"
+    storage_service.engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def db(temp_storage):
+    """Database handle shared by the module's fixtures and tests."""
+    database = temp_storage.create_database()
+    yield database
+    database.session.close()
+
+
+@pytest.fixture(scope="session")
+def sample_s2p_file(tmp_path_factory):
+    """Create a sample S2P file programmatically (once per session; tests only read it)."""
+    temp_file = tmp_path_factory.mktemp("s2p") / "sample_SN1234_PRI_L567890_AMB_20240101.s2p"
     
     # Generate S-parameter data
-    freq = rf.Frequency(0.5e9, 3e9, 201, unit='Hz')
-    n_points = len(freq)
-    s = np.zeros((n_points, 2, 2), dtype=complex)
-    
-    for i, f in enumerate(freq.f):
-        # S11: Input return loss ~15 dB
-        s11_mag = 10**(-15/20)
-        s[i, 0, 0] = s11_mag * np.exp(1j * np.pi * f / freq.f[-1])
-        
-        # S21: Forward gain ~10 dB
-        s21_mag = 10**(10/20)
-        s[i, 1, 0] = s21_mag * np.exp(-1j * np.pi * f / freq.f[-1] * 0.5)
-        
-        # S12: Reverse isolation ~40 dB
-        s12_mag = 10**(-40/20)
-        s[i, 0, 1] = s12_mag * np.exp(1j * np.pi * f / freq.f[-1] * 0.3)
-        
-        # S22: Output return loss ~12 dB
-        s22_mag = 10**(-12/20)
-        s[i, 1, 1] = s22_mag * np.exp(1j * np.pi * f / freq.f[-1] * 0.7)
-    
-    network = rf.Network(frequency=freq, s=s)
-    network.write_touchstone(str(temp_file))
-    
-    yield temp_file
-    
-    # Cleanup
-    if temp_file.exists():
-        temp_file.unlink()
+    n_points = len(_FREQ)
+    phase = np.pi * _FREQ / _FREQ[-1]
+    s = np.empty((n_points, 2, 2), dtype=complex)
+    
+    # S11: Input return loss ~15 dB
+    s[:, 0, 0] = 10**(-15/20) * np.exp(1j * phase)
+    # S21: Forward gain ~10 dB
+    s[:, 1, 0] = 10**(10/20) * np.exp(-0.5j * phase)
+    # S12: Reverse isolation ~40 dB
+    s[:, 0, 1] = 10**(-40/20) * np.exp(0.3j * phase)
+    # S22: Output return loss ~12 dB
+    s[:, 1, 1] = 10**(-12/20) * np.exp(0.7j * phase)
+    
+    _write_s2p(temp_file, _FREQ, s)
+    
+    return temp_file
 
 
-@pytest.fixture
-def test_device(temp_storage):
+@pytest.fixture(scope="module")
+def test_device(db):
     """Create a test device."""
-    db = temp_storage.create_database()
-    
     device_data = {
         "name": "2-Port RF Amplifier",
         "description": "Test amplifier for E2E testing",
@@ -123,11 +110,9 @@ def test_device(temp_storage):
     return device_id
 
 
-@pytest.fixture
-def test_stage(temp_storage):
+@pytest.fixture(scope="module")
+def test_stage(db):
     """Create a test stage."""
-    db = temp_storage.create_database()
-    
     stage_data = {
         "name": "Production Test",
         "description": "Production testing stage"
@@ -137,11 +122,9 @@ def test_stage(temp_storage):
     return stage_id
 
 
-@pytest.fixture
-def test_requirement_set(temp_storage, test_stage):
+@pytest.fixture(scope="module")
+def test_requirement_set(db, test_stage):
     """Create a test requirement set."""
-    db = temp_storage.create_database()
-    
     # Import to compute hash
     from backend.src.core.schemas.requirement_set import RequirementSet as RequirementSetSchema
     
@@ -204,40 +187,40 @@ def test_requirement_set(temp_storage, test_stage):
     return req_set_id
 
 
-def test_full_pipeline_workflow(
+@pytest.fixture(scope="module")
+def device_config(db, test_device):
+    """Validated configuration of the test device (read and validated once)."""
+    return DeviceConfig(**db.get_device(test_device))
+
+
+@pytest.fixture(scope="module")
+def requirement_set(db, test_requirement_set):
+    """Validated test requirement set (read and validated once)."""
+    return RequirementSet(**db.get_requirement_set(test_requirement_set))
+
+
+@pytest.fixture(scope="module")
+def processed_run(
     temp_storage,
+    db,
     sample_s2p_file,
     test_device,
     test_stage,
-    test_requirement_set
+    test_requirement_set,
+    device_config,
+    requirement_set
 ):
-    """Test the complete pipeline: create -> upload -> process -> verify."""
-    db = temp_storage.create_database()
-    file_storage = temp_storage.create_file_storage()
-    service = TestRunService(db, file_storage)
+    """Create and process one test run; shared by tests that only verify its results."""
+    service = TestRunService(db, temp_storage.create_file_storage())
     
-    # 1. Create test run
-    test_run_data = {
+    test_run_id = db.create_test_run({
         "device_id": test_device,
         "test_stage_id": test_stage,
         "requirement_set_id": test_requirement_set,
         "test_type": "s_parameter"
-    }
-    test_run_id = db.create_test_run(test_run_data)
-    
-    # Verify test run was created
-    test_run = db.get_test_run(test_run_id)
-    assert test_run is not None
-    assert test_run["status"] in ["pending", "created"]  # Allow both as initial status
-    
-    # 2. Get device and requirement set configs
-    device = db.get_device(test_device)
-    req_set = db.get_requirement_set(test_requirement_set)
-    
-    device_config = DeviceConfig(**device)
-    requirement_set = RequirementSet(**req_set)
+    })
+    initial_status = db.get_test_run(test_run_id)["status"]
     
-    # 3. Process test run
     service.process_test_run(
         test_run_id=test_run_id,
         file_paths=[sample_s2p_file],
@@ -245,12 +228,28 @@ def test_full_pipeline_workflow(
         requirement_set=requirement_set
     )
     
-    # 4. Verify test run status
-    test_run = db.get_test_run(test_run_id)
-    assert test_run["status"] == "completed"
-    
-    # 5. Verify file was stored
     files = db.get_test_run_files(test_run_id)
+    file_record = files[0]
+    return {
+        "test_run_id": test_run_id,
+        "initial_status": initial_status,
+        "test_run": db.get_test_run(test_run_id),
+        "files": files,
+        "metrics": db.get_test_run_metrics(test_run_id, file_record["id"]),
+        "compliance": db.get_test_run_compliance(test_run_id, file_record["id"]),
+    }
+
+
+def test_full_pipeline_workflow(processed_run):
+    """Test the complete pipeline: create -> upload -> process -> verify."""
+    # 1. Test run was created with an initial status
+    assert processed_run["initial_status"] in ["pending", "created"]  # Allow both as initial status
+    
+    # 2. Verify test run status
+    assert processed_run["test_run"]["status"] == "completed"
+    
+    # 3. Verify file was stored
+    files = processed_run["files"]
     assert len(files) == 1
     file_record = files[0]
     assert "SN1234" in file_record["original_filename"]
@@ -258,8 +257,8 @@ def test_full_pipeline_workflow(
     assert file_record["effective_metadata"]["path"] == "PRI"
     assert file_record["effective_metadata"]["part_number"] == "L567890"
     
-    # 6. Verify metrics were computed and stored
-    metrics = db.get_test_run_metrics(test_run_id, file_record["id"])
+    # 4. Verify metrics were computed and stored
+    metrics = processed_run["metrics"]
     assert metrics is not None
     assert "metrics" in metrics
     assert "frequencies" in metrics
@@ -275,8 +274,8 @@ def test_full_pipeline_workflow(
     # Gain should be positive (in dB, around 10 dB)
     assert max(gain_values) > 0
     
-    # 7. Verify compliance was evaluated
-    compliance = db.get_test_run_compliance(test_run_id, file_record["id"])
+    # 5. Verify compliance was evaluated
+    compliance = processed_run["compliance"]
     assert compliance is not None
     assert "overall_pass" in compliance
     assert "requirements" in compliance
@@ -286,49 +285,13 @@ def test_full_pipeline_workflow(
     assert compliance["overall_pass"] is True
 
 
-def test_s_parameter_analysis_pipeline(
-    temp_storage,
-    sample_s2p_file,
-    test_device,
-    test_stage,
-    test_requirement_set
-):
+def test_s_parameter_analysis_pipeline(processed_run):
     """Test the full S-parameter analysis pipeline."""
-    db = temp_storage.create_database()
-    file_storage = temp_storage.create_file_storage()
-    service = TestRunService(db, file_storage)
-    
-    # Create test run
-    test_run_id = db.create_test_run({
-        "device_id": test_device,
-        "test_stage_id": test_stage,
-        "requirement_set_id": test_requirement_set,
-        "test_type": "s_parameter"
-    })
-    
-    # Get configs
-    device = db.get_device(test_device)
-    req_set = db.get_requirement_set(test_requirement_set)
-    device_config = DeviceConfig(**device)
-    requirement_set = RequirementSet(**req_set)
-    
-    # Process
-    service.process_test_run(
-        test_run_id=test_run_id,
-        file_paths=[sample_s2p_file],
-        device_config=device_config,
-        requirement_set=requirement_set
-    )
-    
     # Verify analysis results
-    test_run = db.get_test_run(test_run_id)
-    assert test_run["status"] == "completed"
-    
-    files = db.get_test_run_files(test_run_id)
-    assert len(files) == 1
+    assert processed_run["test_run"]["status"] == "completed"
+    assert len(processed_run["files"]) == 1
     
-    file_record = files[0]
-    metrics = db.get_test_run_metrics(test_run_id, file_record["id"])
+    metrics = processed_run["metrics"]
     
     # Verify all expected metrics are present
     metric_names = ["gain", "vswr", "return_loss", "gain_flatness_operational", "gain_flatness_wideband"]
@@ -342,45 +305,9 @@ def test_s_parameter_analysis_pipeline(
     assert max(frequencies) <= 3e9
 
 
-def test_compliance_evaluation(
-    temp_storage,
-    sample_s2p_file,
-    test_device,
-    test_stage,
-    test_requirement_set
-):
+def test_compliance_evaluation(processed_run):
     """Test compliance evaluation with requirement sets."""
-    db = temp_storage.create_database()
-    file_storage = temp_storage.create_file_storage()
-    service = TestRunService(db, file_storage)
-    
-    # Create test run
-    test_run_id = db.create_test_run({
-        "device_id": test_device,
-        "test_stage_id": test_stage,
-        "requirement_set_id": test_requirement_set,
-        "test_type": "s_parameter"
-    })
-    
-    # Get configs
-    device = db.get_device(test_device)
-    req_set = db.get_requirement_set(test_requirement_set)
-    device_config = DeviceConfig(**device)
-    requirement_set = RequirementSet(**req_set)
-    
-    # Process
-    service.process_test_run(
-        test_run_id=test_run_id,
-        file_paths=[sample_s2p_file],
-        device_config=device_config,
-        requirement_set=requirement_set
-    )
-    
-    # Verify compliance
-    files = db.get_test_run_files(test_run_id)
-    file_record = files[0]
-    
-    compliance = db.get_test_run_compliance(test_run_id, file_record["id"])
+    compliance = processed_run["compliance"]
     
     # Check compliance structure
     assert compliance["overall_pass"] is not None
@@ -403,12 +330,14 @@ def test_compliance_evaluation(
 
 def test_multiple_files_processing(
     temp_storage,
+    db,
     test_device,
     test_stage,
-    test_requirement_set
+    test_requirement_set,
+    device_config,
+    requirement_set
 ):
     """Test processing multiple S-parameter files."""
-    db = temp_storage.create_database()
     file_storage = temp_storage.create_file_storage()
     service = TestRunService(db, file_storage)
     
@@ -417,23 +346,20 @@ def test_multiple_files_processing(
     
     # PRI file
     pri_file = temp_path / "SN1234_PRI_L567890_AMB_20240101.s2p"
-    freq = rf.Frequency(0.5e9, 3e9, 201, unit='Hz')
-    n_points = len(freq)
-    s_pri = np.zeros((n_points, 2, 2), dtype=complex)
-    for i, f in enumerate(freq.f):
-        s_pri[i, 0, 0] = 10**(-15/20) * np.exp(1j * np.pi * f / freq.f[-1])
-        s_pri[i, 1, 0] = 10**(10/20) * np.exp(-1j * np.pi * f / freq.f[-1] * 0.5)
-        s_pri[i, 0, 1] = 10**(-40/20) * np.exp(1j * np.pi * f / freq.f[-1] * 0.3)
-        s_pri[i, 1, 1] = 10**(-12/20) * np.exp(1j * np.pi * f / freq.f[-1] * 0.7)
-    network_pri = rf.Network(frequency=freq, s=s_pri)
-    network_pri.write_touchstone(str(pri_file))
+    n_points = len(_FREQ)
+    phase = np.pi * _FREQ / _FREQ[-1]
+    s_pri = np.empty((n_points, 2, 2), dtype=complex)
+    s_pri[:, 0, 0] = 10**(-15/20) * np.exp(1j * phase)
+    s_pri[:, 1, 0] = 10**(10/20) * np.exp(-0.5j * phase)
+    s_pri[:, 0, 1] = 10**(-40/20) * np.exp(0.3j * phase)
+    s_pri[:, 1, 1] = 10**(-12/20) * np.exp(0.7j * phase)
+    _write_s2p(pri_file, _FREQ, s_pri)
     
     # RED file (slightly different)
     red_file = temp_path / "SN1234_RED_L567890_AMB_20240101.s2p"
     s_red = s_pri.copy()
     s_red[:, 1, 0] *= 0.95  # Slightly lower gain
-    network_red = rf.Network(frequency=freq, s=s_red)
-    network_red.write_touchstone(str(red_file))
+    _write_s2p(red_file, _FREQ, s_red)
     
     try:
         # Create test run
@@ -444,12 +370,6 @@ def test_multiple_files_processing(
             "test_type": "s_parameter"
         })
         
-        # Get configs
-        device = db.get_device(test_device)
-        req_set = db.get_requirement_set(test_requirement_set)
-        device_config = DeviceConfig(**device)
-        requirement_set = RequirementSet(**req_set)
-        
         # Process both files
         service.process_test_run(
             test_run_id=test_run_id,
@@ -483,12 +403,14 @@ def test_multiple_files_processing(
 
 def test_test_run_failure_handling(
     temp_storage,
+    db,
     test_device,
     test_stage,
-    test_requirement_set
+    test_requirement_set,
+    device_config,
+    requirement_set
 ):
     """Test that test run failures are handled correctly."""
-    db = temp_storage.create_database()
     file_storage = temp_storage.create_file_storage()
     service = TestRunService(db, file_storage)
     
@@ -500,12 +422,6 @@ def test_test_run_failure_handling(
         "test_type": "s_parameter"
     })
     
-    # Get configs
-    device = db.get_device(test_device)
-    req_set = db.get_requirement_set(test_requirement_set)
-    device_config = DeviceConfig(**device)
-    requirement_set = RequirementSet(**req_set)
-    
     # Try to process a non-existent file
     non_existent_file = Path("/nonexistent/file.s2p")
     
@@ -523,46 +439,16 @@ def test_test_run_failure_handling(
     assert test_run.get("error_message") is not None
 
 
-def test_plot_generation_and_retrieval(
-    temp_storage,
-    sample_s2p_file,
-    test_device,
-    test_stage,
-    test_requirement_set
-):
+def test_plot_generation_and_retrieval(temp_storage, processed_run):
     """Test plot generation and retrieval."""
     from backend.src.plugins.s_parameter.plotting import render_plot
     from backend.src.core.schemas.plotting import PlotSpec, PlotSeries, PlotConfig
     
-    db = temp_storage.create_database()
     file_storage = temp_storage.create_file_storage()
-    service = TestRunService(db, file_storage)
-    
-    # Create and process test run
-    test_run_id = db.create_test_run({
-        "device_id": test_device,
-        "test_stage_id": test_stage,
-        "requirement_set_id": test_requirement_set,
-        "test_type": "s_parameter"
-    })
-    
-    device = db.get_device(test_device)
-    req_set = db.get_requirement_set(test_requirement_set)
-    device_config = DeviceConfig(**device)
-    requirement_set = RequirementSet(**req_set)
-    
-    service.process_test_run(
-        test_run_id=test_run_id,
-        file_paths=[sample_s2p_file],
-        device_config=device_config,
-        requirement_set=requirement_set
-    )
+    test_run_id = processed_run["test_run_id"]
     
     # Get metrics for plotting
-    files = db.get_test_run_files(test_run_id)
-    file_record = files[0]
-    metrics = db.get_test_run_metrics(test_run_id, file_record["id"])
-    
+    metrics = processed_run["metrics"]
     frequencies = metrics["frequencies"]
     gain_values = metrics["metrics"]["gain"]
     
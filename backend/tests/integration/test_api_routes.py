@@ -1,6 +1,7 @@
 """
 Integration tests for API routes.
 """
+from datetime import datetime
 import pytest
 
 # Skip tests if httpx is not installed (required for TestClient)
@@ -222,6 +223,9 @@ def test_get_test_run(client):
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "created"
+    # Timestamps are encoded as ISO 8601 strings
+    assert datetime.fromisoformat(data["created_at"])
+    assert data["completed_at"] is None
 
 
 def test_cors_headers_dev_mode(client):
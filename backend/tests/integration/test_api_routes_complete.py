@@ -102,6 +102,8 @@ def test_test_runs_upload_multiple_files(client):
     assert response.status_code == 200
     data = response.json()
     assert len(data["uploaded_files"]) == 2
+    assert data["uploaded_files"][0]["size"] == len(file1_content)
+    assert data["uploaded_files"][1]["id"] == data["uploaded_files"][0]["id"] + 1
 
 
 def test_test_runs_process_not_implemented(client):
@@ -34,8 +34,8 @@ def db_session():
 
 @pytest.fixture
 def db(db_session):
-    """Create SQLiteDatabase instance."""
-    return SQLiteDatabase(db_session)
+    """Create SQLiteDatabase instance (strict: accidental lazy loads raise)."""
+    return SQLiteDatabase(db_session, strict=True)
 
 
 def test_create_device(db):
@@ -251,4 +251,301 @@ def test_store_compliance(db):
         "requirements": [{"requirement_name": "gain", "passed": True}],
         "failure_reasons": [],
     })
+    
+    # Storing again updates the same row (upsert on file_id)
+    db.store_compliance(test_run_id, file_id, {
+        "overall_pass": False,
+        "requirements": [{"requirement_name": "gain", "passed": False}],
+        "failure_reasons": ["gain"],
+    })
+    compliance = db.get_test_run_compliance(test_run_id, file_id)
+    assert compliance["overall_pass"] is False
+    assert compliance["failure_reasons"] == ["gain"]
+
 
+def test_add_test_run_files_bulk(db):
+    """Test adding several files to a test run in one call."""
+    device_id = db.create_device({"name": "Test", "s_parameter_config": {}})
+    stage_id = db.create_test_stage({"name": "Test"})
+    req_set_id = db.create_requirement_set({
+        "name": "Test", "test_type": "s_parameter", "metric_limits": [], "requirement_hash": "abc"
+    })
+    test_run_id = db.create_test_run({
+        "device_id": device_id,
+        "test_stage_id": stage_id,
+        "requirement_set_id": req_set_id,
+        "test_type": "s_parameter",
+    })
+    
+    file_ids = db.add_test_run_files_bulk(test_run_id, [
+        {"original_filename": f"test{i}.s2p", "stored_path": f"/path/to/test{i}.s2p", "effective_metadata": {}}
+        for i in range(3)
+    ])
+    assert file_ids == [1, 2, 3]
+    
+    files = db.get_test_run_files(test_run_id)
+    assert [f["original_filename"] for f in files] == ["test0.s2p", "test1.s2p", "test2.s2p"]
+    
+    with pytest.raises(ValueError, match="not found"):
+        db.add_test_run_files_bulk(999, [])
+
+
+def test_store_metrics_and_compliance_bulk(db):
+    """Test storing metrics and compliance for several files in one call each."""
+    device_id = db.create_device({"name": "Test", "s_parameter_config": {}})
+    stage_id = db.create_test_stage({"name": "Test"})
+    req_set_id = db.create_requirement_set({
+        "name": "Test", "test_type": "s_parameter", "metric_limits": [], "requirement_hash": "abc"
+    })
+    test_run_id = db.create_test_run({
+        "device_id": device_id,
+        "test_stage_id": stage_id,
+        "requirement_set_id": req_set_id,
+        "test_type": "s_parameter",
+    })
+    file_ids = db.add_test_run_files_bulk(test_run_id, [
+        {"original_filename": f"test{i}.s2p", "stored_path": f"/path/to/test{i}.s2p", "effective_metadata": {}}
+        for i in range(2)
+    ])
+    
+    db.store_metrics_bulk(test_run_id, {
+        file_id: {"metrics": {"gain": [float(i)]}, "frequencies": [1e9]}
+        for i, file_id in enumerate(file_ids)
+    })
+    db.store_compliance_bulk(test_run_id, {
+        file_id: {"overall_pass": i == 0, "requirements": [], "failure_reasons": []}
+        for i, file_id in enumerate(file_ids)
+    })
+    # Storing again updates the existing rows
+    db.store_metrics_bulk(test_run_id, {file_ids[1]: {"metrics": {"gain": [5.0]}, "frequencies": [1e9]}})
+    
+    assert db.get_test_run_metrics(test_run_id, file_ids[0])["metrics"] == {"gain": [0.0]}
+    assert db.get_test_run_metrics(test_run_id, file_ids[1])["metrics"] == {"gain": [5.0]}
+    assert db.get_test_run_compliance(test_run_id, file_ids[0])["overall_pass"] is True
+    assert db.get_test_run_compliance(test_run_id, file_ids[1])["overall_pass"] is False
+    
+    with pytest.raises(ValueError, match="File 999 not found"):
+        db.store_metrics_bulk(test_run_id, {999: {"metrics": {}, "frequencies": []}})
+
+
+def test_store_metrics_binary(db):
+    """Test metric arrays round-trip through the binary column."""
+    import numpy as np
+    device_id = db.create_device({"name": "Test", "s_parameter_config": {}})
+    stage_id = db.create_test_stage({"name": "Test"})
+    req_set_id = db.create_requirement_set({
+        "name": "Test", "test_type": "s_parameter", "metric_limits": [], "requirement_hash": "abc"
+    })
+    test_run_id = db.create_test_run({
+        "device_id": device_id,
+        "test_stage_id": stage_id,
+        "requirement_set_id": req_set_id,
+        "test_type": "s_parameter",
+    })
+    file_id = db.add_test_run_file(test_run_id, {
+        "original_filename": "test.s2p", "stored_path": "/path/to/test.s2p", "effective_metadata": {}
+    })
+    frequencies = np.linspace(1e9, 2e9, 5)
+    gain = np.arange(5.0)
+    
+    db.store_metrics_binary(test_run_id, file_id, {
+        "gain": gain, "gain_flatness_operational": 0.5, "frequencies": frequencies
+    })
+    
+    stored = db.get_test_run_metrics(test_run_id, file_id)
+    np.testing.assert_array_equal(stored["frequencies"], frequencies)
+    np.testing.assert_array_equal(stored["metrics"]["gain"], gain)
+    assert stored["metrics"]["gain_flatness_operational"] == 0.5
+    # Metric traces are stored as float32, frequencies keep full precision
+    assert stored["metrics"]["gain"].dtype == np.float32
+    assert stored["frequencies"].dtype == np.float64
+    
+    # A later JSON write replaces the binary data
+    db.store_metrics(test_run_id, file_id, {"metrics": {"gain": [1.0]}, "frequencies": [1e9]})
+    assert db.get_test_run_metrics(test_run_id, file_id)["metrics"] == {"gain": [1.0]}
+
+
+def test_store_metrics_accepts_numpy_arrays(db):
+    """Test JSON metrics can be stored straight from NumPy arrays."""
+    import numpy as np
+    device_id = db.create_device({"name": "Test", "s_parameter_config": {}})
+    stage_id = db.create_test_stage({"name": "Test"})
+    req_set_id = db.create_requirement_set({
+        "name": "Test", "test_type": "s_parameter", "metric_limits": [], "requirement_hash": "abc"
+    })
+    test_run_id = db.create_test_run({
+        "device_id": device_id,
+        "test_stage_id": stage_id,
+        "requirement_set_id": req_set_id,
+        "test_type": "s_parameter",
+    })
+    file_id = db.add_test_run_file(test_run_id, {
+        "original_filename": "test.s2p", "stored_path": "/path/to/test.s2p", "effective_metadata": {}
+    })
+    
+    db.store_metrics(test_run_id, file_id, {
+        "metrics": {"gain": np.array([-5.0, -6.0]), "gain_flatness": np.float64(1.0)},
+        "frequencies": np.array([1e9, 2e9]),
+    })
+    
+    stored = db.get_test_run_metrics(test_run_id, file_id)
+    assert stored["metrics"] == {"gain": [-5.0, -6.0], "gain_flatness": 1.0}
+    assert stored["frequencies"] == [1e9, 2e9]
+
+
+def test_strict_mode_raises_on_lazy_load(db_session):
+    """Test strict mode turns relationship lazy loads into errors."""
+    from sqlalchemy.exc import InvalidRequestError
+    strict_db = SQLiteDatabase(db_session, strict=True)
+    device_id = strict_db.create_device({"name": "Test", "s_parameter_config": {}})
+    db_session.expunge_all()
+    
+    device = strict_db._query(Device).filter(Device.id == device_id).one()
+    with pytest.raises(InvalidRequestError):
+        device.test_runs
+    
+    # Without strict mode the relationship loads on access
+    db_session.expunge_all()
+    device = SQLiteDatabase(db_session)._query(Device).filter(Device.id == device_id).one()
+    assert device.test_runs == []
+
+
+def test_packed_metric_arrays_are_compressed():
+    """Test the binary metrics codec compresses and round-trips arrays."""
+    import numpy as np
+    from backend.src.storage.sqlite_db import _pack_arrays, _unpack_arrays
+    frequencies = np.linspace(1e9, 10e9, 10001)
+    gain = np.full(10001, -3.0)
+    
+    blob = _pack_arrays({"frequencies": frequencies, "gain": gain})
+    assert len(blob) < (frequencies.nbytes + gain.nbytes) / 2
+    
+    unpacked = _unpack_arrays(blob)
+    np.testing.assert_array_equal(unpacked["frequencies"], frequencies)
+    np.testing.assert_array_equal(unpacked["gain"], gain)
+
+
+def test_foreign_key_columns_are_indexed(db_session):
+    """Test every foreign key column is covered by an index."""
+    from sqlalchemy import inspect
+    inspector = inspect(db_session.get_bind())
+    for table in ("test_runs", "test_run_files", "test_run_metrics", "test_run_compliance"):
+        indexed = {idx["column_names"][0] for idx in inspector.get_indexes(table)}
+        indexed |= {uc["column_names"][0] for uc in inspector.get_unique_constraints(table)}
+        for fk in inspector.get_foreign_keys(table):
+            assert fk["constrained_columns"][0] in indexed, f"{table}.{fk['constrained_columns'][0]}"
+
+
+def test_requirement_hash_is_indexed(db_session):
+    """Test requirement sets can be looked up by hash without a table scan."""
+    from sqlalchemy import text
+    plan = db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM requirement_sets WHERE requirement_hash = 'abc'"
+    )).fetchall()
+    assert "USING" in plan[0][-1] and "INDEX" in plan[0][-1]
+
+
+def test_transaction_commits_once_or_rolls_back(db):
+    """Test transaction() groups writes and rolls all of them back on error."""
+    with db.transaction():
+        device_id = db.create_device({"name": "Test", "s_parameter_config": {}})
+        stage_id = db.create_test_stage({"name": "Stage"})
+    assert db.get_device(device_id) is not None
+    assert db.get_test_stage(stage_id) is not None
+    
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            device_id = db.create_device({"name": "Rolled back", "s_parameter_config": {}})
+            raise RuntimeError("boom")
+    assert db.get_device(device_id) is None
+
+
+@pytest.mark.filterwarnings("ignore:Session's state has been changed")
+def test_duplicate_stage_inside_transaction_keeps_block_atomic(db):
+    """Test a duplicate test stage inside transaction() cannot commit part of the block."""
+    from backend.src.storage.models import Device
+    db.create_test_stage({"name": "Stage"})
+    
+    with pytest.raises(Exception):
+        with db.transaction():
+            db.create_device({"name": "First", "s_parameter_config": {}})
+            with pytest.raises(ValueError, match="already exists"):
+                db.create_test_stage({"name": "Stage"})
+            db.create_device({"name": "Second", "s_parameter_config": {}})
+    
+    assert db.session.query(Device).count() == 0
+
+
+def test_create_issues_no_select(db):
+    """Test creating a row does not re-select it to get its ID."""
+    from sqlalchemy import event
+    statements = []
+    engine = db.session.get_bind()
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        device_id = db.create_device({"name": "Test", "s_parameter_config": {}})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    
+    assert device_id is not None
+    assert not [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+def test_run_file_lookups_use_covering_indexes(db_session):
+    """Test listing a run's files and joining their metrics needs only index pages."""
+    from sqlalchemy import text
+    plan = db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT test_run_metrics.id FROM test_run_files "
+        "JOIN test_run_metrics ON test_run_metrics.file_id = test_run_files.id "
+        "WHERE test_run_files.test_run_id = 1"
+    )).fetchall()
+    details = [row[-1] for row in plan]
+    assert len(details) == 2
+    assert all("USING COVERING INDEX" in detail for detail in details)
+
+
+def test_store_compliance_writes_requirement_result_rows(db):
+    """Test per-requirement results are stored as queryable rows and replaced on update."""
+    from sqlalchemy import select
+    from backend.src.storage.models import TestRunRequirementResult
+    device_id = db.create_device({"name": "Test", "s_parameter_config": {}})
+    stage_id = db.create_test_stage({"name": "Test"})
+    req_set_id = db.create_requirement_set({
+        "name": "Test", "test_type": "s_parameter", "metric_limits": [], "requirement_hash": "abc"
+    })
+    test_run_id = db.create_test_run({
+        "device_id": device_id,
+        "test_stage_id": stage_id,
+        "requirement_set_id": req_set_id,
+        "test_type": "s_parameter",
+    })
+    file_id = db.add_test_run_file(test_run_id, {
+        "original_filename": "test.s2p", "stored_path": "/path/to/test.s2p", "effective_metadata": {}
+    })
+    requirements = [
+        {"requirement_name": "gain", "limit_value": 10.0, "computed_value": 12.0, "passed": True, "failure_reason": None},
+        {"requirement_name": "vswr", "limit_value": 2.0, "computed_value": 2.5, "passed": False, "failure_reason": "vswr high"},
+    ]
+    db.store_compliance(test_run_id, file_id, {
+        "overall_pass": False, "requirements": requirements, "failure_reasons": ["vswr high"]
+    })
+    db.store_compliance(test_run_id, file_id, {
+        "overall_pass": False, "requirements": requirements, "failure_reasons": ["vswr high"]
+    })
+    
+    failing = db.session.execute(
+        select(TestRunRequirementResult.requirement_name, TestRunRequirementResult.computed_value).where(
+            TestRunRequirementResult.test_run_id == test_run_id,
+            TestRunRequirementResult.passed.is_(False),
+        )
+    ).all()
+    assert failing == [("vswr", 2.5)]
+    
+    total = db.session.execute(
+        select(TestRunRequirementResult.id).where(TestRunRequirementResult.file_id == file_id)
+    ).all()
+    assert len(total) == 2
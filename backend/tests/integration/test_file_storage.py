@@ -28,6 +28,50 @@ def test_store_uploaded_file(file_storage, temp_dir):
     assert "inputs" in str(path)
 
 
+def test_store_uploaded_file_from_path(file_storage, tmp_path):
+    """Test copying an existing file into storage."""
+    source = tmp_path / "source.s2p"
+    source.write_bytes(b"test file content")
+    
+    path = file_storage.store_uploaded_file_from_path(1, "test.s2p", source)
+    
+    assert path.read_bytes() == b"test file content"
+    assert path.parent.name == "inputs"
+    # Re-storing a file that is already in storage is a no-op
+    assert file_storage.store_uploaded_file_from_path(1, "test.s2p", path) == path
+    assert path.read_bytes() == b"test file content"
+
+
+def test_open_upload_stream(file_storage):
+    """Test streaming an uploaded file to storage in chunks."""
+    import asyncio
+    
+    async def write_chunks():
+        async with file_storage.open_upload_stream(1, "streamed.s2p") as out:
+            await out.write(b"chunk1-")
+            await out.write(b"chunk2")
+    
+    asyncio.run(write_chunks())
+    
+    path = file_storage.get_file_path(1, "streamed.s2p")
+    assert path is not None
+    assert path.read_bytes() == b"chunk1-chunk2"
+
+
+def test_open_upload_stream_size_hint_trims_to_written(file_storage):
+    """Test that an oversized size hint does not leave padding in the file."""
+    import asyncio
+    
+    async def write_chunks():
+        async with file_storage.open_upload_stream(1, "hinted.s2p", size_hint=4096) as out:
+            await out.write(b"short")
+    
+    asyncio.run(write_chunks())
+    
+    path = file_storage.get_file_path(1, "hinted.s2p")
+    assert path.read_bytes() == b"short"
+
+
 def test_get_file_path(file_storage):
     """Test getting file path."""
     test_run_id = 1
@@ -3,6 +3,7 @@ Tests for API dependencies.
 """
 import pytest
 import os
+import asyncio
 from pathlib import Path
 from backend.src.api.dependencies import (
     get_storage_service,
@@ -48,7 +49,9 @@ def test_get_database():
     get_storage_service.cache_clear()
     os.environ["RF_TOOL_DATABASE_URL"] = "sqlite:///:memory:"
     
-    db = get_database()
+    db_gen = get_database()
+    db = next(db_gen)
+    db_gen.close()
     assert isinstance(db, IDatabase)
     assert hasattr(db, 'create_device')
 
@@ -58,9 +61,12 @@ def test_get_file_storage():
     get_storage_service.cache_clear()
     os.environ["RF_TOOL_STORAGE_PATH"] = "/tmp/test_storage"
     
-    file_storage = get_file_storage()
+    file_storage = asyncio.run(get_file_storage())
     assert isinstance(file_storage, IFileStorage)
     assert hasattr(file_storage, 'store_uploaded_file')
+    
+    # Same instance is reused across requests
+    assert asyncio.run(get_file_storage()) is file_storage
 
 
 def test_get_test_run_service():
@@ -69,7 +75,12 @@ def test_get_test_run_service():
     os.environ["RF_TOOL_DATABASE_URL"] = "sqlite:///:memory:"
     os.environ["RF_TOOL_STORAGE_PATH"] = "/tmp/test_storage"
     
-    service = get_test_run_service()
+    db_gen = get_database()
+    service = asyncio.run(get_test_run_service(
+        database=next(db_gen),
+        file_storage=asyncio.run(get_file_storage()),
+    ))
+    db_gen.close()
     assert isinstance(service, TestRunService)
     assert hasattr(service, 'process_test_run')
 
@@ -78,3 +78,129 @@ def test_app_static_files_prod_mode():
     assert app is not None
 
 
+def test_prod_mode_static_assets_are_immutable(tmp_path):
+    """Test hashed frontend assets get a long-lived Cache-Control header."""
+    from fastapi.testclient import TestClient
+    dist = tmp_path / "frontend" / "dist"
+    (dist / "assets").mkdir(parents=True)
+    (dist / "index.html").write_text("<html></html>")
+    (dist / "assets" / "index-abc123.js").write_text("console.log(1)")
+    
+    client = TestClient(create_app(dev_mode=False, frontend_dir=dist))
+    
+    asset = client.get("/assets/index-abc123.js")
+    assert asset.status_code == 200
+    assert "immutable" in asset.headers["cache-control"]
+    
+    index = client.get("/")
+    assert index.status_code == 200
+    assert "immutable" not in index.headers.get("cache-control", "")
+
+
+def test_dev_mode_cors_preflight():
+    """Test CORS preflight from the dev server origin is allowed."""
+    from fastapi.testclient import TestClient
+    client = TestClient(create_app(dev_mode=True))
+    
+    response = client.options("/api/devices", headers={
+        "Origin": "http://127.0.0.1:5173",
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "content-type",
+    })
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://127.0.0.1:5173"
+
+
+def test_json_responses_use_orjson():
+    """Test routes default to ORJSONResponse."""
+    from fastapi.responses import ORJSONResponse
+    from fastapi.testclient import TestClient
+    app = create_app(dev_mode=True)
+    
+    assert app.router.default_response_class is ORJSONResponse
+    response = TestClient(app).get("/health")
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["status"] == "healthy"
+
+
+def test_static_files_use_pathsend_when_server_supports_it(tmp_path):
+    """Test static files are handed to the server via pathsend when advertised."""
+    import asyncio
+    from backend.src.api.main import FrontendStaticFiles
+    (tmp_path / "assets").mkdir()
+    asset = tmp_path / "assets" / "index-abc123.js"
+    asset.write_text("console.log(1)")
+    static = FrontendStaticFiles(directory=str(tmp_path), html=True)
+    
+    sent = []
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        sent.append(message)
+    
+    scope = {
+        "type": "http", "method": "GET", "path": "/assets/index-abc123.js",
+        "root_path": "", "headers": [], "query_string": b"",
+        "extensions": {"http.response.pathsend": {}},
+    }
+    asyncio.run(static(scope, receive, send))
+    
+    assert sent[0]["status"] == 200
+    assert sent[1] == {"type": "http.response.pathsend", "path": str(asset)}
+
+
+def test_prod_mode_frontend_not_built(tmp_path):
+    """Test prod mode explains how to build the frontend when it is missing."""
+    from fastapi.testclient import TestClient
+    missing = tmp_path / "dist"
+    client = TestClient(create_app(dev_mode=False, frontend_dir=missing))
+    
+    response = client.get("/")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["error"] == "Frontend not built"
+    assert data["path"] == str(missing.absolute())
+
+
+def test_importing_app_does_not_import_scikit_rf():
+    """Test scikit-rf is only imported when a file is actually loaded."""
+    import subprocess
+    import sys
+    code = "import sys, backend.src.api.main; print('skrf' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_cached_get_still_gets_cors_headers():
+    """Test a GET cached without an Origin header still gets CORS headers for the dev origin."""
+    from fastapi.testclient import TestClient
+    from backend.src.api.dependencies import get_database
+    from backend.src.storage.mock_storage import MockDatabase
+    db = MockDatabase()
+    stage_id = db.create_test_stage({"name": "Stage", "description": None})
+    app = create_app(dev_mode=True, response_cache_ttl=60)
+    app.dependency_overrides[get_database] = lambda: db
+    client = TestClient(app)
+    
+    first = client.get(f"/api/test-stages/{stage_id}")
+    assert first.status_code == 200
+    assert "access-control-allow-origin" not in first.headers
+    
+    cached = client.get(f"/api/test-stages/{stage_id}", headers={"Origin": "http://127.0.0.1:5173"})
+    assert cached.status_code == 200
+    assert cached.headers["access-control-allow-origin"] == "http://127.0.0.1:5173"
+
+
+def test_database_handlers_run_in_threadpool():
+    """Test handlers and dependencies that hit SQLite are sync, so they never block the event loop."""
+    import inspect
+    from fastapi.routing import APIRoute
+    from backend.src.api.dependencies import get_database
+    app = create_app(dev_mode=True)
+    by_name = {r.endpoint.__name__: r.endpoint for r in app.routes if isinstance(r, APIRoute)}
+    
+    for name in ("get_device", "get_test_stage", "get_requirement_set", "get_test_run", "get_compliance"):
+        assert not inspect.iscoroutinefunction(by_name[name]), name
+    assert not inspect.isasyncgenfunction(get_database)
@@ -8,7 +8,8 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 from backend.src.cli.main import (
     cmd_parse, cmd_load, cmd_compute, cmd_evaluate, cmd_plot,
-    cmd_test_db, cmd_test_storage,
+    cmd_test_db, cmd_test_storage, main, _build_parser,
+    _load_device_config, _load_requirement_set,
 )
 
 
@@ -91,6 +92,54 @@ def test_cmd_compute(capsys, tmp_path):
     assert "Gain" in captured.out
 
 
+def test_cmd_compute_output_round_trips_to_evaluate(capsys, tmp_path):
+    """Test that metrics written by compute can be read back by evaluate."""
+    s2p_file = tmp_path / "test.s2p"
+    s2p_file.write_text("""! S2P file
+# HZ S RI R 50.0
+1.000000000E+09  0.1  0.0  0.5  0.0  0.5  0.0  0.1  0.0
+2.000000000E+09  0.1  0.0  0.4  0.0  0.4  0.0  0.1  0.0
+""")
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({
+        "name": "Test Device",
+        "s_parameter_config": {
+            "operational_band_hz": {"start_hz": 0.9e9, "stop_hz": 2.1e9},
+            "wideband_band_hz": {"start_hz": 0.5e9, "stop_hz": 3e9},
+        }
+    }))
+    metrics_file = tmp_path / "metrics.json"
+    
+    class ComputeArgs:
+        file_path = str(s2p_file)
+        device_config = str(config_file)
+        output = str(metrics_file)
+    
+    assert cmd_compute(ComputeArgs()) == 0
+    saved = json.loads(metrics_file.read_text())
+    assert saved["frequencies"] == [1e9, 2e9]
+    assert len(saved["gain"]) == 2
+    
+    req_file = tmp_path / "requirements.json"
+    req_file.write_text(json.dumps({
+        "name": "Test Requirements",
+        "test_type": "s_parameter",
+        "metric_limits": [{
+            "metric_name": "gain",
+            "aggregation": "min",
+            "operator": ">=",
+            "limit_value": -10.0,
+            "frequency_band": {"start_hz": 1e9, "stop_hz": 2e9},
+        }],
+    }))
+    
+    class EvaluateArgs:
+        metrics_json = str(metrics_file)
+        requirements_json = str(req_file)
+    
+    assert cmd_evaluate(EvaluateArgs()) == 0
+
+
 def test_cmd_evaluate(capsys, tmp_path):
     """Test evaluate command."""
     # Create metrics JSON
@@ -196,3 +245,42 @@ def test_cmd_test_storage(capsys, tmp_path):
     captured = capsys.readouterr()
     assert "File storage operations successful" in captured.out
 
+
+def test_main_dispatches_parse(capsys):
+    """Test main() routes to the parse command via the cached parser."""
+    with patch("sys.argv", ["rf-tool", "parse", "SN1234_PRI_L567890_AMB_20240101.s2p"]):
+        assert main() == 0
+    assert _build_parser() is _build_parser()
+    captured = capsys.readouterr()
+    assert "SN1234" in captured.out
+
+
+def test_trusted_config_loading_matches_validated(tmp_path):
+    """Test --trust-config loading builds the same models as validated loading."""
+    device_file = tmp_path / "device.json"
+    device_file.write_text(json.dumps({
+        "name": "Test Device",
+        "s_parameter_config": {
+            "operational_band_hz": {"start_hz": 1e9, "stop_hz": 2e9},
+            "wideband_band_hz": {"start_hz": 0.5e9, "stop_hz": 3e9},
+            "gain_parameter": "S21",
+            "port_labels": {"1": "RF IN"},
+        },
+    }))
+    req_file = tmp_path / "requirements.json"
+    req_file.write_text(json.dumps({
+        "name": "Test Requirements",
+        "test_type": "s_parameter",
+        "metric_limits": [{
+            "metric_name": "gain",
+            "aggregation": "min",
+            "operator": ">=",
+            "limit_value": -10.0,
+            "frequency_band": {"start_hz": 1e9, "stop_hz": 2e9},
+        }],
+    }))
+    
+    assert _load_device_config(device_file, trusted=True) == _load_device_config(device_file)
+    trusted_req = _load_requirement_set(req_file, trusted=True)
+    assert trusted_req == _load_requirement_set(req_file)
+    assert trusted_req.compute_hash() == _load_requirement_set(req_file).compute_hash()
@@ -6,8 +6,6 @@ import numpy as np
 from backend.src.plugins.s_parameter.compliance import (
     evaluate_compliance,
     ComplianceResult,
-    _aggregate_metric,
-    _evaluate_limit,
 )
 from backend.src.core.schemas.requirement_set import (
     RequirementSet,
@@ -43,62 +41,6 @@ def create_sample_requirement_set() -> RequirementSet:
     )
 
 
-def test_aggregate_metric_min():
-    """Test min aggregation."""
-    values = np.array([-5.0, -10.0, -8.0, -12.0])
-    result = _aggregate_metric(values, "min")
-    assert result == -12.0
-
-
-def test_aggregate_metric_max():
-    """Test max aggregation."""
-    values = np.array([-5.0, -10.0, -8.0, -12.0])
-    result = _aggregate_metric(values, "max")
-    assert result == -5.0
-
-
-def test_aggregate_metric_avg():
-    """Test average aggregation."""
-    values = np.array([-5.0, -10.0, -8.0, -12.0])
-    result = _aggregate_metric(values, "avg")
-    assert np.isclose(result, -8.75)
-
-
-def test_aggregate_metric_pkpk():
-    """Test peak-to-peak aggregation."""
-    values = np.array([-5.0, -10.0, -8.0, -12.0])
-    result = _aggregate_metric(values, "pkpk")
-    assert result == 7.0  # -5.0 - (-12.0) = 7.0
-
-
-def test_evaluate_limit_less_equal():
-    """Test <= operator."""
-    assert _evaluate_limit(5.0, 10.0, "<=") is True
-    assert _evaluate_limit(10.0, 10.0, "<=") is True
-    assert _evaluate_limit(15.0, 10.0, "<=") is False
-
-
-def test_evaluate_limit_greater_equal():
-    """Test >= operator."""
-    assert _evaluate_limit(15.0, 10.0, ">=") is True
-    assert _evaluate_limit(10.0, 10.0, ">=") is True
-    assert _evaluate_limit(5.0, 10.0, ">=") is False
-
-
-def test_evaluate_limit_less_than():
-    """Test < operator."""
-    assert _evaluate_limit(5.0, 10.0, "<") is True
-    assert _evaluate_limit(10.0, 10.0, "<") is False
-    assert _evaluate_limit(15.0, 10.0, "<") is False
-
-
-def test_evaluate_limit_greater_than():
-    """Test > operator."""
-    assert _evaluate_limit(15.0, 10.0, ">") is True
-    assert _evaluate_limit(10.0, 10.0, ">") is False
-    assert _evaluate_limit(5.0, 10.0, ">") is False
-
-
 def test_evaluate_compliance_pass():
     """Test compliance evaluation with passing metrics."""
     req_set = create_sample_requirement_set()
@@ -259,3 +201,60 @@ def test_evaluate_compliance_all_aggregation_types():
         assert result.overall_pass is True
         assert result.requirements[0]["passed"] is True
 
+
+def test_evaluate_compliance_multiple_bands_per_metric_unsorted_frequencies():
+    """Test several limits on one metric, interleaved with others, on unsorted frequencies."""
+    band_low = FrequencyBand(start_hz=1e9, stop_hz=1.5e9)
+    band_high = FrequencyBand(start_hz=1.5e9, stop_hz=2e9)
+    req_set = RequirementSet(
+        name="Bands",
+        test_type="s_parameter",
+        metric_limits=[
+            MetricLimit(metric_name="gain", aggregation="min", operator=">=",
+                        limit_value=-6.0, frequency_band=band_low),
+            MetricLimit(metric_name="vswr", aggregation="max", operator="<=",
+                        limit_value=2.0, frequency_band=band_low),
+            MetricLimit(metric_name="gain", aggregation="pkpk", operator="<",
+                        limit_value=1.0, frequency_band=band_high),
+            MetricLimit(metric_name="gain", aggregation="avg", operator=">",
+                        limit_value=-7.0, frequency_band=band_high),
+        ],
+    )
+    
+    frequencies = np.array([2e9, 1e9, 1.5e9])
+    metrics = {
+        "gain": np.array([-8.0, -5.0, -6.0]),
+        "vswr": np.array([1.9, 1.5, 1.6]),
+    }
+    
+    result = evaluate_compliance(metrics, frequencies, req_set)
+    
+    values = [r["computed_value"] for r in result.requirements]
+    assert values == pytest.approx([-6.0, 1.6, 2.0, -7.0])
+    assert [r["passed"] for r in result.requirements] == [True, True, False, False]
+    assert len(result.failure_reasons) == 2
+
+
+def test_compliance_result_slots_and_preallocation():
+    """Test ComplianceResult fills preallocated slots by index and has no __dict__."""
+    from backend.src.plugins.s_parameter.compliance import ComplianceResult
+    result = ComplianceResult(2)
+    result.set_requirement_result(1, "second", 1.0, 2.0, False, "second failed")
+    result.set_requirement_result(0, "first", 1.0, 0.5, True)
+    
+    assert [r["requirement_name"] for r in result.requirements] == ["first", "second"]
+    assert result.overall_pass is False
+    assert result.failure_reasons == ["second failed"]
+    assert not hasattr(result, "__dict__")
+
+
+def test_compliance_result_preallocated_rejects_append():
+    """Test add_requirement_result cannot append after preallocated (unfilled) slots."""
+    result = ComplianceResult(1)
+    with pytest.raises(ValueError, match="preallocated"):
+        result.add_requirement_result("extra", 1.0, 0.5, True)
+    assert result.requirements == [None]
+    
+    appended = ComplianceResult()
+    appended.add_requirement_result("first", 1.0, 0.5, True)
+    assert [r["requirement_name"] for r in appended.requirements] == ["first"]
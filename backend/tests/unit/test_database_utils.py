@@ -24,6 +24,37 @@ def test_create_database_engine_file():
     assert "test.db" in str(engine.url)
 
 
+def test_create_database_engine_file_uses_wal(tmp_path):
+    """Test that file-based SQLite engines enable WAL journaling."""
+    from sqlalchemy import text
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'wal.db'}")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -64000
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+    assert engine.pool.size() == 10
+    assert engine.pool._max_overflow == 10
+    engine.dispose()
+
+
+def test_create_database_engine_enforces_foreign_keys():
+    """Test that in-memory engines reject rows pointing at missing parents."""
+    from sqlalchemy import text
+    from sqlalchemy.exc import IntegrityError
+    engine = create_database_engine("sqlite:///:memory:")
+    init_database(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "memory"
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        with pytest.raises(IntegrityError):
+            conn.execute(text(
+                "INSERT INTO test_run_files (test_run_id, original_filename, stored_path, effective_metadata, created_at) "
+                "VALUES (999, 'a.s2p', '/a.s2p', '{}', '2024-01-01')"
+            ))
+
+
 def test_init_database():
     """Test initializing database schema."""
     engine = create_database_engine("sqlite:///:memory:")
@@ -45,6 +76,10 @@ def test_get_session_factory():
     session = Session()
     assert session is not None
     session.close()
+    
+    # The factory is built once per engine
+    assert get_session_factory(engine) is Session
+    assert get_session_factory(create_database_engine("sqlite:///:memory:")) is not Session
 
 
 def test_create_database_session():
@@ -58,3 +93,98 @@ def test_create_database_session():
     session.close()
 
 
+
+
+# Schema written by the first release (timestamps filled in by Python, metrics as NOT NULL JSON)
+_BASELINE_SCHEMA = """
+CREATE TABLE devices (
+    id INTEGER NOT NULL, name VARCHAR(200) NOT NULL, part_number VARCHAR(100), description TEXT,
+    s_parameter_config JSON NOT NULL, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id)
+);
+CREATE TABLE requirement_sets (
+    id INTEGER NOT NULL, name VARCHAR(200) NOT NULL, test_type VARCHAR(50) NOT NULL,
+    metric_limits JSON NOT NULL, pass_policy JSON, requirement_hash VARCHAR(64) NOT NULL,
+    created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id)
+);
+CREATE TABLE test_stages (
+    id INTEGER NOT NULL, name VARCHAR(100) NOT NULL, description TEXT,
+    created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id), CONSTRAINT uq_test_stages_name UNIQUE (name), UNIQUE (name)
+);
+CREATE TABLE test_runs (
+    id INTEGER NOT NULL, device_id INTEGER NOT NULL, test_stage_id INTEGER NOT NULL,
+    requirement_set_id INTEGER NOT NULL, test_type VARCHAR(50) NOT NULL, status VARCHAR(20) NOT NULL,
+    error_message TEXT, created_at DATETIME NOT NULL, completed_at DATETIME,
+    PRIMARY KEY (id),
+    CONSTRAINT ck_test_runs_status CHECK (status IN ('created', 'processing', 'completed', 'failed')),
+    FOREIGN KEY(device_id) REFERENCES devices (id),
+    FOREIGN KEY(test_stage_id) REFERENCES test_stages (id),
+    FOREIGN KEY(requirement_set_id) REFERENCES requirement_sets (id)
+);
+CREATE TABLE test_run_files (
+    id INTEGER NOT NULL, test_run_id INTEGER NOT NULL, original_filename VARCHAR(500) NOT NULL,
+    stored_path VARCHAR(1000) NOT NULL, effective_metadata JSON NOT NULL, created_at DATETIME NOT NULL,
+    PRIMARY KEY (id), FOREIGN KEY(test_run_id) REFERENCES test_runs (id)
+);
+CREATE TABLE test_run_compliance (
+    id INTEGER NOT NULL, test_run_id INTEGER NOT NULL, file_id INTEGER NOT NULL,
+    overall_pass BOOLEAN NOT NULL, requirements JSON NOT NULL, failure_reasons JSON,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id), CONSTRAINT uq_test_run_compliance_file_id UNIQUE (file_id),
+    FOREIGN KEY(test_run_id) REFERENCES test_runs (id), UNIQUE (file_id),
+    FOREIGN KEY(file_id) REFERENCES test_run_files (id)
+);
+CREATE TABLE test_run_metrics (
+    id INTEGER NOT NULL, test_run_id INTEGER NOT NULL, file_id INTEGER NOT NULL,
+    metrics JSON NOT NULL, frequencies JSON NOT NULL, created_at DATETIME NOT NULL,
+    PRIMARY KEY (id), CONSTRAINT uq_test_run_metrics_file_id UNIQUE (file_id),
+    FOREIGN KEY(test_run_id) REFERENCES test_runs (id), UNIQUE (file_id),
+    FOREIGN KEY(file_id) REFERENCES test_run_files (id)
+);
+INSERT INTO devices VALUES (1, 'Amp', NULL, NULL, '{}', '2024-01-01 00:00:00', '2024-01-01 00:00:00');
+INSERT INTO test_stages VALUES (1, 'Production', NULL, '2024-01-01 00:00:00', '2024-01-01 00:00:00');
+INSERT INTO requirement_sets VALUES (1, 'Reqs', 's_parameter', '[]', NULL, 'abc', '2024-01-01 00:00:00', '2024-01-01 00:00:00');
+INSERT INTO test_runs VALUES (1, 1, 1, 1, 's_parameter', 'completed', NULL, '2024-01-01 00:00:00', NULL);
+INSERT INTO test_run_files VALUES (1, 1, 'a.s2p', '/a.s2p', '{}', '2024-01-01 00:00:00');
+INSERT INTO test_run_metrics VALUES (1, 1, 1, '{"gain": [10.0, 11.0]}', '[1000000000.0, 2000000000.0]', '2024-01-01 00:00:00');
+"""
+
+
+def test_init_database_upgrades_baseline_schema(tmp_path):
+    """Test a database created with the first release's schema opens and accepts new writes."""
+    import sqlite3
+    import numpy as np
+    from sqlalchemy import text
+    from backend.src.storage.sqlite_db import SQLiteDatabase
+    db_path = tmp_path / "old.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(_BASELINE_SCHEMA)
+    
+    engine = create_database_engine(f"sqlite:///{db_path}")
+    init_database(engine)
+    init_database(engine)  # Idempotent
+    session = create_database_session(engine)
+    db = SQLiteDatabase(session)
+    
+    # Existing rows survive the rebuild
+    assert db.get_test_run(1)["status"] == "completed"
+    old_metrics = db.get_test_run_metrics(1, 1)
+    assert old_metrics["metrics"] == {"gain": [10.0, 11.0]}
+    assert old_metrics["frequencies"] == [1e9, 2e9]
+    
+    # New writes need the server-side timestamps, the arrays column and nullable JSON columns
+    test_run_id = db.create_test_run({"device_id": 1, "test_stage_id": 1, "requirement_set_id": 1, "test_type": "s_parameter"})
+    file_id = db.add_test_run_file(test_run_id, {"original_filename": "b.s2p", "stored_path": "/b.s2p", "effective_metadata": {}})
+    db.store_metrics_binary(test_run_id, file_id, {"gain": np.array([1.0, 2.0]), "frequencies": np.array([1e9, 2e9])})
+    np.testing.assert_allclose(db.get_test_run_metrics(test_run_id, file_id)["metrics"]["gain"], [1.0, 2.0])
+    assert db.get_test_run(test_run_id)["created_at"] is not None
+    session.close()
+    
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA foreign_key_check")).fetchall() == []
+        indexes = {row[1] for row in conn.execute(text("PRAGMA index_list(test_run_metrics)"))}
+        assert "ix_test_run_metrics_test_run_id" in indexes
+    engine.dispose()
@@ -108,3 +108,42 @@ def test_device_creation():
     assert device.id == 1
     assert device.config.name == "Test Device"
 
+
+def test_s_parameter_config_validate_additional_traces():
+    """Test additional traces are checked against port count and format."""
+    config = SParameterConfig(
+        operational_band_hz=FrequencyBand(start_hz=1e9, stop_hz=2e9),
+        wideband_band_hz=FrequencyBand(start_hz=0.5e9, stop_hz=3e9),
+        additional_traces=["S12", "S43"],
+    )
+
+    config.validate_against_port_count(4)
+    with pytest.raises(ValueError, match="Port 4 is invalid for 2-port device"):
+        config.validate_against_port_count(2)
+
+    config.additional_traces = ["S1X"]
+    with pytest.raises(ValueError, match="Invalid S-parameter format"):
+        config.validate_against_port_count(4)
+
+
+def test_s_parameter_config_additional_traces_tuple():
+    """Test additional traces are stored as a tuple and checked on construction."""
+    band = FrequencyBand(start_hz=1e9, stop_hz=2e9)
+    config = SParameterConfig(operational_band_hz=band, wideband_band_hz=band)
+    assert config.additional_traces == ()
+    
+    config = SParameterConfig(operational_band_hz=band, wideband_band_hz=band, additional_traces=["S31"])
+    assert config.additional_traces == ("S31",)
+    assert config.model_dump(mode="json")["additional_traces"] == ["S31"]
+    
+    with pytest.raises(ValueError, match="Invalid S-parameter format"):
+        SParameterConfig(operational_band_hz=band, wideband_band_hz=band, additional_traces=["S1X"])
+
+
+def test_device_config_length_limits():
+    """Test device name and part number lengths are validated in the schema."""
+    DeviceConfig(name="x" * 200, part_number="L" * 100)
+    with pytest.raises(ValueError):
+        DeviceConfig(name="x" * 201)
+    with pytest.raises(ValueError):
+        DeviceConfig(name="Amp", part_number="L" * 101)
@@ -9,8 +9,14 @@ from backend.src.plugins.s_parameter.metrics import (
     compute_vswr,
     compute_return_loss_db,
     compute_gain_flatness,
+    compute_gain_flatness_multi,
+    compute_all_metrics,
+    compute_sp_metrics,
+    SP_GAIN_DB,
+    SP_VSWR,
+    SP_RETURN_LOSS_DB,
 )
-from backend.src.core.schemas.device import FrequencyBand
+from backend.src.core.schemas.device import FrequencyBand, SParameterConfig
 
 
 def create_test_network_2port() -> rf.Network:
@@ -187,3 +193,87 @@ def test_compute_vswr_different_sii():
     vswr_s22 = compute_vswr(network, "S22")
     np.testing.assert_allclose(vswr_s11, vswr_s22, rtol=1e-6)
 
+
+def test_compute_all_metrics_matches_individual_functions():
+    """Test that the fused metric pass matches the per-metric functions."""
+    network = create_test_network_2port()
+    s_config = SParameterConfig(
+        operational_band_hz=FrequencyBand(start_hz=1e9, stop_hz=2e9),
+        wideband_band_hz=FrequencyBand(start_hz=0.5e9, stop_hz=3e9),
+        gain_parameter="S21",
+        input_return_parameter="S11",
+    )
+    
+    metrics = compute_all_metrics(network, s_config)
+    gain = compute_gain_db(network, "S21")
+    
+    assert np.allclose(metrics["gain"], gain)
+    assert np.allclose(metrics["vswr"], compute_vswr(network, "S11"))
+    assert np.allclose(metrics["return_loss"], compute_return_loss_db(network, "S11"))
+    assert metrics["gain_flatness"] == pytest.approx(
+        compute_gain_flatness(gain, network.f, s_config.operational_band_hz)
+    )
+
+
+def test_compute_gain_flatness_band_edges_inclusive():
+    """Test gain flatness includes points exactly on the band edges only."""
+    frequencies = np.array([1e9, 2e9, 3e9, 4e9, 5e9])
+    gain = np.array([0.0, 1.0, 3.0, 2.0, 10.0])
+    
+    flatness = compute_gain_flatness(gain, frequencies, FrequencyBand(start_hz=2e9, stop_hz=4e9))
+    assert flatness == pytest.approx(2.0)
+    
+    # Band between two points contains no samples
+    with pytest.raises(ValueError, match="No frequency points"):
+        compute_gain_flatness(gain, frequencies, FrequencyBand(start_hz=2.1e9, stop_hz=2.9e9))
+
+
+def test_compute_gain_flatness_multi():
+    """Test multi-band gain flatness matches per-band computation."""
+    frequencies = np.array([1e9, 2e9, 3e9, 4e9, 5e9])
+    gain = np.array([0.0, 1.0, 3.0, 2.0, 10.0])
+    bands = [FrequencyBand(start_hz=2e9, stop_hz=4e9), FrequencyBand(start_hz=1e9, stop_hz=5e9)]
+    
+    assert compute_gain_flatness_multi(gain, frequencies, bands) == [
+        compute_gain_flatness(gain, frequencies, band) for band in bands
+    ]
+    
+    with pytest.raises(ValueError, match="No frequency points"):
+        compute_gain_flatness_multi(gain, frequencies, [bands[0], FrequencyBand(start_hz=6e9, stop_hz=7e9)])
+
+
+def test_compute_sp_metrics_edge_cases():
+    """Test the batched metric kernel handles |S| of 0 and 1 like the per-metric functions."""
+    freq = rf.Frequency(1e9, 3e9, 3, unit='Hz')
+    s = np.zeros((3, 2, 2), dtype=complex)
+    s[:, 0, 0] = [0.0, 0.5j, 1.0]  # perfect match, partial, total reflection
+    s[:, 1, 0] = [0.9, 0.5, 0.1]
+    network = rf.Network(frequency=freq, s=s)
+    
+    gain, vswr, return_loss = compute_sp_metrics(network.s, [
+        (SP_GAIN_DB, 1, 0),
+        (SP_VSWR, 0, 0),
+        (SP_RETURN_LOSS_DB, 0, 0),
+    ])
+    
+    np.testing.assert_allclose(gain, compute_gain_db(network, "S21"))
+    np.testing.assert_allclose(vswr, compute_vswr(network, "S11"))
+    np.testing.assert_allclose(return_loss, compute_return_loss_db(network, "S11"))
+    assert vswr[2] == pytest.approx(1000.0)
+    assert return_loss[0] == 100.0
+
+
+def test_compute_vswr_and_return_loss_are_capped():
+    """Test VSWR is capped at 1000 and return loss at 100 dB without runtime warnings."""
+    freq = rf.Frequency(1e9, 3e9, 3, unit='Hz')
+    s = np.zeros((3, 2, 2), dtype=complex)
+    s[:, 0, 0] = [1.0, 0.9999, 1e-7]
+    network = rf.Network(frequency=freq, s=s)
+    
+    with np.errstate(all='raise'):
+        vswr = compute_vswr(network, "S11")
+        return_loss = compute_return_loss_db(network, "S11")
+    
+    assert vswr[0] == pytest.approx(1000.0)
+    assert vswr[1] == pytest.approx(1000.0)
+    assert return_loss[2] == pytest.approx(100.0)
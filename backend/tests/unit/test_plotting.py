@@ -195,3 +195,89 @@ def test_render_plot_creates_directory(temp_dir):
     
     assert output_path.exists()
     assert output_path.parent.exists()
+
+
+def test_plot_series_stores_float_arrays():
+    """Test series data is held as float64 arrays and dumped as lists for JSON."""
+    import numpy as np
+    series = PlotSeries(frequency_hz=[1e9, 2e9], values=[-10, -9], label="PRI Gain")
+
+    assert isinstance(series.values, np.ndarray)
+    assert series.values.dtype == np.float64
+    dumped = series.model_dump(mode="json")
+    assert dumped["frequency_hz"] == [1e9, 2e9]
+    assert dumped["values"] == [-10.0, -9.0]
+
+
+def test_plot_series_rejects_non_1d_data():
+    """Test scalars and nested sequences are rejected instead of becoming 0-d/2-d arrays."""
+    with pytest.raises(ValueError, match="one-dimensional"):
+        PlotSeries(frequency_hz=5, values=[1.0], label="scalar")
+    with pytest.raises(ValueError, match="one-dimensional"):
+        PlotSeries(frequency_hz=[1e9], values=[[1.0]], label="nested")
+    with pytest.raises(ValueError, match="sequence of numbers"):
+        PlotSeries(frequency_hz=["abc"], values=[1.0], label="text")
+
+
+def test_plot_spec_json_schema():
+    """Test PlotSpec still produces a JSON schema (usable as an API model)."""
+    schema = PlotSpec.model_json_schema()
+    series = schema["$defs"]["PlotSeries"]["properties"]
+    assert series["frequency_hz"]["type"] == "array"
+    assert series["values"]["items"] == {"type": "number"}
+
+
+def test_render_plot_reuses_figure_between_plots(temp_dir):
+    """Test same-size plots share one figure and don't leak series between renders."""
+    from backend.src.plugins.s_parameter import plotting
+    plot_config = PlotConfig(figure_width=7.5, figure_height=4.5, dpi=80)
+    first = PlotSpec(
+        series=[PlotSeries(frequency_hz=[1e9, 2e9], values=[1.0, 2.0], label="first")],
+        title="First",
+        y_label="Gain (dB)",
+    )
+    second = PlotSpec(
+        series=[PlotSeries(frequency_hz=[1e9, 2e9], values=[3.0, 4.0], label="second")],
+        title="Second",
+        y_label="Gain (dB)",
+    )
+    
+    render_plot(first, plot_config, temp_dir / "first.png")
+    fig, ax = plotting._FIGURE_POOL[(7.5, 4.5, 80)]
+    render_plot(second, plot_config, temp_dir / "second.png")
+    
+    assert plotting._FIGURE_POOL[(7.5, 4.5, 80)] == (fig, ax)
+    assert len(ax.lines) == 0  # Cleared after saving
+    assert (temp_dir / "second.png").stat().st_size > 0
+
+
+def test_render_plot_batches_same_style_series(temp_dir):
+    """Test many same-style series are drawn as one collection but all keep legend entries."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from backend.src.plugins.s_parameter import plotting
+    series = [
+        PlotSeries(frequency_hz=[1e9, 2e9], values=[float(i), float(i + 1)], label=f"PRI {i}", trace_identity="PRI")
+        for i in range(6)
+    ]
+    series.append(PlotSeries(frequency_hz=[1e9, 2e9], values=[0.0, 0.5], label="RED 0", trace_identity="RED"))
+    plot_spec = PlotSpec(series=series, title="Gain", y_label="Gain (dB)")
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    
+    plotting._draw_and_save(fig, ax, plot_spec, PlotConfig(), temp_dir / "batched.png")
+    
+    assert len(ax.collections) == 1
+    assert len(ax.lines) == 1
+    assert [t.get_text() for t in ax.get_legend().get_texts()] == [s.label for s in series]
+    assert ax.get_ylim()[1] >= 6.0  # Collection data is included in autoscaling
+
+
+def test_importing_plotting_does_not_import_matplotlib():
+    """Test matplotlib is only imported when a plot is rendered."""
+    import subprocess
+    import sys
+    code = "import sys, backend.src.plugins.s_parameter.plotting; print('matplotlib' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -6,6 +6,7 @@ from backend.src.core.schemas.requirement_set import (
     RequirementSet,
     MetricLimit,
     PassPolicy,
+    compute_requirement_hash,
 )
 from backend.src.core.schemas.device import FrequencyBand
 
@@ -159,3 +160,47 @@ def test_requirement_set_hash():
     hash3 = req_set3.compute_hash()
     assert hash1 != hash3
 
+
+def test_compute_requirement_hash_matches_model_hash():
+    """Test hashing pre-dumped limits gives the same result as compute_hash."""
+    req_set = RequirementSet(
+        name="Test",
+        test_type="s_parameter",
+        metric_limits=[
+            MetricLimit(
+                metric_name="gain",
+                aggregation="min",
+                operator=">=",
+                limit_value=-10.0,
+                frequency_band=FrequencyBand(start_hz=1e9, stop_hz=2e9),
+                description="Not part of the hash",
+            )
+        ],
+        pass_policy=PassPolicy(required_paths=["PRI"]),
+    )
+    dumped_limits = [m.model_dump() for m in req_set.metric_limits]
+
+    assert compute_requirement_hash(
+        req_set.name, req_set.test_type, dumped_limits, req_set.pass_policy.model_dump()
+    ) == req_set.compute_hash()
+
+
+def test_requirement_set_hash_is_stable():
+    """Test the hash value stays fixed so stored hashes keep matching."""
+    req_set = RequirementSet(
+        name="t",
+        test_type="s_parameter",
+        metric_limits=[
+            MetricLimit(
+                metric_name="gain",
+                aggregation="min",
+                operator=">=",
+                limit_value=-10.0,
+                frequency_band=FrequencyBand(start_hz=1e9, stop_hz=2e9),
+                description="x",
+            )
+        ],
+        pass_policy=PassPolicy(required_paths=["PRI"]),
+    )
+
+    assert req_set.compute_hash() == "0ad959edbea955d8"
@@ -0,0 +1,97 @@
+"""
+Tests for the GET-by-id response cache middleware.
+"""
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from backend.src.api.response_cache import ResponseCacheMiddleware
+
+
+def create_counting_app(ttl_seconds: float = 60.0):
+    """Create an app whose device endpoint counts handler invocations."""
+    app = FastAPI()
+    calls = {"get": 0}
+
+    @app.get("/api/devices/{device_id}")
+    def get_device(device_id: int):
+        calls["get"] += 1
+        if device_id == 404:
+            raise HTTPException(status_code=404, detail="Device not found")
+        return {"id": device_id, "calls": calls["get"]}
+
+    @app.post("/api/devices")
+    def create_device():
+        return {"id": 2}
+
+    @app.get("/api/test-stages/{stage_id}")
+    def get_test_stage(stage_id: int):
+        calls["get"] += 1
+        return {"id": stage_id}
+
+    @app.get("/api/test-runs/{test_run_id}")
+    def get_test_run(test_run_id: int):
+        calls["get"] += 1
+        return {"id": test_run_id}
+
+    app.add_middleware(ResponseCacheMiddleware, ttl_seconds=ttl_seconds)
+    return TestClient(app), calls
+
+
+def test_repeated_get_is_served_from_cache():
+    """Test that a second GET for the same resource skips the handler."""
+    client, calls = create_counting_app()
+
+    first = client.get("/api/devices/1")
+    second = client.get("/api/devices/1")
+
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    assert calls["get"] == 1
+
+
+def test_write_invalidates_matching_prefix():
+    """Test that a POST under a prefix drops cached GETs for that prefix only."""
+    client, calls = create_counting_app()
+
+    client.get("/api/devices/1")
+    client.get("/api/test-stages/1")
+    client.post("/api/devices")
+    client.get("/api/devices/1")
+    client.get("/api/test-stages/1")
+
+    # Device GET re-executed after invalidation, test stage still cached
+    assert calls["get"] == 3
+
+
+def test_error_responses_are_not_cached():
+    """Test that non-200 responses always hit the handler."""
+    client, calls = create_counting_app()
+
+    assert client.get("/api/devices/404").status_code == 404
+    assert client.get("/api/devices/404").status_code == 404
+    assert calls["get"] == 2
+
+
+def test_expired_entries_are_refreshed():
+    """Test that entries past their TTL are recomputed."""
+    client, calls = create_counting_app(ttl_seconds=0.0)
+
+    client.get("/api/devices/1")
+    client.get("/api/devices/1")
+    assert calls["get"] == 2
+
+
+def test_test_runs_are_not_cached():
+    """Test test run GETs always hit the handler (their status changes outside HTTP writes)."""
+    client, calls = create_counting_app()
+
+    client.get("/api/test-runs/1")
+    client.get("/api/test-runs/1")
+    assert calls["get"] == 2
+
+
+def test_response_cache_is_off_by_default():
+    """Test create_app only adds the cache when a TTL is configured."""
+    from backend.src.api.main import create_app
+    assert ResponseCacheMiddleware not in [m.cls for m in create_app(dev_mode=True).user_middleware]
+    assert ResponseCacheMiddleware in [m.cls for m in create_app(dev_mode=True, response_cache_ttl=60).user_middleware]
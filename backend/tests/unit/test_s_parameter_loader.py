@@ -84,3 +84,34 @@ def test_load_s2p_file_network_properties(temp_dir):
     assert network.f[0] == 1e9
     assert network.f[1] == 2e9
 
+
+def test_load_s2p_fast_path_matches_scikit_rf(temp_dir):
+    """Test the fast Touchstone parser gives the same network as scikit-rf."""
+    import skrf as rf
+    file_path = temp_dir / "ma.s2p"
+    file_path.write_text("""! MA format, GHz units
+# GHZ S MA R 50
+1.0  0.1 10.0  0.9 -45.0  0.05 5.0  0.2 170.0
+1.5  0.2 20.0  0.8 -90.0  0.06 6.0  0.3 160.0
+2.0  0.3 30.0  0.7 -135.0 0.07 7.0  0.4 150.0
+""")
+    
+    network = load_s_parameter_file(file_path)
+    reference = rf.Network(str(file_path))
+    
+    np.testing.assert_allclose(network.f, reference.f)
+    np.testing.assert_allclose(network.s, reference.s)
+    np.testing.assert_allclose(network.z0, reference.z0)
+
+
+def test_load_s2p_inline_comments_fall_back(temp_dir):
+    """Test files the fast parser does not handle still load via scikit-rf."""
+    file_path = temp_dir / "commented.s2p"
+    file_path.write_text("""# HZ S RI R 50.0
+1.000000000e+09  0.1 0.0  0.9 0.0  0.9 0.0  0.1 0.0 ! first point
+2.000000000e+09  0.1 0.0  0.8 0.0  0.8 0.0  0.1 0.0
+""")
+    
+    network = load_s_parameter_file(file_path)
+    assert network.s.shape == (2, 2, 2)
+    assert network.s[1, 1, 0] == pytest.approx(0.8)
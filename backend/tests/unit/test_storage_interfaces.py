@@ -69,6 +69,23 @@ def test_mock_file_storage_store_file():
     assert retrieved_path == path
 
 
+def test_mock_file_storage_open_upload_stream():
+    """Test streaming an upload into mock file storage."""
+    import asyncio
+    storage = MockFileStorage()
+    
+    async def write_chunks():
+        async with storage.open_upload_stream(1, "test.s2p") as out:
+            await out.write(b"abc")
+            await out.write(b"def")
+    
+    asyncio.run(write_chunks())
+    
+    path = storage.get_file_path(1, "test.s2p")
+    assert path is not None
+    assert storage.files[str(path)] == b"abcdef"
+
+
 def test_mock_file_storage_store_artifact():
     """Test storing an artifact in mock file storage."""
     storage = MockFileStorage()
@@ -3,6 +3,7 @@ Tests for storage service.
 """
 import pytest
 from pathlib import Path
+from sqlalchemy import text
 from backend.src.storage.storage_service import StorageService
 from backend.src.storage.interfaces import IDatabase, IFileStorage
 
@@ -48,6 +49,25 @@ def test_storage_service_create_file_storage():
     assert hasattr(file_storage, 'get_file_path')
 
 
+def test_storage_service_file_storage_is_shared():
+    """Test that file storage is built once and reused."""
+    service = StorageService(
+        database_url="sqlite:///:memory:",
+        file_storage_path=Path("/tmp/test_storage"),
+    )
+    assert service.create_file_storage() is service.create_file_storage()
+
+
+def test_storage_service_session_scope():
+    """Test that session_scope yields a session and closes it on exit."""
+    service = StorageService(database_url="sqlite:///:memory:")
+    with service.session_scope() as session:
+        assert hasattr(session, 'query')
+        session.execute(text("SELECT 1"))
+        assert session.in_transaction()
+    assert not session.in_transaction()
+
+
 def test_storage_service_get_session():
     """Test getting database session."""
     service = StorageService(database_url="sqlite:///:memory:")
@@ -67,3 +87,14 @@ def test_storage_service_implements_factory():
     assert isinstance(service, IStorageFactory)
 
 
+def test_storage_service_shared_in_memory_database(in_memory_db):
+    """Test services opened on the shared in-memory URL see the same database."""
+    first = StorageService(database_url=in_memory_db)
+    second = StorageService(database_url=in_memory_db)
+    
+    stage_id = first.create_database().create_test_stage({"name": "Shared"})
+    assert second.create_database().get_test_stage(stage_id)["name"] == "Shared"
+    
+    # Treated as in-memory: no WAL journal
+    with first.session_scope() as session:
+        assert session.execute(text("PRAGMA journal_mode")).scalar() == "memory"
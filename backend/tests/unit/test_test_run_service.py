@@ -215,3 +215,38 @@ def test_process_test_run_multiple_files(temp_dir):
     files = db.test_run_files[test_run_id]
     assert len(files) == 2
 
+
+def test_process_test_run_parallel_matches_sequential(temp_dir):
+    """Test multi-file runs give the same results with and without worker processes."""
+    file1 = create_test_s2p_file(temp_dir)
+    file2 = temp_dir / "test2.s2p"
+    file2.write_text(file1.read_text())
+    
+    stored = []
+    for max_workers in (1, 2):
+        factory = MockStorageFactory(temp_dir / f"workers{max_workers}")
+        db = factory.create_database()
+        service = TestRunService(db, factory.create_file_storage(), max_workers=max_workers)
+        test_run_id = db.create_test_run({
+            "device_id": 1,
+            "test_stage_id": 1,
+            "requirement_set_id": 1,
+            "test_type": "s_parameter",
+        })
+        service.process_test_run(
+            test_run_id,
+            [file1, file2],
+            create_test_device_config(),
+            create_test_requirement_set(),
+        )
+        assert db.get_test_run(test_run_id)["status"] == "completed"
+        stored.append(db.metrics[test_run_id])
+    
+    # Metrics are stored as NumPy arrays, so compare them element-wise
+    assert stored[0].keys() == stored[1].keys()
+    for file_id, metrics_data in stored[0].items():
+        other = stored[1][file_id]
+        np.testing.assert_array_equal(metrics_data["frequencies"], other["frequencies"])
+        assert metrics_data["metrics"].keys() == other["metrics"].keys()
+        for name, values in metrics_data["metrics"].items():
+            np.testing.assert_array_equal(values, other["metrics"][name])